@@ -0,0 +1,493 @@
+"""
+Variante assíncrona (ASGI) do Backend Mock
+Mesmas rotas e mesmos formatos de resposta de server.py, servidos por um
+laço asyncio: conexões ociosas e keep-alive não ocupam threads do sistema.
+
+- Rotas agregadas (/api/dashboard/stats e /api/health) são nativas: com o
+  banco SQLite, as consultas aos repositórios (DASHBOARD_CONSULTAS e parte
+  de HEALTH_FONTES) rodam em paralelo em um pool próprio, então uma
+  consulta lenta não serializa as demais e o health continua respondendo
+  com o pool do WSGI saturado.
+- As demais rotas passam pelo app Flask em um pool limitado de threads
+  (ponte WSGI): o corpo da requisição é lido sem bloquear o laço (uploads
+  grandes vão para disco) e a resposta é enviada em streaming, bloco a
+  bloco.
+- O feed de mudanças do Kanban (SSE e long-poll) também é nativo: cada
+  cliente conectado é só uma future no laço, sem thread nem limite de
+  duração da conexão.
+
+Uso (requer uvicorn: pip install uvicorn):
+    uvicorn --factory asgi:create_app --port 5007
+    uvicorn asgi:app --port 5007         # app padrão, com a configuração do ambiente
+    python serve.py --asgi               # gunicorn + workers uvicorn (preload)
+
+ASGI_THREADS controla o pool da ponte WSGI (padrão 32). O controle de
+admissão (limite por cliente e teto de concorrência de server.py) é feito
+no laço, para todas as rotas, antes de a requisição chegar ao pool.
+"""
+
+import asyncio
+import contextvars
+import io
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from werkzeug.exceptions import HTTPException
+
+import server
+
+logger = logging.getLogger(__name__)
+
+# Corpos de requisição maiores que isso vão para um arquivo temporário
+CORPO_EM_MEMORIA = 1024 * 1024
+
+# Apps vivos (pools e voos recriados no processo filho após um fork)
+_APPS = weakref.WeakSet()
+
+
+class AcervoASGI:
+    """Aplicação ASGI (protocolos http e lifespan) sobre um app de server.create_app"""
+
+    def __init__(self, wsgi_app, wsgi_threads=32, consulta_threads=8):
+        self.wsgi_app = wsgi_app
+        self.estado = server.estado_do_app(wsgi_app)
+        self.wsgi_threads = wsgi_threads
+        self.consulta_threads = consulta_threads
+        self.rotas = {
+            ('GET', '/api/dashboard/stats'): self.dashboard_stats,
+            ('GET', '/api/health'): self.health_check,
+            ('GET', '/api/cursos/kanban/mudancas'): self.kanban_mudancas
+        }
+        # Rotas nativas que respondem em streaming (recebem receive/send)
+        self.fluxos = {
+            ('GET', '/api/cursos/kanban/eventos'): self.kanban_eventos
+        }
+        self._regras = wsgi_app.url_map.bind('localhost')
+        self._reset()
+        _APPS.add(self)
+
+    def _reset(self):
+        # Pools criados sob demanda, já no processo do worker (após o fork)
+        self._wsgi_pool = None
+        self._consultas = None
+        self._voos = {}
+        self.bridged = 0
+        self.native = 0
+
+    def _pool_wsgi(self):
+        if self._wsgi_pool is None:
+            self._wsgi_pool = ThreadPoolExecutor(self.wsgi_threads, thread_name_prefix='asgi-wsgi')
+        return self._wsgi_pool
+
+    def _pool_consultas(self):
+        if self._consultas is None:
+            self._consultas = ThreadPoolExecutor(self.consulta_threads,
+                                                 thread_name_prefix='asgi-consulta')
+        return self._consultas
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] != 'http':
+            return
+        # Contexto do app Flask nesta tarefa: as funções de server.py usam
+        # o estado do app atual
+        with self.wsgi_app.app_context():
+            return await self._http(scope, receive, send)
+
+    async def _http(self, scope, receive, send):
+        if not self.estado.dados_carregados:
+            # Com LAZY_LOAD: carga na primeira requisição
+            await asyncio.get_running_loop().run_in_executor(None, server.carregar_dados, self.estado)
+        # Regra da rota (template, como request.url_rule no Flask): rótulo
+        # das métricas e caminho da admissão, sem ids do path
+        regra = self._regra(scope)
+        scope['acervo.rota'] = regra or '<unmatched>'
+        # Admissão no laço, antes de ocupar o pool da ponte WSGI: acima do
+        # teto a requisição é recusada em vez de esperar na fila do pool
+        recusa, vaga = server.admitir(scope['method'], regra or scope['path'],
+                                      bool(_parametro(scope, 'search')),
+                                      _cabecalho(scope, b'authorization'),
+                                      (scope.get('client') or ('', 0))[0])
+        if recusa is not None:
+            return await self._recusar(recusa, scope, send)
+        try:
+            chave = (scope['method'], scope['path'])
+            handler = self.rotas.get(chave)
+            if handler is not None:
+                return await self._nativa(handler, scope, send)
+            fluxo = self.fluxos.get(chave)
+            if fluxo is not None:
+                return await fluxo(scope, receive, send)
+            return await self._wsgi(scope, receive, send)
+        finally:
+            if vaga:
+                self.estado.concurrency_limiter.release()
+
+    def _regra(self, scope):
+        """Template da regra Flask que atende a requisição (None: nenhuma)"""
+        try:
+            regra, _ = self._regras.match(scope['path'], scope['method'], return_rule=True)
+        except HTTPException:
+            return None
+        return regra.rule
+
+    async def _lifespan(self, receive, send):
+        while True:
+            mensagem = await receive()
+            if mensagem['type'] == 'lifespan.startup':
+                # A carga dos dados já foi feita por create_app (ou, com
+                # LAZY_LOAD, fica para a primeira requisição)
+                await send({'type': 'lifespan.startup.complete'})
+            elif mensagem['type'] == 'lifespan.shutdown':
+                # Descarrega os logs pendentes antes do worker sair
+                server.log_pipeline.writer.stop()
+                for pool in (self._wsgi_pool, self._consultas):
+                    if pool is not None:
+                        pool.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    # Rotas nativas
+    async def _em_paralelo(self, fontes, repositorio=None):
+        """
+        Executa as funções de `fontes` (nome -> callable). As que consultam
+        os repositórios (`repositorio`; padrão: todas) rodam ao mesmo tempo
+        no pool quando o banco é SQLite; as demais só leem contadores em
+        memória e rodam no próprio laço (uma thread custaria mais que o
+        cálculo).
+        """
+        if self.estado.banco is None:
+            repositorio = ()
+        elif repositorio is None:
+            repositorio = fontes
+        loop = asyncio.get_running_loop()
+        pool = self._pool_consultas()
+        # As threads do pool rodam com o contexto (app Flask) da requisição
+        pendentes = {nome: loop.run_in_executor(pool, contextvars.copy_context().run, fontes[nome])
+                     for nome in fontes if nome in repositorio}
+        valores = {nome: fonte() for nome, fonte in fontes.items() if nome not in pendentes}
+        if pendentes:
+            valores.update(zip(pendentes, await asyncio.gather(*pendentes.values())))
+        return {nome: valores[nome] for nome in fontes}
+
+    def _voo(self, chave, calcular):
+        """Tarefa em andamento para `chave` ou uma nova (single-flight no laço)"""
+        tarefa = self._voos.get(chave)
+        if tarefa is None:
+            tarefa = self._voos[chave] = asyncio.ensure_future(calcular())
+            tarefa.add_done_callback(lambda _: self._voos.pop(chave, None))
+        return tarefa
+
+    async def _uma_vez(self, chave, calcular):
+        """Requisições concorrentes aguardam o mesmo cálculo"""
+        return await asyncio.shield(self._voo(chave, calcular))
+
+    async def dashboard_stats(self, scope):
+        """
+        Mesmo cache (e TTLs) da rota Flask; no miss, consultas em paralelo.
+        Valor obsoleto: servido na hora, com um único refresh em segundo plano.
+        """
+        chave = server.chave_dashboard()
+        cache = self.estado.cache
+        encontrado = cache.peek(chave)
+        if encontrado is None:
+            return 200, await self._uma_vez(chave, lambda: self._calcular_dashboard_stats(chave))
+        stats, fresco = encontrado
+        if not fresco and chave not in self._voos:
+            refresh = self._voo(chave, lambda: self._calcular_dashboard_stats(chave))
+            refresh.add_done_callback(lambda tarefa: _refresh_concluido(cache, chave, tarefa))
+        return 200, stats
+
+    async def _calcular_dashboard_stats(self, chave):
+        stats = server.montar_dashboard_stats(await self._em_paralelo(server.DASHBOARD_CONSULTAS))
+        self.estado.cache.set(chave, stats, ttl=server.DASHBOARD_TTL, stale_ttl=server.DASHBOARD_STALE_TTL)
+        return stats
+
+    async def health_check(self, scope):
+        try:
+            return 200, server.montar_health(await self._em_paralelo(
+                server.HEALTH_FONTES, server.HEALTH_FONTES_REPOSITORIO))
+        except Exception as e:
+            logger.error("Health check failed", extra={'error': str(e)})
+            return 500, server.montar_health_falha()
+
+    async def kanban_mudancas(self, scope):
+        """Long-poll: a espera é uma future no laço, não uma thread"""
+        try:
+            desde, timeout = server.parametros_feed(_cabecalho(scope, b'last-event-id'),
+                                                    _parametro(scope, 'since'),
+                                                    _parametro(scope, 'timeout'))
+        except ValueError:
+            return 400, server.FEED_PARAMETRO_INVALIDO
+        eventos, reset = await self.estado.change_feed.esperar_async(desde, timeout)
+        return 200, server.montar_mudancas(desde, eventos, reset)
+
+    async def kanban_eventos(self, scope, receive, send):
+        """SSE: mesmos eventos da rota Flask, até o cliente desconectar"""
+        try:
+            desde, _ = server.parametros_feed(_cabecalho(scope, b'last-event-id'),
+                                              _parametro(scope, 'since'))
+        except ValueError:
+            return await self._nativa(_feed_parametro_invalido, scope, send)
+        feed = self.estado.change_feed
+        inicio = time.perf_counter()
+        labels = (('route', scope['acervo.rota']),)
+        desconexao = asyncio.ensure_future(_aguardar_desconexao(receive))
+        self.estado.metrics.gauge_add('acervo_http_requests_in_flight', labels, 1)
+        feed.conectar()
+        try:
+            cabecalhos = [(b'content-type', b'text/event-stream; charset=utf-8')]
+            cabecalhos.extend((k.lower().encode('latin-1'), v.encode('latin-1'))
+                              for k, v in server.SSE_HEADERS.items())
+            cabecalhos.extend(_cors(scope))
+            await send({'type': 'http.response.start', 'status': 200, 'headers': cabecalhos})
+            blocos = [f'retry: {server.SSE_RETRY_MS}\n\n']
+            cursor = desde
+            if cursor is None:
+                evento = server.marcador('sync', feed.version)
+                cursor = evento['version']
+                blocos.append(server.formatar_sse(evento))
+            while True:
+                await send({'type': 'http.response.body', 'body': ''.join(blocos).encode('utf-8'),
+                            'more_body': True})
+                espera = asyncio.ensure_future(feed.esperar_async(cursor, server.SSE_HEARTBEAT))
+                await asyncio.wait((espera, desconexao), return_when=asyncio.FIRST_COMPLETED)
+                if desconexao.done():
+                    espera.cancel()
+                    break
+                eventos, _ = espera.result()
+                if eventos:
+                    cursor = eventos[-1]['version']
+                    blocos = [server.formatar_sse(evento) for evento in eventos]
+                else:
+                    blocos = [': keep-alive\n\n']
+        finally:
+            desconexao.cancel()
+            feed.desconectar()
+            self.estado.metrics.gauge_add('acervo_http_requests_in_flight', labels, -1)
+        self._registrar(scope, 200, time.perf_counter() - inicio)
+
+    async def _nativa(self, handler, scope, send, extras=()):
+        """Executa uma rota nativa com as mesmas métricas, logs e CORS do Flask"""
+        inicio = time.perf_counter()
+        labels = (('route', scope['acervo.rota']),)
+        self.estado.metrics.gauge_add('acervo_http_requests_in_flight', labels, 1)
+        try:
+            status, payload = await handler(scope)
+            # Mesma serialização de jsonify (AcervoJSONProvider, JSON compacto)
+            corpo = self.wsgi_app.json.response(payload).get_data()
+            cabecalhos = [(b'content-type', b'application/json'),
+                          (b'content-length', str(len(corpo)).encode('latin-1'))]
+            cabecalhos.extend(extras)
+            cabecalhos.extend(_cors(scope))
+            await send({'type': 'http.response.start', 'status': status, 'headers': cabecalhos})
+            await send({'type': 'http.response.body', 'body': corpo})
+        finally:
+            self.estado.metrics.gauge_add('acervo_http_requests_in_flight', labels, -1)
+        self._registrar(scope, status, time.perf_counter() - inicio)
+
+    async def _recusar(self, recusa, scope, send):
+        """Resposta 429/503 do controle de admissão (mesmo corpo do Flask)"""
+        status, payload, retry_after = recusa
+        await self._nativa(lambda scope: _recusa(status, payload), scope, send,
+                           [(b'retry-after', str(retry_after).encode('latin-1'))])
+
+    def _registrar(self, scope, status, duracao):
+        """Métricas e linha de log RESPONSE de uma rota nativa"""
+        rota = scope['acervo.rota']
+        labels = (('route', rota),)
+        self.estado.metrics.inc('acervo_http_requests_total', (('route', rota), ('method', scope['method']),
+                                                          ('status', str(status))))
+        self.estado.metrics.observe('acervo_http_request_duration_seconds', labels, duracao)
+        server.logger.info("RESPONSE", extra={
+            'event': 'response',
+            'method': scope['method'],
+            'route': rota,
+            'url': _url(scope),
+            'remote_addr': (scope.get('client') or ('', 0))[0],
+            'status_code': status,
+            'duration_seconds': round(duracao, 6)
+        })
+        self.native += 1
+
+    # Ponte WSGI
+    async def _wsgi(self, scope, receive, send):
+        loop = asyncio.get_running_loop()
+        pool = self._pool_wsgi()
+        corpo = await _ler_corpo(receive)
+        environ = _environ(scope, corpo)
+        # Admissão já feita em __call__
+        environ['acervo.admissao'] = True
+        resposta = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and resposta.get('enviada'):
+                raise exc_info[1].with_traceback(exc_info[2])
+            resposta['status'] = int(status.split(' ', 1)[0])
+            resposta['headers'] = [(k.lower().encode('latin-1'), v.encode('latin-1'))
+                                   for k, v in headers]
+            return lambda dados: None
+
+        try:
+            iterador = await loop.run_in_executor(pool, lambda: iter(self.wsgi_app(environ, start_response)))
+            try:
+                primeiro = await loop.run_in_executor(pool, next, iterador, None)
+                resposta['enviada'] = True
+                await send({'type': 'http.response.start', 'status': resposta['status'],
+                            'headers': resposta['headers']})
+                bloco = primeiro
+                while bloco is not None:
+                    if bloco:
+                        await send({'type': 'http.response.body', 'body': bloco, 'more_body': True})
+                    bloco = await loop.run_in_executor(pool, next, iterador, None)
+                await send({'type': 'http.response.body', 'body': b''})
+            finally:
+                fechar = getattr(iterador, 'close', None)
+                if fechar is not None:
+                    await loop.run_in_executor(pool, fechar)
+        finally:
+            corpo.close()
+        self.bridged += 1
+
+
+def _refresh_concluido(cache, chave, tarefa):
+    """Refresh em segundo plano: conta o sucesso; na falha mantém o valor obsoleto"""
+    if tarefa.cancelled():
+        return
+    erro = tarefa.exception()
+    if erro is None:
+        cache.count_refresh()
+    else:
+        logger.error("Cache REFRESH falhou", extra={'event': 'cache.refresh_error',
+                                                    'key': chave, 'error': str(erro)})
+
+
+async def _recusa(status, payload):
+    return status, payload
+
+
+async def _feed_parametro_invalido(scope):
+    return 400, server.FEED_PARAMETRO_INVALIDO
+
+
+async def _aguardar_desconexao(receive):
+    """Consome as mensagens do cliente até http.disconnect"""
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def _ler_corpo(receive):
+    """Corpo da requisição em memória ou, se grande, em um arquivo temporário"""
+    corpo = tempfile.SpooledTemporaryFile(max_size=CORPO_EM_MEMORIA)
+    while True:
+        mensagem = await receive()
+        if mensagem['type'] == 'http.disconnect':
+            break
+        corpo.write(mensagem.get('body', b''))
+        if not mensagem.get('more_body'):
+            break
+    corpo.seek(0)
+    return corpo
+
+
+def _environ(scope, corpo):
+    servidor = scope.get('server') or ('localhost', 80)
+    cliente = scope.get('client') or ('', 0)
+    tamanho = corpo.seek(0, io.SEEK_END)
+    corpo.seek(0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': servidor[0],
+        'SERVER_PORT': str(servidor[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': cliente[0],
+        'REMOTE_PORT': str(cliente[1]),
+        'CONTENT_LENGTH': str(tamanho),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': corpo,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    for nome, valor in scope['headers']:
+        nome = nome.decode('latin-1').upper().replace('-', '_')
+        valor = valor.decode('latin-1')
+        if nome == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = valor
+            continue
+        if nome == 'CONTENT_LENGTH':
+            continue
+        chave = f'HTTP_{nome}'
+        environ[chave] = f'{environ[chave]},{valor}' if chave in environ else valor
+    return environ
+
+
+def _cabecalho(scope, nome):
+    for chave, valor in scope['headers']:
+        if chave == nome:
+            return valor.decode('latin-1')
+    return None
+
+
+def _parametro(scope, nome):
+    valores = parse_qs(scope.get('query_string', b'').decode('latin-1')).get(nome)
+    return valores[0] if valores else None
+
+
+def _cors(scope):
+    """Cabeçalhos CORS das rotas nativas (mesma configuração do Flask-CORS)"""
+    origem = _cabecalho(scope, b'origin')
+    if origem not in server.CORS_ORIGINS:
+        return []
+    return [(b'access-control-allow-origin', origem.encode('latin-1')),
+            (b'access-control-expose-headers',
+             ', '.join(sorted(server.CORS_EXPOSE_HEADERS)).encode('latin-1')),
+            (b'access-control-allow-credentials', b'true'),
+            (b'vary', b'Origin')]
+
+
+def _url(scope):
+    host = _cabecalho(scope, b'host') or (scope.get('server') or ('localhost',))[0]
+    query = scope.get('query_string', b'').decode('latin-1')
+    return f"{scope.get('scheme', 'http')}://{host}{scope['path']}{'?' + query if query else ''}"
+
+
+def create_app(config=None):
+    """Fábrica do app ASGI: um app de server.create_app(config) com a ponte e as rotas nativas"""
+    return AcervoASGI(server.create_app(config), wsgi_threads=int(os.environ.get('ASGI_THREADS', 32)))
+
+
+# `asgi:app` (uvicorn asgi:app): app padrão, montado no primeiro acesso
+_app_padrao_lock = threading.Lock()
+
+
+def __getattr__(nome):
+    if nome != 'app':
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    global app
+    with _app_padrao_lock:
+        if 'app' not in globals():
+            app = create_app()
+    return app
+
+
+def _reset_apps():
+    for app in list(_APPS):
+        app._reset()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_apps)
@@ -0,0 +1,321 @@
+"""
+Log de auditoria (espelho de logs_atividade) com escrita em segundo plano
+A requisição só registra o evento em um buffer circular em memória e o
+enfileira; uma thread grava em lotes (group commit por tamanho ou tempo)
+em um arquivo JSONL append-only ou em SQLite. Consultas usam o buffer, com
+índices por usuario_id, curso_id, arquivo_id e created_at.
+"""
+
+import atexit
+import bisect
+import datetime
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+# Valores do enum tipo_acao (01_create_database.sql) e extras do mock
+TIPOS_ACAO = (
+    'CriacaoCurso', 'EdicaoCurso', 'MovimentacaoStatus', 'UploadArquivo', 'DownloadArquivo',
+    'CompartilhamentoArquivo', 'ExclusaoArquivo', 'Login', 'Logout', 'AlteracaoSenha',
+    'ExclusaoCurso', 'VerificacaoToken'
+)
+
+# `worker`: pid do processo que registrou (ids são sequências por processo)
+COLUNAS = ('id', 'usuario_id', 'curso_id', 'arquivo_id', 'tipo_acao', 'descricao',
+           'dados_anteriores', 'dados_novos', 'endereco_ip', 'user_agent', 'created_at', 'worker')
+
+_CAMPOS_INDEXADOS = ('usuario_id', 'curso_id', 'arquivo_id')
+
+
+class JsonlSink:
+    """Arquivo append-only, uma linha JSON por evento e um write por lote"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, eventos):
+        linhas = ''.join(json.dumps(e, default=str, ensure_ascii=False) + '\n' for e in eventos)
+        # Um único write em modo append: lotes de workers diferentes não se misturam
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(linhas)
+
+    def close(self):
+        pass
+
+
+class SqliteSink:
+    """Tabela logs_atividade em SQLite (WAL), um INSERT em lote por transação"""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+
+    def _conexao(self):
+        # Criada na thread de escrita (conexões SQLite não cruzam threads)
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS logs_atividade (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id INTEGER, usuario_id INTEGER, curso_id INTEGER, arquivo_id INTEGER,
+                    tipo_acao TEXT NOT NULL, descricao TEXT NOT NULL,
+                    dados_anteriores TEXT, dados_novos TEXT,
+                    endereco_ip TEXT, user_agent TEXT, created_at TEXT NOT NULL,
+                    worker INTEGER
+                )''')
+            colunas = {linha[1] for linha in conn.execute('PRAGMA table_info(logs_atividade)')}
+            if 'worker' not in colunas:
+                # Arquivo criado por uma versão anterior
+                conn.execute('ALTER TABLE logs_atividade ADD COLUMN worker INTEGER')
+            for coluna in ('usuario_id', 'curso_id', 'arquivo_id', 'tipo_acao', 'created_at'):
+                conn.execute(f'CREATE INDEX IF NOT EXISTS idx_logs_{coluna} '
+                             f'ON logs_atividade({coluna})')
+            self._conn = conn
+        return self._conn
+
+    def write(self, eventos):
+        conn = self._conexao()
+        linhas = [tuple(_coluna_sql(e.get(c)) for c in COLUNAS) for e in eventos]
+        with conn:
+            conn.executemany(f'INSERT INTO logs_atividade ({", ".join(COLUNAS)}) '
+                             f'VALUES ({", ".join("?" * len(COLUNAS))})', linhas)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def _coluna_sql(valor):
+    if isinstance(valor, (dict, list)):
+        return json.dumps(valor, default=str, ensure_ascii=False)
+    return valor
+
+
+def open_sink(path):
+    """Destino pela extensão: .db/.sqlite/.sqlite3 -> SQLite; demais -> JSONL"""
+    if not path:
+        return None
+    if path.endswith(('.db', '.sqlite', '.sqlite3')):
+        return SqliteSink(path)
+    return JsonlSink(path)
+
+
+class AuditLog:
+    """
+    Buffer circular de capacidade fixa: o evento de sequência `s` fica na
+    posição `s % capacity` e é válido enquanto `s >= next_seq - capacity`.
+    Os índices guardam listas crescentes de sequências. Quando uma posição
+    do buffer é reaproveitada, a sequência do evento sobrescrito (sempre a
+    primeira da sua lista) sai dos índices: eles nunca guardam mais que
+    `capacity` sequências por campo.
+    """
+
+    _SENTINELA = None
+
+    def __init__(self, sink=None, capacity=100000, queue_size=50000, batch_size=512,
+                 flush_interval=0.5):
+        self.sink = sink
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._ring = [None] * capacity
+        self._timestamps = [0.0] * capacity
+        self._indices = {campo: {} for campo in _CAMPOS_INDEXADOS}
+        self._next_seq = 0
+        self.worker = os.getpid()
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self.recorded = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.batches = 0
+        self.flush_errors = 0
+
+    # Escrita (caminho da requisição: O(1), nunca bloqueia)
+    def record(self, tipo_acao, descricao, usuario_id=None, curso_id=None, arquivo_id=None,
+               dados_anteriores=None, dados_novos=None, endereco_ip=None, user_agent=None):
+        evento = {
+            'usuario_id': usuario_id,
+            'curso_id': curso_id,
+            'arquivo_id': arquivo_id,
+            'tipo_acao': tipo_acao,
+            'descricao': descricao,
+            'dados_anteriores': dados_anteriores,
+            'dados_novos': dados_novos,
+            'endereco_ip': endereco_ip,
+            'user_agent': user_agent,
+            'worker': self.worker
+        }
+        with self._lock:
+            # Horário tomado sob o lock: o buffer fica ordenado por created_at
+            agora = time.time()
+            evento['created_at'] = datetime.datetime.fromtimestamp(agora, datetime.timezone.utc).isoformat()
+            seq = self._next_seq
+            self._next_seq += 1
+            evento['id'] = seq + 1
+            posicao = seq % self.capacity
+            sobrescrito = self._ring[posicao]
+            if sobrescrito is not None:
+                self._desindexar(sobrescrito, seq - self.capacity)
+            self._ring[posicao] = evento
+            self._timestamps[posicao] = agora
+            for campo in _CAMPOS_INDEXADOS:
+                valor = evento[campo]
+                if valor is not None:
+                    self._indices[campo].setdefault(valor, []).append(seq)
+            self.recorded += 1
+        if self.sink is not None:
+            try:
+                self._queue.put_nowait(evento)
+            except queue.Full:
+                self.dropped += 1
+        return evento
+
+    # Consulta
+    def query(self, usuario_id=None, curso_id=None, arquivo_id=None, tipo_acao=None,
+              desde=None, ate=None, before_id=None, limit=100):
+        """
+        Eventos mais recentes primeiro. Usa o índice do campo informado (ou
+        o intervalo de created_at por bisect) e filtra o restante.
+        `desde`/`ate` são timestamps; `before_id` pagina para trás.
+        """
+        filtros = {'usuario_id': usuario_id, 'curso_id': curso_id, 'arquivo_id': arquivo_id}
+        filtros = {c: v for c, v in filtros.items() if v is not None}
+        with self._lock:
+            inicio = max(0, self._next_seq - self.capacity)
+            fim = self._next_seq
+            if before_id is not None:
+                fim = min(fim, max(inicio, before_id - 1))
+            if desde is not None or ate is not None:
+                inicio, fim = self._intervalo(inicio, fim, desde, ate)
+
+            candidatos = None
+            for campo, valor in filtros.items():
+                seqs = self._indices[campo].get(valor)
+                if not seqs:
+                    return []
+                if candidatos is None or len(seqs) < len(candidatos):
+                    candidatos = seqs
+            if candidatos is None:
+                candidatos = range(inicio, fim)
+            else:
+                candidatos = candidatos[bisect.bisect_left(candidatos, inicio):
+                                        bisect.bisect_left(candidatos, fim)]
+
+            resultado = []
+            for seq in reversed(candidatos):
+                evento = self._ring[seq % self.capacity]
+                if tipo_acao is not None and evento['tipo_acao'] != tipo_acao:
+                    continue
+                if any(evento[c] != v for c, v in filtros.items()):
+                    continue
+                resultado.append(evento)
+                if len(resultado) >= limit:
+                    break
+            return resultado
+
+    def _intervalo(self, inicio, fim, desde, ate):
+        """Sequências com created_at em [desde, ate] (buffer ordenado no tempo)"""
+        chave = lambda seq: self._timestamps[seq % self.capacity]  # noqa: E731
+        if desde is not None:
+            inicio = bisect.bisect_left(range(inicio, fim), desde, key=chave) + inicio
+        if ate is not None:
+            fim = bisect.bisect_right(range(inicio, fim), ate, key=chave) + inicio
+        return inicio, fim
+
+    def _desindexar(self, evento, seq):
+        """Chamado com o lock adquirido: `seq` é a mais antiga de cada lista do evento"""
+        for campo in _CAMPOS_INDEXADOS:
+            valor = evento[campo]
+            if valor is None:
+                continue
+            seqs = self._indices[campo][valor]
+            del seqs[0]
+            if not seqs:
+                del self._indices[campo][valor]
+
+    # Escrita em segundo plano
+    def start(self):
+        if self.sink is None:
+            return self
+        self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        """Grava os eventos pendentes e encerra a thread"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(self._SENTINELA)
+            self._thread.join(timeout=10)
+        self._thread = None
+
+    def restart_after_fork(self):
+        """
+        No processo filho: novos lock, fila e thread. Eventos pendentes
+        herdados são do processo pai (que os grava) e são descartados aqui.
+        """
+        self._lock = threading.Lock()
+        self.worker = os.getpid()
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        if self.sink is not None:
+            self.sink = type(self.sink)(self.sink.path)
+            self.start()
+
+    def _run(self):
+        try:
+            self._consumir()
+        finally:
+            self.sink.close()
+
+    def _consumir(self):
+        while True:
+            evento = self._queue.get()
+            if evento is self._SENTINELA:
+                return
+            lote = [evento]
+            # Group commit: junta o que chegar até o lote encher ou o prazo vencer
+            prazo = time.monotonic() + self.flush_interval
+            parar = False
+            while len(lote) < self.batch_size:
+                restante = prazo - time.monotonic()
+                try:
+                    evento = self._queue.get(timeout=restante) if restante > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if evento is self._SENTINELA:
+                    parar = True
+                    break
+                lote.append(evento)
+            self._flush(lote)
+            if parar:
+                return
+
+    def _flush(self, lote):
+        try:
+            self.sink.write(lote)
+        except (OSError, sqlite3.Error):
+            self.flush_errors += 1
+            return
+        self.flushed += len(lote)
+        self.batches += 1
+
+    def get_stats(self):
+        return {
+            'recorded': self.recorded,
+            'buffered': min(self._next_seq, self.capacity),
+            'capacity': self.capacity,
+            'pending': self._queue.qsize(),
+            'dropped': self.dropped,
+            'flushed': self.flushed,
+            'batches': self.batches,
+            'flush_errors': self.flush_errors,
+            'sink': getattr(self.sink, 'path', None)
+        }
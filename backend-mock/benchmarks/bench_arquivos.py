@@ -0,0 +1,242 @@
+"""
+Benchmark de throughput dos arquivos
+Mede, por HTTP real, o upload retomável em blocos, o download completo
+(streaming) e downloads com Range de um arquivo grande, com um ou vários
+clientes simultâneos.
+
+Por padrão sobe o app em processo com o servidor do Werkzeug (threads);
+com --url mede um servidor já em execução (ex.: python serve.py, onde o
+gunicorn usa sendfile no download completo).
+
+Uso:
+    python benchmarks/bench_arquivos.py
+    python benchmarks/bench_arquivos.py --size-mb 512 --chunk-mb 8 --clients 4 --json resultado.json
+    python benchmarks/bench_arquivos.py --url http://localhost:5007
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+# Sem controle de admissão: todas as requisições vêm do mesmo cliente
+os.environ.setdefault('ACERVO_RATE_LIMIT', '0')
+os.environ.setdefault('ACERVO_MAX_IN_FLIGHT', '0')
+
+MB = 1024 * 1024
+BLOCO_LEITURA = MB
+
+
+class Cliente:
+    """Conexão keep-alive com o servidor"""
+
+    def __init__(self, base_url):
+        partes = urlsplit(base_url)
+        self.host = partes.hostname
+        self.port = partes.port or 80
+
+    def conectar(self):
+        return http.client.HTTPConnection(self.host, self.port, timeout=120)
+
+
+def iniciar_servidor_local():
+    """App em processo, em uma porta livre, com armazenamento temporário"""
+    os.environ.setdefault('ACERVO_STORAGE_DIR', tempfile.mkdtemp(prefix='acervo-bench-'))
+    from werkzeug.serving import make_server
+    import server
+
+    httpd = make_server('127.0.0.1', 0, server.create_app(), threaded=True)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f'http://127.0.0.1:{httpd.server_port}'
+
+
+def _json(conexao, metodo, caminho, corpo=None, cabecalhos=None):
+    cabecalhos = dict(cabecalhos or {})
+    if corpo is not None and not isinstance(corpo, (bytes, bytearray, memoryview)):
+        corpo = json.dumps(corpo).encode('utf-8')
+        cabecalhos['Content-Type'] = 'application/json'
+    conexao.request(metodo, caminho, body=corpo, headers=cabecalhos)
+    resposta = conexao.getresponse()
+    dados = resposta.read()
+    return resposta, (json.loads(dados) if dados else None)
+
+
+def medir_upload(cliente, tamanho, tamanho_bloco, curso_id):
+    """Upload retomável (POST + PATCHs) de `tamanho` bytes pseudoaleatórios"""
+    bloco = random.Random(1).randbytes(tamanho_bloco)
+    conexao = cliente.conectar()
+    resposta, dados = _json(conexao, 'POST', f'/api/arquivos/curso/{curso_id}/uploads',
+                            {'nome': 'bench.mp4', 'tamanho': tamanho, 'categoria': 'Videos',
+                             'tipo_mime': 'video/mp4'})
+    if resposta.status != 201:
+        raise RuntimeError(f"Falha ao iniciar upload: {resposta.status} {dados}")
+    upload_url = dados['upload_url']
+
+    inicio = time.perf_counter()
+    offset = 0
+    while offset < tamanho:
+        parte = memoryview(bloco)[:min(tamanho_bloco, tamanho - offset)]
+        resposta, dados = _json(conexao, 'PATCH', upload_url, parte,
+                                {'Upload-Offset': str(offset),
+                                 'Content-Type': 'application/offset+octet-stream'})
+        offset += len(parte)
+    duracao = time.perf_counter() - inicio
+    conexao.close()
+    if resposta.status != 201:
+        raise RuntimeError(f"Upload não concluído: {resposta.status} {dados}")
+    return dados['data']['id'], {
+        'bytes': tamanho,
+        'chunk_bytes': tamanho_bloco,
+        'seconds': round(duracao, 3),
+        'mb_per_second': round(tamanho / MB / duracao, 1)
+    }
+
+
+def _baixar(conexao, caminho, cabecalhos=None):
+    conexao.request('GET', caminho, headers=cabecalhos or {})
+    resposta = conexao.getresponse()
+    total = 0
+    while True:
+        bloco = resposta.read(BLOCO_LEITURA)
+        if not bloco:
+            break
+        total += len(bloco)
+    return resposta.status, total
+
+
+def _em_paralelo(clientes, tarefa):
+    """Executa `tarefa()` em N threads; retorna (bytes, requisições, segundos)"""
+    totais = []
+    lock = threading.Lock()
+
+    def executar():
+        resultado = tarefa()
+        with lock:
+            totais.append(resultado)
+
+    threads = [threading.Thread(target=executar) for _ in range(clientes)]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duracao = time.perf_counter() - inicio
+    return sum(b for b, _ in totais), sum(r for _, r in totais), duracao
+
+
+def medir_download(cliente, arquivo_id, repeticoes, clientes):
+    caminho = f'/api/arquivos/{arquivo_id}/download'
+
+    def tarefa():
+        conexao = cliente.conectar()
+        total = 0
+        for _ in range(repeticoes):
+            status, lidos = _baixar(conexao, caminho)
+            if status != 200:
+                raise RuntimeError(f"Download falhou: {status}")
+            total += lidos
+        conexao.close()
+        return total, repeticoes
+
+    total, requisicoes, duracao = _em_paralelo(clientes, tarefa)
+    return {
+        'clients': clientes,
+        'requests': requisicoes,
+        'bytes': total,
+        'seconds': round(duracao, 3),
+        'mb_per_second': round(total / MB / duracao, 1)
+    }
+
+
+def medir_ranges(cliente, arquivo_id, tamanho, tamanho_range, requisicoes, clientes):
+    """Leituras aleatórias (como o seek de um player de vídeo)"""
+    caminho = f'/api/arquivos/{arquivo_id}/download'
+
+    def tarefa():
+        rng = random.Random(threading.get_ident())
+        conexao = cliente.conectar()
+        total = 0
+        for _ in range(requisicoes):
+            inicio = rng.randrange(0, max(1, tamanho - tamanho_range))
+            status, lidos = _baixar(conexao, caminho,
+                                    {'Range': f'bytes={inicio}-{inicio + tamanho_range - 1}'})
+            if status != 206:
+                raise RuntimeError(f"Range falhou: {status}")
+            total += lidos
+        conexao.close()
+        return total, requisicoes
+
+    total, feitas, duracao = _em_paralelo(clientes, tarefa)
+    return {
+        'clients': clientes,
+        'range_bytes': tamanho_range,
+        'requests': feitas,
+        'requests_per_second': round(feitas / duracao, 1),
+        'mb_per_second': round(total / MB / duracao, 1)
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de upload/download de arquivos')
+    parser.add_argument('--url', help='servidor já em execução (padrão: app em processo)')
+    parser.add_argument('--curso-id', type=int, default=1)
+    parser.add_argument('--size-mb', type=int, default=256)
+    parser.add_argument('--chunk-mb', type=int, default=8)
+    parser.add_argument('--downloads', type=int, default=3, help='downloads completos por cliente')
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--range-kb', type=int, default=256)
+    parser.add_argument('--range-requests', type=int, default=200, help='Ranges por cliente')
+    parser.add_argument('--json', dest='json_path')
+    args = parser.parse_args(argv)
+
+    httpd = None
+    base_url = args.url
+    if base_url is None:
+        httpd, base_url = iniciar_servidor_local()
+    cliente = Cliente(base_url)
+    tamanho = args.size_mb * MB
+
+    try:
+        arquivo_id, upload = medir_upload(cliente, tamanho, args.chunk_mb * MB, args.curso_id)
+        print(f"upload    {upload['mb_per_second']:>8} MB/s  ({args.size_mb} MB em blocos de "
+              f"{args.chunk_mb} MB)")
+
+        downloads = []
+        for clientes in sorted({1, args.clients}):
+            resultado = medir_download(cliente, arquivo_id, args.downloads, clientes)
+            downloads.append(resultado)
+            print(f"download  {resultado['mb_per_second']:>8} MB/s  (clientes={clientes})")
+
+        ranges = []
+        for clientes in sorted({1, args.clients}):
+            resultado = medir_ranges(cliente, arquivo_id, tamanho, args.range_kb * 1024,
+                                     args.range_requests, clientes)
+            ranges.append(resultado)
+            print(f"range     {resultado['mb_per_second']:>8} MB/s  "
+                  f"{resultado['requests_per_second']} req/s  (clientes={clientes}, "
+                  f"{args.range_kb} KB)")
+
+        conexao = cliente.conectar()
+        _json(conexao, 'DELETE', f'/api/arquivos/{arquivo_id}')
+        conexao.close()
+    finally:
+        if httpd is not None:
+            httpd.shutdown()
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'server': base_url if args.url else 'werkzeug (em processo)',
+                       'upload': upload, 'download': downloads, 'range': ranges}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark de throughput do login
+Mede o custo do KDF e a vazão de /api/auth/login (Flask test client, em
+processo) para vários tamanhos do pool de verificação de senha, e sugere o
+tamanho do pool para um volume de sessões (como em sessoes_usuario).
+
+Uso:
+    python benchmarks/bench_login.py
+    python benchmarks/bench_login.py --pools 1 2 4 8 --clients 16 --requests 200 \\
+        --sessions-per-hour 20000 --peak-factor 8 --json resultado.json
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+# Sem controle de admissão: todas as requisições vêm do mesmo cliente
+os.environ.setdefault('ACERVO_RATE_LIMIT', '0')
+os.environ.setdefault('ACERVO_MAX_IN_FLIGHT', '0')
+
+import server  # noqa: E402
+from user_store import PasswordVerifier, hash_password, verify_password  # noqa: E402
+
+CREDENCIAIS = {'email': 'admin@acervoeducacional.com', 'password': 'Admin@123'}
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, math.ceil(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+def medir_kdf(amostras):
+    password_hash = hash_password(CREDENCIAIS['password'])
+    tempos = []
+    for _ in range(amostras):
+        inicio = time.perf_counter()
+        verify_password(password_hash, CREDENCIAIS['password'])
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.mean(tempos)
+
+
+def medir_pool(app, tamanho, clientes, total_requisicoes):
+    server.estado_do_app(app).password_verifier = PasswordVerifier(max_workers=tamanho, max_pending=clientes)
+    latencias = []
+    status = {}
+    lock = threading.Lock()
+    por_cliente = max(1, total_requisicoes // clientes)
+
+    def cliente():
+        client = app.test_client()
+        locais = []
+        for _ in range(por_cliente):
+            inicio = time.perf_counter()
+            resposta = client.post('/api/auth/login', json=CREDENCIAIS)
+            locais.append((time.perf_counter() - inicio, resposta.status_code))
+        with lock:
+            for duracao, codigo in locais:
+                latencias.append(duracao)
+                status[codigo] = status.get(codigo, 0) + 1
+
+    threads = [threading.Thread(target=cliente) for _ in range(clientes)]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duracao = time.perf_counter() - inicio
+
+    return {
+        'pool_size': tamanho,
+        'clients': clientes,
+        'requests': len(latencias),
+        'logins_per_second': round(status.get(200, 0) / duracao, 2),
+        'p50_ms': round(percentil(latencias, 50) * 1000, 2),
+        'p95_ms': round(percentil(latencias, 95) * 1000, 2),
+        'p99_ms': round(percentil(latencias, 99) * 1000, 2),
+        'status': status
+    }
+
+
+def dimensionar(kdf_segundos, sessoes_por_hora, fator_pico, utilizacao_alvo):
+    """Threads necessárias para o pico com a utilização alvo (lei de Little)"""
+    taxa_pico = sessoes_por_hora / 3600 * fator_pico
+    return {
+        'sessions_per_hour': sessoes_por_hora,
+        'peak_factor': fator_pico,
+        'peak_logins_per_second': round(taxa_pico, 2),
+        'target_utilization': utilizacao_alvo,
+        'recommended_pool_size': max(1, math.ceil(taxa_pico * kdf_segundos / utilizacao_alvo)),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de login')
+    parser.add_argument('--pools', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=128)
+    parser.add_argument('--kdf-samples', type=int, default=10)
+    parser.add_argument('--sessions-per-hour', type=int, default=5000)
+    parser.add_argument('--peak-factor', type=float, default=10.0)
+    parser.add_argument('--target-utilization', type=float, default=0.7)
+    parser.add_argument('--json', dest='json_path')
+    args = parser.parse_args(argv)
+
+    kdf = medir_kdf(args.kdf_samples)
+    print(f"KDF: {kdf * 1000:.1f} ms por verificação")
+
+    app = server.create_app()
+    resultados = []
+    for tamanho in args.pools:
+        resultado = medir_pool(app, tamanho, args.clients, args.requests)
+        resultados.append(resultado)
+        print(f"pool={tamanho:<3} {resultado['logins_per_second']:>8} logins/s  "
+              f"p50={resultado['p50_ms']}ms p95={resultado['p95_ms']}ms "
+              f"p99={resultado['p99_ms']}ms status={resultado['status']}")
+
+    sizing = dimensionar(kdf, args.sessions_per_hour, args.peak_factor, args.target_utilization)
+    print(f"Pico de {sizing['peak_logins_per_second']} logins/s -> "
+          f"pool recomendado: {sizing['recommended_pool_size']} (CPUs: {sizing['cpu_count']})")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'kdf_seconds': kdf, 'pools': resultados, 'sizing': sizing}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,396 @@
+"""
+Suíte de benchmarks das rotas do Backend Mock
+Executa os mesmos cenários (login, verify, /api/cursos com busca e
+paginação, kanban, stats com cache frio e quente, health...) em processo
+(Flask test client) e por HTTP real contra um servidor iniciado localmente
+(serve.py), para vários tamanhos de base sintética. Reporta vazão,
+latências p50/p95/p99 e alocações por requisição (tracemalloc, em
+processo) e grava JSON para comparar execuções.
+
+Uso:
+    python benchmarks/bench_routes.py
+    python benchmarks/bench_routes.py --sizes 1000 100000 --mode both --json atual.json
+    python benchmarks/bench_routes.py --json atual.json --compare base.json --fail-on-regression
+    python benchmarks/bench_routes.py --mode http --workers 4 --threads 8 --concurrency 16
+    python benchmarks/bench_routes.py --mode http --asgi    # variante asgi.py (uvicorn)
+"""
+
+import argparse
+import datetime
+import http.client
+import json
+import math
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+# Sem controle de admissão: todas as requisições vêm do mesmo cliente
+os.environ.setdefault('ACERVO_RATE_LIMIT', '0')
+os.environ.setdefault('ACERVO_MAX_IN_FLIGHT', '0')
+# Sem gravação de auditoria em disco durante a medição
+os.environ.setdefault('ACERVO_AUDIT_FILE', '')
+
+CREDENCIAIS = {'email': 'admin@acervoeducacional.com', 'password': 'Admin@123'}
+SEED = 42
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, math.ceil(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+# Clientes: a mesma interface em processo e por HTTP
+class ClienteEmProcesso:
+    modo = 'inprocess'
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, metodo, caminho, headers=None, corpo=None):
+        resposta = self.client.open(caminho, method=metodo, headers=headers, json=corpo)
+        return resposta.status_code, resposta.get_data()
+
+
+class ClienteHTTP:
+    """Uma conexão keep-alive por thread"""
+    modo = 'http'
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self._local = threading.local()
+
+    def _conexao(self):
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None:
+            conexao = self._local.conexao = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        return conexao
+
+    def request(self, metodo, caminho, headers=None, corpo=None):
+        headers = dict(headers or {})
+        dados = None
+        if corpo is not None:
+            dados = json.dumps(corpo).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        for tentativa in (1, 2):
+            conexao = self._conexao()
+            try:
+                conexao.request(metodo, caminho, body=dados, headers=headers)
+                resposta = conexao.getresponse()
+                return resposta.status, resposta.read()
+            except (http.client.HTTPException, ConnectionError):
+                # Conexão keep-alive encerrada pelo servidor: reconecta uma vez
+                conexao.close()
+                self._local.conexao = None
+                if tentativa == 2:
+                    raise
+
+
+# Cenários
+def preparar(cliente):
+    """Token e cursor válidos para os cenários que dependem deles"""
+    status, corpo = cliente.request('POST', '/api/auth/login', corpo=CREDENCIAIS)
+    if status != 200:
+        raise RuntimeError(f"Login falhou no preparo: {status}")
+    token = json.loads(corpo)['token']
+    _, corpo = cliente.request('GET', '/api/cursos?cursor=&limit=20')
+    cursor = json.loads(corpo).get('next_cursor') or ''
+    return {'Authorization': f'Bearer {token}'}, cursor
+
+
+def cenarios(tamanho, auth, cursor, limpar_stats=None):
+    """
+    (nome, método, caminho, opções). `max` limita requisições de cenários
+    caros; `antes` roda antes de cada requisição (fora da medição).
+    """
+    pagina_meio = max(1, tamanho // 20 // 2)
+    lista = [
+        ('login', 'POST', '/api/auth/login', {'corpo': CREDENCIAIS, 'max': 20}),
+        ('verify', 'GET', '/api/auth/verify', {'headers': auth}),
+        ('stats_warm', 'GET', '/api/dashboard/stats', {}),
+        ('cursos_page1', 'GET', '/api/cursos?page=1&per_page=20', {}),
+        ('cursos_page_middle', 'GET', f'/api/cursos?page={pagina_meio}&per_page=20', {}),
+        ('cursos_cursor', 'GET', f'/api/cursos?cursor={cursor}&limit=20', {}),
+        ('cursos_status', 'GET', '/api/cursos?status=Veiculado&per_page=20', {}),
+        ('search_term', 'GET', '/api/cursos?search=python', {}),
+        ('search_prefix', 'GET', '/api/cursos?search=pyt', {}),
+        ('search_multi_status', 'GET',
+         '/api/cursos?search=gest%C3%A3o%20vendas&status=Veiculado', {}),
+        ('kanban', 'GET', '/api/cursos/kanban', {'max': 50}),
+        ('usuarios', 'GET', '/api/usuarios', {}),
+        ('health', 'GET', '/api/health', {}),
+    ]
+    if limpar_stats is not None:
+        lista.insert(3, ('stats_cold', 'GET', '/api/dashboard/stats', {'antes': limpar_stats}))
+    return lista
+
+
+def medir(cliente, metodo, caminho, opcoes, requisicoes, aquecimento, concorrencia):
+    total = min(requisicoes, opcoes.get('max', requisicoes))
+    headers, corpo, antes = opcoes.get('headers'), opcoes.get('corpo'), opcoes.get('antes')
+    for _ in range(min(aquecimento, total)):
+        cliente.request(metodo, caminho, headers, corpo)
+
+    latencias = []
+    status = {}
+    lock = threading.Lock()
+    por_thread = max(1, total // concorrencia)
+
+    def executar():
+        locais = []
+        for _ in range(por_thread):
+            if antes is not None:
+                antes()
+            inicio = time.perf_counter()
+            codigo, _ = cliente.request(metodo, caminho, headers, corpo)
+            locais.append((time.perf_counter() - inicio, codigo))
+        with lock:
+            for duracao, codigo in locais:
+                latencias.append(duracao)
+                status[codigo] = status.get(codigo, 0) + 1
+
+    inicio = time.perf_counter()
+    if concorrencia == 1:
+        executar()
+    else:
+        threads = [threading.Thread(target=executar) for _ in range(concorrencia)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    duracao = time.perf_counter() - inicio
+
+    return {
+        'requests': len(latencias),
+        'concurrency': concorrencia,
+        'rps': round(len(latencias) / duracao, 1),
+        'mean_ms': round(statistics.mean(latencias) * 1000, 3),
+        'p50_ms': round(percentil(latencias, 50) * 1000, 3),
+        'p95_ms': round(percentil(latencias, 95) * 1000, 3),
+        'p99_ms': round(percentil(latencias, 99) * 1000, 3),
+        'status': {str(k): v for k, v in sorted(status.items())}
+    }
+
+
+def medir_alocacoes(cliente, metodo, caminho, opcoes, amostras):
+    """Pico e saldo de memória alocada por requisição (tracemalloc)"""
+    headers, corpo, antes = opcoes.get('headers'), opcoes.get('corpo'), opcoes.get('antes')
+    picos, saldos = [], []
+    tracemalloc.start()
+    try:
+        for _ in range(min(amostras, opcoes.get('max', amostras))):
+            if antes is not None:
+                antes()
+            antes_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            cliente.request(metodo, caminho, headers, corpo)
+            atual, pico = tracemalloc.get_traced_memory()
+            picos.append(pico - antes_bytes)
+            saldos.append(atual - antes_bytes)
+    finally:
+        tracemalloc.stop()
+    return {
+        'alloc_peak_kb': round(statistics.mean(picos) / 1024, 1),
+        'alloc_retained_kb': round(statistics.mean(saldos) / 1024, 2)
+    }
+
+
+# Execução em processo
+def carregar_base(estado, tamanho):
+    """Troca a base de cursos do app por uma sintética de N cursos"""
+    from loader import Loader, generate
+    from store import CourseStore
+
+    estado.curso_store = CourseStore()
+    Loader(estado.curso_store).load(generate(cursos=tamanho, arquivos_por_curso=0, usuarios=0,
+                                             seed=SEED))
+    estado.response_cache.invalidate()
+    estado.cache.clear()
+
+
+def rodar_em_processo(tamanhos, args):
+    import server
+
+    app = server.create_app()
+    estado = server.estado_do_app(app)
+    resultados = []
+
+    def limpar():
+        with app.app_context():
+            estado.cache.delete(server.chave_dashboard())
+
+    for tamanho in tamanhos:
+        carregar_base(estado, tamanho)
+        cliente = ClienteEmProcesso(app)
+        auth, cursor = preparar(cliente)
+        for nome, metodo, caminho, opcoes in cenarios(tamanho, auth, cursor, limpar):
+            resultado = medir(cliente, metodo, caminho, opcoes, args.requests, args.warmup, 1)
+            if not args.no_alloc:
+                resultado.update(medir_alocacoes(cliente, metodo, caminho, opcoes, args.alloc_samples))
+            resultados.append(dict(resultado, mode='inprocess', dataset=tamanho, scenario=nome))
+            imprimir(resultados[-1])
+    return resultados
+
+
+# Execução por HTTP (servidor local em subprocesso)
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def iniciar_servidor(tamanho, args):
+    porta = _porta_livre()
+    env = dict(os.environ, ACERVO_SEED_SYNTHETIC=f'{tamanho}:0:0:{SEED}', ACERVO_AUDIT_FILE='',
+               LOG_LEVEL='WARNING')
+    comando = [sys.executable, os.path.join(RAIZ, 'serve.py'), '--host', '127.0.0.1',
+               '--port', str(porta), '--workers', str(args.workers), '--threads', str(args.threads)]
+    if args.asgi:
+        comando.append('--asgi')
+    processo = subprocess.Popen(
+        comando,
+        cwd=RAIZ, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    limite = time.monotonic() + args.startup_timeout
+    while time.monotonic() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError(f"Servidor encerrou ao iniciar (código {processo.returncode})")
+        try:
+            conexao = http.client.HTTPConnection('127.0.0.1', porta, timeout=2)
+            conexao.request('GET', '/api/health')
+            if conexao.getresponse().status == 200:
+                conexao.close()
+                return processo, porta
+        except OSError:
+            pass
+        time.sleep(0.2)
+    processo.terminate()
+    raise RuntimeError("Servidor não respondeu a tempo")
+
+
+def rodar_http(tamanhos, args):
+    resultados = []
+    for tamanho in tamanhos:
+        processo, porta = iniciar_servidor(tamanho, args)
+        try:
+            cliente = ClienteHTTP('127.0.0.1', porta)
+            auth, cursor = preparar(cliente)
+            # Cache frio não é controlável de fora do processo
+            for nome, metodo, caminho, opcoes in cenarios(tamanho, auth, cursor):
+                resultado = medir(cliente, metodo, caminho, opcoes, args.requests, args.warmup,
+                                  args.concurrency)
+                resultados.append(dict(resultado, mode='http-asgi' if args.asgi else 'http',
+                                       dataset=tamanho, scenario=nome,
+                                       workers=args.workers, threads=args.threads))
+                imprimir(resultados[-1])
+        finally:
+            processo.terminate()
+            processo.wait(timeout=30)
+    return resultados
+
+
+# Relatório e comparação
+def imprimir(r):
+    alocacao = f"  alloc_peak={r['alloc_peak_kb']}KB" if 'alloc_peak_kb' in r else ''
+    print(f"{r['mode']:<9} n={r['dataset']:<7} {r['scenario']:<20} {r['rps']:>9} req/s  "
+          f"p50={r['p50_ms']:.2f}ms p95={r['p95_ms']:.2f}ms p99={r['p99_ms']:.2f}ms{alocacao}")
+
+
+def _chave(r):
+    return (r['mode'], r['dataset'], r['scenario'])
+
+
+def comparar(resultados, caminho_base, limite):
+    """Variação contra uma execução anterior; retorna as regressões"""
+    with open(caminho_base, encoding='utf-8') as f:
+        base = {_chave(r): r for r in json.load(f)['results']}
+    regressoes = []
+    print(f"\nComparação com {caminho_base} (limite {limite:.0%}):")
+    for r in resultados:
+        b = base.get(_chave(r))
+        if b is None:
+            continue
+        delta_p95 = r['p95_ms'] / b['p95_ms'] - 1 if b['p95_ms'] else 0.0
+        delta_rps = r['rps'] / b['rps'] - 1 if b['rps'] else 0.0
+        regrediu = delta_p95 > limite or delta_rps < -limite
+        if regrediu:
+            regressoes.append({'key': list(_chave(r)), 'p95_delta': round(delta_p95, 3),
+                               'rps_delta': round(delta_rps, 3)})
+        print(f"  {'REGRESSÃO' if regrediu else 'ok':<9} {r['mode']:<9} n={r['dataset']:<7} "
+              f"{r['scenario']:<20} p95 {delta_p95:+.1%}  req/s {delta_rps:+.1%}")
+    return regressoes
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks das rotas do Backend Mock')
+    parser.add_argument('--mode', choices=('inprocess', 'http', 'both'), default='inprocess')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='tamanhos da base sintética de cursos')
+    parser.add_argument('--requests', type=int, default=500, help='requisições por cenário')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--alloc-samples', type=int, default=50)
+    parser.add_argument('--no-alloc', action='store_true', help='não medir alocações')
+    parser.add_argument('--concurrency', type=int, default=8, help='clientes simultâneos (HTTP)')
+    parser.add_argument('--workers', type=int, default=2, help='workers do servidor (HTTP)')
+    parser.add_argument('--threads', type=int, default=8, help='threads por worker (HTTP)')
+    parser.add_argument('--asgi', action='store_true', help='servidor assíncrono (serve.py --asgi)')
+    parser.add_argument('--startup-timeout', type=float, default=120)
+    parser.add_argument('--json', dest='json_path')
+    parser.add_argument('--compare', help='JSON de uma execução anterior')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='variação que conta como regressão (0.10 = 10%%)')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args(argv)
+
+    resultados = []
+    if args.mode in ('inprocess', 'both'):
+        resultados += rodar_em_processo(args.sizes, args)
+    if args.mode in ('http', 'both'):
+        resultados += rodar_http(args.sizes, args)
+
+    relatorio = {
+        'meta': {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': SEED,
+            'args': vars(args)
+        },
+        'results': resultados
+    }
+    regressoes = []
+    if args.compare:
+        regressoes = comparar(resultados, args.compare, args.threshold)
+        relatorio['regressions'] = regressoes
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+    if regressoes and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+"""
+Feed de mudanças do Kanban (SSE e long-poll)
+Cada alteração de curso vira um único evento com versão crescente, guardado
+em um buffer circular e entregue a todos os clientes conectados; o cliente
+aplica a transição (coluna de origem/destino) e o delta das estatísticas em
+vez de recarregar o Kanban e o dashboard inteiros a cada poll.
+
+Cada cliente é só um cursor (a última versão recebida) sobre o buffer
+compartilhado: a memória por cliente é constante. Quem fica mais de
+`max_lag` eventos para trás (ou pede uma versão que já saiu do buffer)
+recebe um evento `reset` e deve recarregar /api/cursos/kanban.
+
+Com o banco SQLite os eventos são gravados na tabela eventos_cursos (o id
+é a versão) e cada worker acompanha a tabela em uma thread: a versão é a
+mesma em todos os processos e o cliente pode reconectar em qualquer um.
+"""
+
+import collections
+import datetime
+import itertools
+import json
+import threading
+import time
+
+# Status do curso -> contador do dashboard
+STATS_POR_STATUS = {
+    'Veiculado': 'cursos_ativos',
+    'Em Desenvolvimento': 'cursos_desenvolvimento'
+}
+
+
+def evento_curso(anterior, novo, colunas):
+    """
+    (tipo, dados) da mudança de um curso: criado, excluído, movido de
+    coluna ou atualizado. `colunas` mapeia status -> coluna do Kanban.
+    """
+    curso = novo if novo is not None else anterior
+    status_anterior = anterior.get('status') if anterior is not None else None
+    status = novo.get('status') if novo is not None else None
+    stats = {}
+    if anterior is None:
+        tipo = 'curso.criado'
+        stats['total_cursos'] = 1
+    elif novo is None:
+        tipo = 'curso.excluido'
+        stats['total_cursos'] = -1
+    elif status_anterior != status:
+        tipo = 'curso.movido'
+    else:
+        tipo = 'curso.atualizado'
+    if status_anterior != status:
+        for valor, delta in ((status_anterior, -1), (status, 1)):
+            campo = STATS_POR_STATUS.get(valor)
+            if campo is not None:
+                stats[campo] = stats.get(campo, 0) + delta
+    return tipo, {
+        'curso_id': curso.get('id'),
+        'curso': novo,
+        'status_anterior': status_anterior,
+        'status': status,
+        'coluna_anterior': colunas.get(status_anterior),
+        'coluna': colunas.get(status),
+        'stats': stats
+    }
+
+
+def marcador(tipo, version):
+    """
+    Evento de controle: `sync` (versão inicial de um cliente novo) ou
+    `reset` (recarregar o Kanban e continuar a partir de `version`)
+    """
+    return {'version': version, 'tipo': tipo, 'dados': {'kanban': '/api/cursos/kanban'}}
+
+
+def parse_versao(valor):
+    """Versão de Last-Event-ID ou ?since= (None: começar da versão atual)"""
+    if valor is None or valor == '':
+        return None
+    versao = int(valor)
+    if versao < 0:
+        raise ValueError(valor)
+    return versao
+
+
+def formatar_sse(evento):
+    """Evento no formato text/event-stream (id = versão, para Last-Event-ID)"""
+    dados = json.dumps(evento, default=_json_default, ensure_ascii=False, separators=(',', ':'))
+    return f"id: {evento['version']}\nevent: {evento['tipo']}\ndata: {dados}\n\n"
+
+
+def _json_default(o):
+    if hasattr(o, 'to_dict'):
+        return o.to_dict()
+    return str(o)
+
+
+class ChangeFeed:
+    """
+    Buffer circular de eventos com versões contíguas: o evento de versão
+    `v` está na posição `v - primeira versão` do deque. Leitores bloqueantes
+    (threads do WSGI) esperam em uma Condition; leitores assíncronos (ASGI)
+    em futures acordadas pelo laço de cada um.
+    """
+
+    def __init__(self, capacity=10000, max_lag=1000, colunas=None, banco=None, poll_interval=0.2):
+        self.capacity = capacity
+        self.max_lag = max_lag
+        self.colunas = dict(colunas or {})
+        self.banco = banco
+        self.poll_interval = poll_interval
+        self._eventos = collections.deque(maxlen=capacity)
+        self._version = 0
+        self._cond = threading.Condition()
+        self._esperas = set()
+        self._thread = None
+        self._parar = threading.Event()
+        self.published = 0
+        self.resets = 0
+        self.subscribers = 0
+        if banco is not None:
+            self._carregar_recentes()
+
+    @property
+    def version(self):
+        return self._version
+
+    # Publicação
+    def curso_alterado(self, anterior, novo):
+        """Observador dos repositórios de cursos; (None, None) = carga em lote"""
+        if anterior is None and novo is None:
+            return self.publish('reset', {'motivo': 'carga'})
+        tipo, dados = evento_curso(anterior, novo, self.colunas)
+        return self.publish(tipo, dados)
+
+    def publish(self, tipo, dados):
+        criado = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        if self.banco is not None:
+            # A versão vem do banco; o evento chega aos leitores pela thread
+            # que acompanha a tabela (em todos os workers, inclusive este)
+            return self._gravar_banco(tipo, dados, criado)
+        with self._cond:
+            self._version += 1
+            self._anexar({'version': self._version, 'tipo': tipo, 'dados': dados,
+                          'created_at': criado})
+        return self._version
+
+    def _anexar(self, evento):
+        """Chamado com a Condition adquirida"""
+        self._eventos.append(evento)
+        self._version = evento['version']
+        self.published += 1
+        self._cond.notify_all()
+        for loop, future in list(self._esperas):
+            loop.call_soon_threadsafe(_acordar, future)
+
+    # Leitura
+    def ler(self, desde, limit=None):
+        """
+        (eventos após `desde`, reset). Sem `desde` o cliente começa na
+        versão atual. reset=True quando a versão pedida não está mais no
+        buffer, é de outro processo/execução ou está atrasada demais; o
+        único evento é então o marcador `reset` com a versão atual.
+        """
+        with self._cond:
+            atual = self._version
+            if desde is None or desde == atual:
+                return [], False
+            primeira = self._eventos[0]['version'] if self._eventos else atual + 1
+            if desde > atual or desde < primeira - 1 or atual - desde > self.max_lag:
+                self.resets += 1
+                return [marcador('reset', atual)], True
+            inicio = desde - primeira + 1
+            fim = len(self._eventos) if limit is None else min(len(self._eventos), inicio + limit)
+            return list(itertools.islice(self._eventos, inicio, fim)), False
+
+    def esperar(self, desde, timeout):
+        """Como `ler`, bloqueando até haver eventos novos ou o prazo vencer"""
+        prazo = time.monotonic() + timeout
+        with self._cond:
+            while desde is not None and desde == self._version:
+                restante = prazo - time.monotonic()
+                if restante <= 0:
+                    break
+                self._cond.wait(restante)
+        return self.ler(desde)
+
+    async def esperar_async(self, desde, timeout):
+        """`esperar` para o laço asyncio: não ocupa uma thread enquanto espera"""
+        # Importado aqui: o app WSGI não paga a importação do asyncio
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        prazo = loop.time() + timeout
+        while True:
+            future = loop.create_future()
+            registro = (loop, future)
+            # Registrar antes de verificar: uma publicação entre os dois passos
+            # ainda acorda esta espera
+            with self._cond:
+                self._esperas.add(registro)
+            try:
+                eventos, reset = self.ler(desde)
+                restante = prazo - loop.time()
+                if eventos or desde is None or restante <= 0:
+                    return eventos, reset
+                try:
+                    await asyncio.wait_for(future, restante)
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                with self._cond:
+                    self._esperas.discard(registro)
+
+    # Clientes conectados (para as estatísticas)
+    def conectar(self):
+        with self._cond:
+            self.subscribers += 1
+
+    def desconectar(self):
+        with self._cond:
+            self.subscribers -= 1
+
+    # Banco SQLite (versão compartilhada entre workers)
+    def _carregar_recentes(self):
+        """Últimos eventos da tabela: clientes podem retomar em qualquer worker"""
+        with self.banco.conexao() as conn:
+            linhas = conn.execute('SELECT id, tipo, dados, created_at FROM eventos_cursos '
+                                  'ORDER BY id DESC LIMIT ?', (self.capacity,)).fetchall()
+        self._anexar_linhas(reversed(linhas))
+        self.published = 0
+
+    def _gravar_banco(self, tipo, dados, criado):
+        corpo = json.dumps(dados, default=_json_default, ensure_ascii=False)
+        with self.banco.transacao() as conn:
+            version = conn.execute('INSERT INTO eventos_cursos (tipo, dados, created_at) '
+                                   'VALUES (?, ?, ?)', (tipo, corpo, criado)).lastrowid
+            if version % 1000 == 0:
+                conn.execute('DELETE FROM eventos_cursos WHERE id <= ?', (version - self.capacity,))
+        return version
+
+    def start(self):
+        """Com banco: thread que acompanha eventos_cursos (um SELECT por intervalo)"""
+        if self.banco is None or (self._thread is not None and self._thread.is_alive()):
+            return self
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._acompanhar, name='change-feed', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._parar.set()
+
+    def _acompanhar(self):
+        while not self._parar.wait(self.poll_interval):
+            try:
+                with self.banco.conexao() as conn:
+                    linhas = conn.execute('SELECT id, tipo, dados, created_at FROM eventos_cursos '
+                                          'WHERE id > ? ORDER BY id LIMIT 1000',
+                                          (self._version,)).fetchall()
+            except Exception:
+                continue
+            if linhas:
+                self._anexar_linhas(linhas)
+
+    def _anexar_linhas(self, linhas):
+        with self._cond:
+            for version, tipo, dados, criado in linhas:
+                if self._eventos and version != self._version + 1:
+                    # Lacuna (eventos podados): o buffer recomeça e os
+                    # leitores atrasados recebem reset
+                    self._eventos.clear()
+                self._anexar({'version': version, 'tipo': tipo, 'dados': json.loads(dados),
+                              'created_at': criado})
+
+    def restart_after_fork(self):
+        """No processo filho: nova Condition, sem esperas herdadas e nova thread"""
+        self._cond = threading.Condition()
+        self._esperas = set()
+        self.subscribers = 0
+        self._thread = None
+        self._parar = threading.Event()
+        self.start()
+
+    def get_stats(self):
+        return {
+            'version': self._version,
+            'buffered': len(self._eventos),
+            'capacity': self.capacity,
+            'max_lag': self.max_lag,
+            'published': self.published,
+            'resets': self.resets,
+            'subscribers': self.subscribers,
+            'shared': self.banco is not None
+        }
+
+
+def _acordar(future):
+    if not future.done():
+        future.set_result(None)
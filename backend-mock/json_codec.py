@@ -0,0 +1,133 @@
+"""
+Codificação JSON das respostas do Backend Mock
+- `escolher_codec`: orjson quando instalado (pip install orjson), senão a
+  biblioteca padrão; ACERVO_JSON=stdlib força a biblioteca padrão. As duas
+  produzem JSON compacto com chaves ordenadas, como o jsonify do Flask.
+- Streaming: coleções grandes saem como array JSON (ou NDJSON) gerado
+  item a item e agrupado em blocos de ~64 KiB, opcionalmente comprimido em
+  gzip no caminho. O corpo inteiro nunca existe em memória.
+"""
+
+import json
+import zlib
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional
+    orjson = None
+
+# Tamanho dos blocos enviados ao servidor em uma resposta em streaming
+TAMANHO_BLOCO = 64 * 1024
+
+
+class StdlibCodec:
+    """json da biblioteca padrão (mesmas opções do provider padrão do Flask)"""
+    nome = 'json'
+
+    def __init__(self, default):
+        self._encoder = json.JSONEncoder(default=default, ensure_ascii=True, sort_keys=True,
+                                         separators=(',', ':'))
+
+    def dumps(self, obj):
+        return self._encoder.encode(obj).encode('utf-8')
+
+    @staticmethod
+    def loads(dados):
+        return json.loads(dados)
+
+
+class OrjsonCodec:
+    """
+    orjson: UTF-8 direto em bytes, sem escapes ASCII. datetime/dataclass
+    passam pelo `default` (mesmo formato do Flask); o que o orjson recusa
+    (ex.: inteiros acima de 64 bits) é codificado pela biblioteca padrão.
+    """
+    nome = 'orjson'
+
+    def __init__(self, default):
+        self._default = default
+        self._opcoes = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS |
+                        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+        self._reserva = StdlibCodec(default)
+
+    def dumps(self, obj):
+        try:
+            return orjson.dumps(obj, default=self._default, option=self._opcoes)
+        except TypeError:
+            # JSONEncodeError é um TypeError; objetos sem codificação
+            # falham também na biblioteca padrão, com a mensagem dela
+            return self._reserva.dumps(obj)
+
+    @staticmethod
+    def loads(dados):
+        return orjson.loads(dados)
+
+
+def escolher_codec(default, preferencia=None):
+    """Codec para `preferencia` ('orjson', 'stdlib' ou None/'auto': o mais rápido instalado)"""
+    preferencia = (preferencia or 'auto').lower()
+    if preferencia not in ('auto', 'orjson', 'stdlib', 'json'):
+        raise ValueError(f"Codec JSON desconhecido: {preferencia!r}")
+    if preferencia == 'orjson' and orjson is None:
+        raise RuntimeError('ACERVO_JSON=orjson requer o pacote orjson (pip install orjson)')
+    if orjson is not None and preferencia in ('auto', 'orjson'):
+        return OrjsonCodec(default)
+    return StdlibCodec(default)
+
+
+# Streaming
+def agrupar(pedacos, tamanho=TAMANHO_BLOCO):
+    """Junta pedaços pequenos em blocos de ~`tamanho` bytes"""
+    bloco = bytearray()
+    for pedaco in pedacos:
+        bloco += pedaco
+        if len(bloco) >= tamanho:
+            yield bytes(bloco)
+            bloco.clear()
+    if bloco:
+        yield bytes(bloco)
+
+
+def _pedacos_array(itens, dumps):
+    yield b'['
+    separador = b''
+    for item in itens:
+        yield separador
+        yield dumps(item)
+        separador = b','
+    yield b']'
+
+
+def array_json(itens, dumps):
+    """Array JSON de `itens` (iterável consumido sob demanda), em blocos"""
+    return agrupar(_pedacos_array(itens, dumps))
+
+
+def objeto_json(campos, dumps):
+    """Objeto JSON {chave: [itens]} a partir de pares (chave, iterável), em blocos"""
+    def pedacos():
+        yield b'{'
+        separador = b''
+        for chave, itens in campos:
+            yield separador
+            yield dumps(chave)
+            yield b':'
+            yield from _pedacos_array(itens, dumps)
+            separador = b','
+        yield b'}'
+    return agrupar(pedacos())
+
+
+def ndjson(itens, dumps):
+    """Um documento JSON por linha (application/x-ndjson), em blocos"""
+    return agrupar(dumps(item) + b'\n' for item in itens)
+
+
+def gzip_stream(blocos, nivel=6):
+    """Comprime os blocos em gzip conforme são gerados"""
+    compressor = zlib.compressobj(nivel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for bloco in blocos:
+        comprimido = compressor.compress(bloco)
+        if comprimido:
+            yield comprimido
+    yield compressor.flush()
@@ -0,0 +1,542 @@
+"""
+Carga em massa do Backend Mock
+Lê JSONL, CSV ou o formato de INSERTs de backend/database/04_initial_data.sql
+em streaming (sem manter o arquivo bruto em memória) e popula os
+repositórios em memória. Inclui um gerador sintético reprodutível com as
+colunas das tabelas cursos/arquivos/usuarios de 02_create_tables.sql.
+
+Uso:
+    python loader.py generate -o seed.jsonl --cursos 1000000 --arquivos-por-curso 3 --usuarios 1000
+    python loader.py load seed.jsonl
+    python loader.py load ../backend/database/04_initial_data.sql
+    python loader.py bench --cursos 1000000 --arquivos-por-curso 3
+
+No servidor: ACERVO_SEED_FILE=seed.jsonl (vários arquivos separados por
+vírgula) ou ACERVO_SEED_SYNTHETIC=cursos:arquivos_por_curso:usuarios[:seed].
+"""
+
+import argparse
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+import random
+import re
+import sys
+import time
+
+# Enum status_curso do banco -> status usado pelo mock/Kanban
+STATUS_DB_PARA_MOCK = {
+    'Backlog': 'Backlog',
+    'EmDesenvolvimento': 'Em Desenvolvimento',
+    'Veiculado': 'Veiculado'
+}
+STATUS_MOCK_PARA_DB = {v: k for k, v in STATUS_DB_PARA_MOCK.items()}
+
+CATEGORIAS_ARQUIVO = ('BriefingDesenvolvimento', 'BriefingExecucao', 'PPT', 'CadernoExercicio',
+                      'PlanoAula', 'Videos', 'Podcast', 'OutrosArquivos')
+
+TAMANHO_LOTE = 10000
+
+
+# Leitura em streaming
+def _abrir_texto(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def _tabela_do_nome(path):
+    nome = os.path.basename(path)
+    for sufixo in ('.gz', '.csv', '.jsonl', '.ndjson', '.sql'):
+        if nome.endswith(sufixo):
+            nome = nome[:-len(sufixo)]
+    return nome
+
+
+def iter_jsonl(path, tabela=None):
+    """Uma linha JSON por registro; a tabela vem do campo 'tabela'"""
+    with _abrir_texto(path) as f:
+        for linha in f:
+            linha = linha.strip()
+            if not linha:
+                continue
+            row = json.loads(linha)
+            yield row.pop('tabela', tabela), row
+
+
+def iter_csv(path, tabela=None):
+    """CSV com cabeçalho; a tabela vem do argumento ou do nome do arquivo"""
+    tabela = tabela or _tabela_do_nome(path)
+    with _abrir_texto(path) as f:
+        for row in csv.DictReader(f):
+            yield tabela, {k: (v if v != '' else None) for k, v in row.items()}
+
+
+_SQL_TOKEN = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>--[^\n]*)
+  | (?P<str>'(?:[^']|'')*')
+  | (?P<punct>[(),;])
+  | (?P<word>[^\s'(),;]+)
+""", re.VERBOSE)
+
+
+def _sql_tokens(f, chunk_size=1 << 16):
+    """Tokens (tipo, texto) lidos em blocos; nunca corta um token ao meio"""
+    buf = ''
+    pos = 0
+    eof = False
+    while True:
+        m = _SQL_TOKEN.match(buf, pos)
+        if m is None or (m.end() == len(buf) and not eof):
+            if eof:
+                if pos < len(buf):
+                    raise ValueError(f"SQL inválido perto de: {buf[pos:pos + 40]!r}")
+                return
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf = buf[pos:] + chunk
+            pos = 0
+            continue
+        pos = m.end()
+        tipo = m.lastgroup
+        if tipo not in ('ws', 'comment'):
+            yield tipo, m.group()
+
+
+def _sql_valor(tokens):
+    """Converte os tokens de um valor; expressões (funções, ||) viram None"""
+    if not tokens:
+        return None
+    tipo, texto = tokens[0]
+    resto = tokens[1:]
+    if tipo == 'str' and all(t == 'word' and x.startswith('::') for t, x in resto):
+        return texto[1:-1].replace("''", "'")
+    if resto or tipo != 'word':
+        return None
+    upper = texto.upper()
+    if upper == 'NULL' or upper == 'DEFAULT':
+        return None
+    if upper in ('TRUE', 'FALSE'):
+        return upper == 'TRUE'
+    try:
+        return int(texto)
+    except ValueError:
+        try:
+            return float(texto)
+        except ValueError:
+            return None
+
+
+def _sql_insert(tokens):
+    """Após INSERT: INTO tabela (colunas) VALUES (...), (...);"""
+    tabela, linha = '?', 0
+
+    def proximo():
+        token = next(tokens, None)
+        if token is None:
+            onde = f"tabela {tabela}, linha {linha}" if linha else f"tabela {tabela}"
+            raise ValueError(f"INSERT incompleto ({onde})")
+        return token
+
+    _, into = proximo()
+    if into.upper() != 'INTO':
+        return
+    _, tabela = proximo()
+    tabela = tabela.split('.')[-1].strip('"')
+    if proximo() != ('punct', '('):
+        return
+    colunas = []
+    for tipo, texto in tokens:
+        if texto == ')':
+            break
+        if tipo == 'word':
+            colunas.append(texto.strip('"'))
+    else:
+        raise ValueError(f"INSERT incompleto (tabela {tabela}, lista de colunas)")
+    _, values = proximo()
+    if values.upper() != 'VALUES':
+        return
+    while True:
+        linha += 1
+        if proximo() != ('punct', '('):
+            return
+        valores, atual, profundidade = [], [], 1
+        for tipo, texto in tokens:
+            if tipo == 'punct' and texto == '(':
+                profundidade += 1
+            elif tipo == 'punct' and texto == ')':
+                profundidade -= 1
+                if profundidade == 0:
+                    break
+            elif tipo == 'punct' and texto == ',' and profundidade == 1:
+                valores.append(_sql_valor(atual))
+                atual = []
+                continue
+            atual.append((tipo, texto))
+        else:
+            raise ValueError(f"INSERT incompleto (tabela {tabela}, linha {linha})")
+        valores.append(_sql_valor(atual))
+        yield tabela, dict(zip(colunas, valores))
+        tipo, texto = next(tokens, ('punct', ';'))
+        if texto != ',':
+            # ';' ou cláusulas extras (ON CONFLICT ...) até o fim do comando
+            while texto != ';':
+                tipo, texto = next(tokens, ('punct', ';'))
+            return
+
+
+def iter_sql(path, tabela=None):
+    """INSERT INTO ... VALUES do dump SQL; demais comandos são ignorados"""
+    with _abrir_texto(path) as f:
+        tokens = _sql_tokens(f)
+        for tipo, texto in tokens:
+            if tipo == 'word' and texto.upper() == 'INSERT':
+                yield from _sql_insert(tokens)
+            elif texto != ';':
+                for tipo, texto in tokens:
+                    if texto == ';':
+                        break
+
+
+def iter_records(path, tabela=None):
+    """Escolhe o leitor pela extensão do arquivo"""
+    nome = path[:-3] if path.endswith('.gz') else path
+    if nome.endswith('.csv'):
+        return iter_csv(path, tabela)
+    if nome.endswith('.sql'):
+        return iter_sql(path, tabela)
+    return iter_jsonl(path, tabela)
+
+
+# Mapeamento linha do banco -> registro do mock
+class RowMapper:
+    """
+    Converte linhas com as colunas do banco para o formato dos repositórios.
+    Ids UUID recebem inteiros sequenciais (mantendo o vínculo curso_id dos
+    arquivos) acima do maior id numérico já visto na tabela; ids numéricos
+    são preservados. Um id numérico que chega depois e coincide com um já
+    atribuído a um UUID é um erro (as fontes numéricas devem vir antes).
+    """
+
+    def __init__(self):
+        self._uuids = {}
+        self._atribuidos = {}
+        self._maiores = {}
+
+    def _id(self, tabela, valor):
+        if valor is None:
+            return None
+        if isinstance(valor, int) or str(valor).isdigit():
+            numero = int(valor)
+            if numero in self._atribuidos.get(tabela, ()):
+                raise ValueError(f"Id {numero} de {tabela} já foi atribuído a um UUID nesta carga")
+            if numero > self._maiores.get(tabela, 0):
+                self._maiores[tabela] = numero
+            return numero
+        texto = str(valor)
+        mapa = self._uuids.setdefault(tabela, {})
+        if texto not in mapa:
+            numero = self._maiores.get(tabela, 0) + 1
+            mapa[texto] = self._maiores[tabela] = numero
+            self._atribuidos.setdefault(tabela, set()).add(numero)
+        return mapa[texto]
+
+    def curso(self, row):
+        status = row.get('status') or 'Backlog'
+        categoria = row.get('categoria') or row.get('descricao_academia') or 'Geral'
+        if categoria.startswith('Academia de '):
+            categoria = categoria[len('Academia de '):]
+        return {
+            'id': self._id('cursos', row.get('id')),
+            'titulo': row.get('titulo') or row.get('nome_curso'),
+            'categoria': categoria,
+            'status': STATUS_DB_PARA_MOCK.get(status, status)
+        }
+
+    def arquivo(self, row):
+        return {
+            'id': self._id('arquivos', row.get('id')),
+            'curso_id': self._id('cursos', row.get('curso_id')),
+            'nome': row.get('nome'),
+            'nome_armazenamento': row.get('nome_armazenamento'),
+            'categoria': row.get('categoria') or 'OutrosArquivos',
+            'tipo_mime': row.get('tipo_mime'),
+            'tamanho': int(row.get('tamanho') or 0),
+            'url_s3': row.get('url_s3'),
+            'is_publico': _bool(row.get('is_publico'))
+        }
+
+    def usuario(self, row):
+        usuario = {
+            'id': self._id('usuarios', row.get('id')),
+            'email': row['email'],
+            'nome': row.get('nome'),
+            'is_admin': _bool(row.get('is_admin')),
+            'is_active': _bool(row.get('is_active'), padrao=True)
+        }
+        if row.get('password_hash'):
+            usuario['password_hash'] = row['password_hash']
+        elif row.get('senha'):
+            usuario['senha'] = row['senha']
+        return usuario
+
+
+def _bool(valor, padrao=False):
+    if valor is None:
+        return padrao
+    if isinstance(valor, bool):
+        return valor
+    return str(valor).strip().lower() in ('1', 't', 'true', 'sim', 'yes')
+
+
+def rss_bytes():
+    """Memória residente atual do processo (ou o pico, se indisponível)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+class Loader:
+    """Aplica um fluxo de (tabela, linha) aos repositórios, em lotes"""
+
+    def __init__(self, curso_store, arquivo_store=None, user_store=None, batch_size=TAMANHO_LOTE):
+        self.stores = {'cursos': curso_store, 'arquivos': arquivo_store, 'usuarios': user_store}
+        self.mapper = RowMapper()
+        self.batch_size = batch_size
+        self.counts = {}
+        self.skipped = {}
+
+    def load(self, records):
+        rss_antes = rss_bytes()
+        inicio = time.perf_counter()
+        lotes = {}
+        for tabela, row in records:
+            converter = {'cursos': self.mapper.curso, 'arquivos': self.mapper.arquivo,
+                         'usuarios': self.mapper.usuario}.get(tabela)
+            if converter is None or self.stores.get(tabela) is None:
+                self.skipped[tabela] = self.skipped.get(tabela, 0) + 1
+                continue
+            lote = lotes.setdefault(tabela, [])
+            lote.append(converter(row))
+            if len(lote) >= self.batch_size:
+                self._flush(tabela, lote)
+                lotes[tabela] = []
+        for tabela, lote in lotes.items():
+            self._flush(tabela, lote)
+        duracao = time.perf_counter() - inicio
+        rss_depois = rss_bytes()
+        total = sum(self.counts.values())
+        return {
+            'counts': dict(self.counts),
+            'skipped': dict(self.skipped),
+            'seconds': round(duracao, 3),
+            'records_per_second': round(total / duracao) if duracao else None,
+            'rss_before_mb': _mb(rss_antes),
+            'rss_after_mb': _mb(rss_depois),
+            'rss_delta_mb': _mb(rss_depois - rss_antes) if rss_antes and rss_depois else None
+        }
+
+    def _flush(self, tabela, lote):
+        store = self.stores[tabela]
+        if tabela == 'usuarios':
+            # Emails já cadastrados (ex.: admin do seed) são ignorados
+            for usuario in lote:
+                if store.get_by_email(usuario['email']) is None:
+                    store.add(usuario)
+                    self.counts[tabela] = self.counts.get(tabela, 0) + 1
+                else:
+                    self.skipped[tabela] = self.skipped.get(tabela, 0) + 1
+            return
+        self.counts[tabela] = self.counts.get(tabela, 0) + store.add_many(lote)
+
+
+def _mb(valor):
+    return round(valor / (1024 * 1024), 1) if valor is not None else None
+
+
+# Gerador sintético
+_PREFIXOS = ('Introdução a', 'Fundamentos de', 'Gestão de', 'Práticas de', 'Workshop de',
+             'Formação em', 'Trilha de', 'Oficina de')
+_TEMAS = ('Python', 'React', 'Docker', 'Vendas', 'Atendimento ao Cliente', 'Segurança do Trabalho',
+          'Liderança', 'Logística', 'Excel', 'Comunicação', 'Finanças', 'Marketing Digital',
+          'Kubernetes', 'Banco de Dados', 'Estoque', 'Negociação', 'Compliance', 'Qualidade')
+_NIVEIS = ('Básico', 'Intermediário', 'Avançado', 'para Lojas', 'para Gestores', 'na Prática')
+_ACADEMIAS = ('Programação', 'Frontend', 'DevOps', 'Varejo', 'Gestão', 'Operações',
+              'Finanças', 'Pessoas')
+_AMBIENTES = ('Online', 'Presencial', 'Híbrido')
+_ACESSOS = ('Público', 'Restrito', 'Premium')
+_STATUS_PESOS = (('Backlog', 3), ('EmDesenvolvimento', 2), ('Veiculado', 5))
+_MIMES = {
+    'BriefingDesenvolvimento': ('application/pdf', 'pdf'),
+    'BriefingExecucao': ('application/pdf', 'pdf'),
+    'PPT': ('application/vnd.openxmlformats-officedocument.presentationml.presentation', 'pptx'),
+    'CadernoExercicio': ('application/pdf', 'pdf'),
+    'PlanoAula': ('application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'docx'),
+    'Videos': ('video/mp4', 'mp4'),
+    'Podcast': ('audio/mpeg', 'mp3'),
+    'OutrosArquivos': ('application/zip', 'zip'),
+}
+_SENHA_SINTETICA = 'Senha@123'
+
+
+def generate(cursos=1000, arquivos_por_curso=3, usuarios=10, seed=42):
+    """
+    Fluxo reprodutível de (tabela, linha) com as colunas do banco.
+    Usuários sintéticos usam a senha 'Senha@123' (um único hash, calculado
+    uma vez, para não pagar o KDF por usuário).
+    """
+    from user_store import hash_password
+
+    rng = random.Random(seed)
+    base = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    status_valores = [s for s, _ in _STATUS_PESOS]
+    status_pesos = [p for _, p in _STATUS_PESOS]
+
+    password_hash = hash_password(_SENHA_SINTETICA, salt=seed.to_bytes(16, 'big'))
+    for i in range(usuarios):
+        criado = (base + datetime.timedelta(minutes=i)).isoformat()
+        yield 'usuarios', {
+            'id': i + 2,  # id 1 é o administrador do seed
+            'email': f'usuario{i + 1}@acervoeducacional.com',
+            'password_hash': password_hash,
+            'nome': f'Usuário {i + 1}',
+            'is_active': True,
+            'created_at': criado,
+            'updated_at': criado
+        }
+
+    arquivo_id = 1
+    for curso_id in range(1, cursos + 1):
+        criado = base + datetime.timedelta(seconds=curso_id * 30)
+        academia = rng.choice(_ACADEMIAS)
+        yield 'cursos', {
+            'id': curso_id,
+            'codigo_curso': f'CUR{curso_id:07d}',
+            'nome_curso': f'{rng.choice(_PREFIXOS)} {rng.choice(_TEMAS)} {rng.choice(_NIVEIS)}',
+            'descricao_academia': f'Academia de {academia}',
+            'status': rng.choices(status_valores, status_pesos)[0],
+            'tipo_ambiente': rng.choice(_AMBIENTES),
+            'tipo_acesso': rng.choice(_ACESSOS),
+            'data_inicio_operacao': None,
+            'origem': 'Senior' if rng.random() < 0.3 else 'Manual',
+            'criado_por': rng.randint(1, usuarios + 1),
+            'comentarios_internos': None,
+            'created_at': criado.isoformat(),
+            'updated_at': criado.isoformat()
+        }
+        for _ in range(arquivos_por_curso):
+            categoria = rng.choice(CATEGORIAS_ARQUIVO)
+            tipo_mime, extensao = _MIMES[categoria]
+            nome_armazenamento = f'cursos/{curso_id}/{arquivo_id:09d}.{extensao}'
+            yield 'arquivos', {
+                'id': arquivo_id,
+                'curso_id': curso_id,
+                'nome': f'{categoria}_{arquivo_id}.{extensao}',
+                'nome_armazenamento': nome_armazenamento,
+                'categoria': categoria,
+                'tipo_mime': tipo_mime,
+                'tamanho': rng.randint(10_000, 2_000_000_000 if categoria == 'Videos' else 50_000_000),
+                'url_s3': f's3://acervo-educacional-files/{nome_armazenamento}',
+                'is_publico': rng.random() < 0.2,
+                'created_at': criado.isoformat(),
+                'updated_at': criado.isoformat()
+            }
+            arquivo_id += 1
+
+
+def write_jsonl(records, path):
+    abrir = gzip.open if path.endswith('.gz') else open
+    total = 0
+    with abrir(path, 'wt', encoding='utf-8') as f:
+        escrever = f.write
+        for tabela, row in records:
+            row = dict(row, tabela=tabela)
+            escrever(json.dumps(row, ensure_ascii=False, separators=(',', ':')))
+            escrever('\n')
+            total += 1
+    return total
+
+
+def parse_synthetic_spec(spec):
+    """'cursos:arquivos_por_curso:usuarios[:seed]' -> kwargs de generate()"""
+    partes = [int(p) for p in spec.split(':')]
+    nomes = ('cursos', 'arquivos_por_curso', 'usuarios', 'seed')
+    return dict(zip(nomes, partes))
+
+
+def seed_configured(environ=os.environ):
+    return bool(environ.get('ACERVO_SEED_FILE') or environ.get('ACERVO_SEED_SYNTHETIC'))
+
+
+def load_from_env(curso_store, arquivo_store, user_store, environ=os.environ):
+    """Carga inicial do servidor a partir de ACERVO_SEED_FILE/SYNTHETIC"""
+    loader = Loader(curso_store, arquivo_store, user_store)
+    relatorios = []
+    for path in filter(None, (environ.get('ACERVO_SEED_FILE') or '').split(',')):
+        relatorios.append(dict(loader.load(iter_records(path.strip())), source=path.strip()))
+    spec = environ.get('ACERVO_SEED_SYNTHETIC')
+    if spec:
+        relatorios.append(dict(loader.load(generate(**parse_synthetic_spec(spec))), source=spec))
+    return relatorios
+
+
+def _novos_stores():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from store import ArquivoStore, CourseStore
+    from user_store import UserStore
+    return CourseStore(), ArquivoStore(), UserStore()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Carga em massa do Backend Mock')
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    gerar = sub.add_parser('generate', help='gerar JSONL sintético')
+    gerar.add_argument('-o', '--output', required=True)
+    for p in (gerar, sub.add_parser('bench', help='gerar e carregar em memória, com relatório')):
+        p.add_argument('--cursos', type=int, default=1000)
+        p.add_argument('--arquivos-por-curso', type=int, default=3)
+        p.add_argument('--usuarios', type=int, default=10)
+        p.add_argument('--seed', type=int, default=42)
+
+    carregar = sub.add_parser('load', help='carregar arquivos (JSONL/CSV/SQL) e relatar')
+    carregar.add_argument('paths', nargs='+')
+    carregar.add_argument('--tabela', help='tabela dos CSVs (padrão: nome do arquivo)')
+
+    args = parser.parse_args(argv)
+
+    if args.comando == 'generate':
+        inicio = time.perf_counter()
+        total = write_jsonl(generate(args.cursos, args.arquivos_por_curso, args.usuarios, args.seed),
+                            args.output)
+        print(f"{total} registros gravados em {args.output} ({time.perf_counter() - inicio:.1f}s)")
+        return
+
+    cursos, arquivos, usuarios = _novos_stores()
+    loader = Loader(cursos, arquivos, usuarios)
+    if args.comando == 'bench':
+        registros = generate(args.cursos, args.arquivos_por_curso, args.usuarios, args.seed)
+        relatorio = loader.load(registros)
+    else:
+        def todos():
+            for path in args.paths:
+                yield from iter_records(path, args.tabela)
+        relatorio = loader.load(todos())
+    json.dump(relatorio, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+"""
+Pipeline de logs estruturados assíncrono
+Os handlers das requisições apenas enfileiram o registro; uma thread de
+escrita serializa em JSON (uma linha por evento) e grava em lotes.
+"""
+
+import atexit
+import copy
+import datetime
+import itertools
+import json
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler
+
+# Atributos padrão de LogRecord; o restante veio de extra= e vai para o JSON
+_ATRIBUTOS_PADRAO = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {
+    'message', 'asctime', 'taskName'
+}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formata o registro como uma linha JSON, incluindo os campos de extra="""
+
+    def format(self, record):
+        data = {
+            'timestamp': datetime.datetime.fromtimestamp(record.created).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for chave, valor in record.__dict__.items():
+            if chave not in _ATRIBUTOS_PADRAO and not chave.startswith('_'):
+                data[chave] = valor
+        if record.exc_text:
+            data['exception'] = record.exc_text
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Amostragem determinística de eventos de alto volume.
+
+    `rates` mapeia 'evento' ou 'evento:rota' para N (mantém 1 a cada N).
+    A regra por rota tem precedência sobre a do evento.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self._contadores = {}
+        self.sampled_out = 0
+
+    def filter(self, record):
+        event = getattr(record, 'event', None)
+        if event is None:
+            return True
+        chave = f"{event}:{getattr(record, 'route', '')}"
+        rate = self.rates.get(chave)
+        if rate is None:
+            chave = event
+            rate = self.rates.get(event)
+        if not rate or rate <= 1:
+            return True
+        contador = self._contadores.get(chave)
+        if contador is None:
+            contador = self._contadores.setdefault(chave, itertools.count())
+        if next(contador) % rate:
+            self.sampled_out += 1
+            return False
+        record.sample_rate = rate
+        return True
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler que nunca bloqueia: fila cheia descarta e conta"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Resolve mensagem e traceback na thread de origem; extras são mantidos
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingLogWriter:
+    """
+    Thread de escrita: consome a fila e grava os registros em lotes
+    (uma única chamada de write/flush por lote).
+    """
+
+    _SENTINELA = None
+
+    def __init__(self, log_queue, stream=None, formatter=None, batch_size=256, flush_interval=0.2):
+        self.queue = log_queue
+        self.stream = stream or sys.stdout
+        self.formatter = formatter or JsonFormatter()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.batches = 0
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None and self._thread.is_alive():
+            self.queue.put(self._SENTINELA)
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                record = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            lote = []
+            parar = record is self._SENTINELA
+            if not parar:
+                lote.append(record)
+            while not parar and len(lote) < self.batch_size:
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is self._SENTINELA:
+                    parar = True
+                else:
+                    lote.append(record)
+            if lote:
+                self._write(lote)
+            if parar:
+                return
+
+    def _write(self, lote):
+        linhas = []
+        for record in lote:
+            try:
+                linhas.append(self.formatter.format(record))
+            except Exception:
+                linhas.append(json.dumps({'level': 'ERROR', 'message': 'Falha ao formatar log'}))
+        try:
+            self.stream.write('\n'.join(linhas) + '\n')
+            self.stream.flush()
+        except (OSError, ValueError):
+            return
+        self.written += len(linhas)
+        self.batches += 1
+
+
+class LogPipeline:
+    """Agrupa fila, handler, filtro de amostragem e thread de escrita"""
+
+    def __init__(self, level=logging.INFO, stream=None, queue_size=10000,
+                 batch_size=256, flush_interval=0.2, sampling=None):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.handler = BoundedQueueHandler(self.queue)
+        self.sampler = SamplingFilter(sampling)
+        self.handler.addFilter(self.sampler)
+        self.writer = BatchingLogWriter(self.queue, stream=stream, batch_size=batch_size,
+                                        flush_interval=flush_interval)
+        self.level = level
+
+    def install(self, root=None):
+        root = root or logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        root.setLevel(self.level)
+        self.writer.start()
+        atexit.register(self.writer.stop)
+        return self
+
+    def restart_after_fork(self):
+        """
+        No processo filho a thread de escrita não existe e a fila pode ter
+        sido copiada com locks adquiridos: recria fila e thread.
+        """
+        self.queue = queue.Queue(maxsize=self.queue.maxsize)
+        self.handler.queue = self.queue
+        self.writer.queue = self.queue
+        self.writer._thread = None
+        self.writer.start()
+
+    def get_stats(self):
+        return {
+            'enqueued': self.handler.enqueued,
+            'dropped': self.handler.dropped,
+            'sampled_out': self.sampler.sampled_out,
+            'written': self.writer.written,
+            'batches': self.writer.batches,
+            'queue_depth': self.queue.qsize(),
+            'queue_size': self.queue.maxsize
+        }
+
+
+def configure_logging(level=logging.INFO, **kwargs):
+    """Instalar o pipeline assíncrono no logger raiz"""
+    return LogPipeline(level=level, **kwargs).install()
@@ -0,0 +1,223 @@
+"""
+Métricas em processo no formato de exposição do Prometheus
+Contadores e histogramas são fragmentados por thread: o caminho quente
+não adquire lock, e a agregação acontece apenas na coleta (/api/metrics).
+"""
+
+import bisect
+import threading
+import time
+
+# Limites (em segundos) dos buckets fixos de latência
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+QUANTIS = (0.5, 0.95, 0.99)
+
+PROCESS_START = time.time()
+_PROCESS_START_MONOTONIC = time.monotonic()
+
+
+def uptime_seconds():
+    return time.monotonic() - _PROCESS_START_MONOTONIC
+
+
+class _Shard:
+    """Valores de uma única thread; só essa thread escreve neles"""
+    __slots__ = ('counters', 'histograms', 'gauges', 'thread')
+
+    def __init__(self, thread=None):
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self.thread = thread
+
+    def merge(self, outro):
+        for chave, valor in list(outro.counters.items()):
+            self.counters[chave] = self.counters.get(chave, 0) + valor
+        for chave, valor in list(outro.gauges.items()):
+            self.gauges[chave] = self.gauges.get(chave, 0) + valor
+        for chave, hist in list(outro.histograms.items()):
+            total = self.histograms.get(chave)
+            if total is None:
+                self.histograms[chave] = list(hist)
+            else:
+                for i, valor in enumerate(hist):
+                    total[i] += valor
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas com um shard por thread.
+
+    - `inc(nome, labels)`: contador
+    - `observe(nome, labels, valor)`: histograma de buckets fixos
+    - `gauge_add(nome, labels, delta)`: gauge somado entre os shards
+      (ex.: requisições em andamento: +1 na entrada, -1 na saída)
+    - `register_collector(fn)`: métricas calculadas no momento da coleta
+
+    `labels` é uma tupla de pares (chave, valor) para servir de chave de dict.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+        self._retired = _Shard()
+        self._help = {}
+        self._collectors = []
+
+    def describe(self, nome, tipo, texto):
+        self._help[nome] = (tipo, texto)
+
+    def register_collector(self, fn):
+        """fn() -> iterável de (nome, labels, valor) coletados sob demanda"""
+        self._collectors.append(fn)
+
+    def reset(self):
+        """Zerar os valores (usado no processo filho após fork)"""
+        with self._shards_lock:
+            self._shards = []
+            self._retired = _Shard()
+            self._local = threading.local()
+
+    # Caminho quente
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _Shard(threading.current_thread())
+            with self._shards_lock:
+                self._shards.append(shard)
+                if len(self._shards) % 64 == 0:
+                    self._retire_dead_shards()
+        return shard
+
+    def _retire_dead_shards(self):
+        """
+        Servidores que criam uma thread por requisição deixariam um shard por
+        requisição: shards de threads encerradas (que ninguém mais escreve)
+        são consolidados em `_retired`. Chamado com `_shards_lock`.
+        """
+        vivos = []
+        for shard in self._shards:
+            if shard.thread.is_alive():
+                vivos.append(shard)
+            else:
+                self._retired.merge(shard)
+        self._shards = vivos
+
+    def inc(self, nome, labels=(), valor=1):
+        counters = self._shard().counters
+        chave = (nome, labels)
+        counters[chave] = counters.get(chave, 0) + valor
+
+    def observe(self, nome, labels, valor):
+        histograms = self._shard().histograms
+        chave = (nome, labels)
+        hist = histograms.get(chave)
+        if hist is None:
+            # [contagem por bucket..., +Inf, soma]
+            hist = histograms[chave] = [0] * (len(self.buckets) + 1) + [0.0]
+        hist[bisect.bisect_left(self.buckets, valor)] += 1
+        hist[-1] += valor
+
+    def gauge_add(self, nome, labels=(), delta=1):
+        gauges = self._shard().gauges
+        chave = (nome, labels)
+        gauges[chave] = gauges.get(chave, 0) + delta
+
+    # Coleta
+    def snapshot(self):
+        """Agregar todos os shards: (counters, histograms, gauges)"""
+        total = _Shard()
+        with self._shards_lock:
+            self._retire_dead_shards()
+            total.merge(self._retired)
+            shards = list(self._shards)
+        # list(d.items()) copia o dict de uma vez sob o GIL, sem lock do shard
+        for shard in shards:
+            total.merge(shard)
+        return total.counters, total.histograms, total.gauges
+
+    def quantile(self, hist, q):
+        """Estimativa de quantil por interpolação linear dentro do bucket"""
+        contagens = hist[:-1]
+        total = sum(contagens)
+        if not total:
+            return 0.0
+        alvo = q * total
+        acumulado = 0
+        for i, contagem in enumerate(contagens):
+            if acumulado + contagem >= alvo and contagem:
+                inicio = self.buckets[i - 1] if i > 0 else 0.0
+                if i >= len(self.buckets):
+                    return self.buckets[-1]
+                fim = self.buckets[i]
+                return inicio + (fim - inicio) * (alvo - acumulado) / contagem
+            acumulado += contagem
+        return self.buckets[-1]
+
+    def render(self):
+        """Texto no formato de exposição do Prometheus (versão 0.0.4)"""
+        counters, histograms, gauges = self.snapshot()
+        linhas = []
+        vistos = set()
+
+        def cabecalho(nome, tipo_padrao):
+            if nome in vistos:
+                return
+            vistos.add(nome)
+            tipo, texto = self._help.get(nome, (tipo_padrao, ''))
+            if texto:
+                linhas.append(f'# HELP {nome} {texto}')
+            linhas.append(f'# TYPE {nome} {tipo}')
+
+        for (nome, labels), valor in sorted(counters.items()):
+            cabecalho(nome, 'counter')
+            linhas.append(f'{nome}{_labels(labels)} {valor}')
+
+        for (nome, labels), valor in sorted(gauges.items()):
+            cabecalho(nome, 'gauge')
+            linhas.append(f'{nome}{_labels(labels)} {valor}')
+
+        for (nome, labels), hist in sorted(histograms.items()):
+            cabecalho(nome, 'histogram')
+            acumulado = 0
+            for limite, contagem in zip(self.buckets + (float('inf'),), hist[:-1]):
+                acumulado += contagem
+                le = '+Inf' if limite == float('inf') else repr(limite)
+                linhas.append(f'{nome}_bucket{_labels(labels + (("le", le),))} {acumulado}')
+            linhas.append(f'{nome}_sum{_labels(labels)} {hist[-1]}')
+            linhas.append(f'{nome}_count{_labels(labels)} {acumulado}')
+
+        # Quantis estimados a partir dos buckets (p50/p95/p99)
+        for (nome, labels), hist in sorted(histograms.items()):
+            nome_q = f'{nome}_quantile'
+            cabecalho(nome_q, 'gauge')
+            for q in QUANTIS:
+                valor = self.quantile(hist, q)
+                linhas.append(f'{nome_q}{_labels(labels + (("quantile", str(q)),))} {valor:.6f}')
+
+        # Amostras dos coletores agrupadas por nome (exigência do formato)
+        coletadas = {}
+        for collector in self._collectors:
+            for nome, labels, valor in collector():
+                coletadas.setdefault(nome, []).append((labels, valor))
+        for nome, amostras in coletadas.items():
+            cabecalho(nome, 'gauge')
+            for labels, valor in amostras:
+                linhas.append(f'{nome}{_labels(labels)} {valor}')
+
+        return '\n'.join(linhas) + '\n'
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    partes = ','.join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return '{' + partes + '}'
+
+
+def _escape(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,186 @@
+"""
+Armazenamento de objetos local (substituto do S3 no mock)
+Objetos são arquivos em disco sob uma raiz, endereçados por chave
+(ex.: 'cursos/12/34-video.mp4'), como o bucket do AwsS3Service. Uploads
+são gravados em streaming, em blocos, e podem ser retomados: o estado de
+cada upload fica em disco (funciona com vários workers e após reinício).
+Os metadados dos arquivos enviados ficam no ArquivoStore (em memória ou no
+SQLite), não aqui.
+"""
+
+import json
+import os
+import re
+import secrets
+import threading
+
+TAMANHO_BLOCO = 1024 * 1024
+BUCKET_PADRAO = 'acervo-educacional-files'
+
+_NOME_INSEGURO = re.compile(r'[^\w.\-]+')
+_UPLOAD_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+def nome_seguro(nome):
+    """Nome de arquivo utilizável em uma chave (sem barras nem '..')"""
+    nome = _NOME_INSEGURO.sub('_', os.path.basename(nome or '')).strip('._')
+    return nome[:120] or 'arquivo'
+
+
+class UploadNotFound(Exception):
+    """Upload inexistente, já concluído ou com id inválido"""
+
+
+class UploadOffsetMismatch(Exception):
+    """O bloco enviado não começa onde o upload parou"""
+
+    def __init__(self, offset):
+        super().__init__(f"Offset esperado: {offset}")
+        self.offset = offset
+
+
+class LocalObjectStore:
+    """
+    Objetos em `root/objects/<chave>`; uploads em andamento em
+    `root/uploads/<id>.part` com metadados em `<id>.json`.
+    """
+
+    def __init__(self, root, bucket=BUCKET_PADRAO, chunk_size=TAMANHO_BLOCO):
+        self.root = os.path.abspath(root)
+        self.bucket = bucket
+        self.chunk_size = chunk_size
+        self._objects = os.path.join(self.root, 'objects')
+        self._uploads = os.path.join(self.root, 'uploads')
+        for diretorio in (self._objects, self._uploads):
+            os.makedirs(diretorio, exist_ok=True)
+        self._lock = threading.Lock()
+        # Separado de _lock: append_upload chama _copy com _lock adquirido
+        self._contadores_lock = threading.Lock()
+        self.bytes_written = 0
+        self.uploads_completed = 0
+
+    # Objetos
+    def path(self, key):
+        """Caminho em disco da chave; recusa chaves que escapam da raiz"""
+        path = os.path.abspath(os.path.join(self._objects, key))
+        if not path.startswith(self._objects + os.sep):
+            raise ValueError(f"Chave inválida: {key}")
+        return path
+
+    def url(self, key):
+        return f's3://{self.bucket}/{key}'
+
+    def exists(self, key):
+        return os.path.isfile(self.path(key))
+
+    def size(self, key):
+        return os.path.getsize(self.path(key))
+
+    def put_stream(self, key, stream):
+        """Gravar um objeto lendo o stream em blocos; retorna o tamanho"""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporario = f'{path}.{secrets.token_hex(4)}.tmp'
+        try:
+            with open(temporario, 'wb') as f:
+                total = self._copy(stream, f)
+            os.replace(temporario, path)
+        except BaseException:
+            _remover(temporario)
+            raise
+        return total
+
+    def delete(self, key):
+        return _remover(self.path(key))
+
+    # Uploads retomáveis
+    def create_upload(self, key, length, metadata=None):
+        """Iniciar um upload de `length` bytes destinado à chave `key`"""
+        self.path(key)
+        upload_id = secrets.token_hex(16)
+        estado = {'key': key, 'length': int(length), 'metadata': metadata or {}}
+        with open(self._upload_path(upload_id, '.json'), 'w', encoding='utf-8') as f:
+            json.dump(estado, f)
+        open(self._upload_path(upload_id, '.part'), 'wb').close()
+        return upload_id
+
+    def upload_status(self, upload_id):
+        """Estado do upload: chave, tamanho total, metadados e offset atual"""
+        try:
+            with open(self._upload_path(upload_id, '.json'), encoding='utf-8') as f:
+                estado = json.load(f)
+            estado['offset'] = os.path.getsize(self._upload_path(upload_id, '.part'))
+        except (OSError, ValueError):
+            raise UploadNotFound(upload_id)
+        return estado
+
+    def append_upload(self, upload_id, offset, stream):
+        """
+        Acrescentar um bloco a partir de `offset` (deve ser o offset atual).
+        Retorna o estado atualizado; bytes além do tamanho declarado são
+        descartados.
+        """
+        with self._lock:
+            estado = self.upload_status(upload_id)
+            if offset != estado['offset']:
+                raise UploadOffsetMismatch(estado['offset'])
+            with open(self._upload_path(upload_id, '.part'), 'ab') as f:
+                gravados = self._copy(stream, f, limite=estado['length'] - offset)
+            estado['offset'] = offset + gravados
+        return estado
+
+    def complete_upload(self, upload_id):
+        """Mover o upload concluído para a chave de destino"""
+        with self._lock:
+            estado = self.upload_status(upload_id)
+            if estado['offset'] != estado['length']:
+                raise UploadOffsetMismatch(estado['offset'])
+            path = self.path(estado['key'])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(self._upload_path(upload_id, '.part'), path)
+            _remover(self._upload_path(upload_id, '.json'))
+            self.uploads_completed += 1
+        return estado
+
+    def abort_upload(self, upload_id):
+        self.upload_status(upload_id)
+        _remover(self._upload_path(upload_id, '.part'))
+        _remover(self._upload_path(upload_id, '.json'))
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+        self._contadores_lock = threading.Lock()
+
+    def get_stats(self):
+        return {
+            'root': self.root,
+            'bytes_written': self.bytes_written,
+            'uploads_completed': self.uploads_completed
+        }
+
+    def _upload_path(self, upload_id, sufixo):
+        if not _UPLOAD_ID.match(upload_id or ''):
+            raise UploadNotFound(upload_id)
+        return os.path.join(self._uploads, upload_id + sufixo)
+
+    def _copy(self, stream, f, limite=None):
+        """Copiar em blocos de `chunk_size` (nunca o corpo inteiro em memória)"""
+        total = 0
+        while limite is None or total < limite:
+            tamanho = self.chunk_size if limite is None else min(self.chunk_size, limite - total)
+            bloco = stream.read(tamanho)
+            if not bloco:
+                break
+            f.write(bloco)
+            total += len(bloco)
+        with self._contadores_lock:
+            self.bytes_written += total
+        return total
+
+
+def _remover(path):
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
@@ -0,0 +1,160 @@
+"""
+Controle de admissão do Backend Mock
+- `RateLimiter`: token buckets por (regra, cliente), com orçamentos por rota
+  (taxa em fichas/segundo e rajada). Verificação O(1); os buckets ficam em
+  um OrderedDict na ordem do último acesso, então os ociosos saem pela
+  frente (custo amortizado O(1)) e o total é limitado por `max_buckets`.
+- `ConcurrencyLimiter`: teto global de requisições em andamento; acima dele
+  a requisição é recusada na hora (503) em vez de esperar em uma fila sem
+  limite.
+"""
+
+import collections
+import threading
+import time
+
+# Orçamento de uma regra: `rate` fichas por segundo, até `burst` acumuladas
+Orcamento = collections.namedtuple('Orcamento', 'rate burst')
+
+
+def parse_orcamentos(spec, padrao):
+    """
+    'login=2:10,busca=20:40' -> orçamentos (sobrepõe `padrao`). '0' ou 'off'
+    desativa o limitador (retorna None).
+    """
+    if spec is None or spec.strip() == '':
+        return dict(padrao)
+    if spec.strip().lower() in ('0', 'off', 'false'):
+        return None
+    orcamentos = dict(padrao)
+    for item in filter(None, (parte.strip() for parte in spec.split(','))):
+        nome, _, valores = item.partition('=')
+        rate, _, burst = valores.partition(':')
+        rate = float(rate)
+        burst = float(burst) if burst else max(1.0, rate)
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Orçamento inválido: {item!r}")
+        orcamentos[nome.strip()] = Orcamento(rate, burst)
+    return orcamentos
+
+
+def dividir_orcamentos(orcamentos, partes):
+    """Parte de cada orçamento para um de `partes` processos (rajada mínima 1)"""
+    return {nome: Orcamento(o.rate / partes, max(1.0, o.burst / partes))
+            for nome, o in orcamentos.items()}
+
+
+class RateLimiter:
+    """
+    Token bucket por cliente e regra. Um bucket ocioso por mais tempo que
+    o necessário para encher (burst / rate) está cheio: descartá-lo não muda
+    nenhuma decisão, por isso `idle_ttl` padrão é o maior desses tempos.
+    Acima de `max_buckets` o menos usado recentemente é descartado mesmo
+    assim (contado em `evicted_full`).
+    """
+
+    def __init__(self, orcamentos, max_buckets=100000, idle_ttl=None):
+        self.orcamentos = dict(orcamentos)
+        self.max_buckets = max_buckets
+        self.idle_ttl = idle_ttl if idle_ttl is not None else max(
+            (o.burst / o.rate for o in self.orcamentos.values()), default=0)
+        self._buckets = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = collections.Counter()
+        self.evicted_idle = 0
+        self.evicted_full = 0
+
+    def check(self, regra, cliente, agora=None):
+        """0.0 se permitido (consome uma ficha); senão segundos até a próxima ficha"""
+        orcamento = self.orcamentos[regra]
+        agora = time.monotonic() if agora is None else agora
+        chave = (regra, cliente)
+        with self._lock:
+            bucket = self._buckets.get(chave)
+            if bucket is None:
+                self._evict(agora)
+                bucket = self._buckets[chave] = [orcamento.burst, agora]
+            else:
+                self._buckets.move_to_end(chave)
+                bucket[0] = min(orcamento.burst, bucket[0] + (agora - bucket[1]) * orcamento.rate)
+                bucket[1] = agora
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                self.allowed += 1
+                return 0.0
+            self.limited[regra] += 1
+            return (1 - bucket[0]) / orcamento.rate
+
+    def _evict(self, agora):
+        """Chamado com o lock adquirido, antes de criar um bucket"""
+        buckets = self._buckets
+        limite = agora - self.idle_ttl
+        while buckets:
+            chave, (_, instante) = next(iter(buckets.items()))
+            if instante <= limite:
+                self.evicted_idle += 1
+            elif len(buckets) >= self.max_buckets:
+                self.evicted_full += 1
+            else:
+                break
+            del buckets[chave]
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'buckets': len(self._buckets),
+                'max_buckets': self.max_buckets,
+                'idle_ttl_seconds': round(self.idle_ttl, 3),
+                'allowed': self.allowed,
+                'limited': sum(self.limited.values()),
+                'limited_by_rule': dict(self.limited),
+                'evicted_idle': self.evicted_idle,
+                'evicted_full': self.evicted_full,
+                'rules': {nome: {'rate': o.rate, 'burst': o.burst}
+                          for nome, o in self.orcamentos.items()}
+            }
+
+
+class ConcurrencyLimiter:
+    """Vagas de requisições simultâneas; `limit` 0 desativa"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self.peak = 0
+        self.admitted = 0
+        self.shed = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        with self._lock:
+            if self.limit and self.in_flight >= self.limit:
+                self.shed += 1
+                return False
+            self.in_flight += 1
+            self.admitted += 1
+            if self.in_flight > self.peak:
+                self.peak = self.in_flight
+            return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def reset_after_fork(self):
+        """No processo filho nenhuma requisição está em andamento"""
+        self._lock = threading.Lock()
+        self.in_flight = 0
+
+    def get_stats(self):
+        return {
+            'limit': self.limit,
+            'in_flight': self.in_flight,
+            'peak': self.peak,
+            'admitted': self.admitted,
+            'shed': self.shed
+        }
@@ -0,0 +1,124 @@
+"""
+Registros compactos de cursos e arquivos
+Classes com __slots__ (sem __dict__ por instância) e valores repetidos
+(status, categoria, tipo_mime) internados: todos os registros apontam para
+a mesma string. Serializam para o mesmo JSON dos dicts originais.
+"""
+
+import sys
+
+
+def internar(valor):
+    """Strings repetidas viram uma única instância compartilhada"""
+    return sys.intern(valor) if type(valor) is str else valor
+
+
+class Record:
+    """
+    Base dos registros: colunas fixas em __slots__ e campos fora do esquema
+    (raros) em `extras`. Oferece a leitura estilo dict (get/[]) usada pelos
+    repositórios e pelo índice de busca.
+    """
+    __slots__ = ('extras',)
+
+    CAMPOS = ()
+    INTERNADOS = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Descritores dos slots, resolvidos uma vez por classe (carga rápida)
+        cls._COLUNAS = tuple((campo, cls.__dict__[campo].__set__, campo in cls.INTERNADOS)
+                             for campo in cls.CAMPOS)
+        cls._GRAVAR = tuple(gravar for _, gravar, _ in cls._COLUNAS)
+        cls._CAMPOS_SET = frozenset(cls.CAMPOS)
+
+    def __init__(self, **campos):
+        self._preencher(campos)
+
+    def _preencher(self, campos):
+        for campo, gravar, internado in self._COLUNAS:
+            valor = campos.get(campo)
+            gravar(self, internar(valor) if internado else valor)
+        extras = None
+        if not self._CAMPOS_SET.issuperset(campos):
+            extras = {k: v for k, v in campos.items() if k not in self._CAMPOS_SET}
+        Record.extras.__set__(self, extras)
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        record = cls.__new__(cls)
+        record._preencher(data)
+        return record
+
+    @classmethod
+    def from_row(cls, row):
+        """Registro a partir de `to_row` (valores na ordem de CAMPOS + extras)"""
+        record = cls.__new__(cls)
+        for gravar, valor in zip(cls._GRAVAR, row):
+            gravar(record, valor)
+        Record.extras.__set__(record, row[-1])
+        return record
+
+    def to_row(self):
+        """Tupla compacta (snapshot): valores na ordem de CAMPOS e os extras"""
+        return tuple(getattr(self, campo) for campo in self.CAMPOS) + (self.extras,)
+
+    def __setattr__(self, campo, valor):
+        raise AttributeError(f"{type(self).__name__} é imutável; use replace()")
+
+    def get(self, campo, padrao=None):
+        if campo in self.CAMPOS:
+            return getattr(self, campo)
+        if self.extras is not None:
+            return self.extras.get(campo, padrao)
+        return padrao
+
+    def __getitem__(self, campo):
+        if campo in self.CAMPOS:
+            return getattr(self, campo)
+        if self.extras is not None and campo in self.extras:
+            return self.extras[campo]
+        raise KeyError(campo)
+
+    def __contains__(self, campo):
+        return campo in self.CAMPOS or (self.extras is not None and campo in self.extras)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self):
+        data = {campo: getattr(self, campo) for campo in self.CAMPOS}
+        if self.extras:
+            data.update(self.extras)
+        return data
+
+    def replace(self, changes):
+        """Novo registro com os campos alterados (o original não muda)"""
+        data = self.to_dict()
+        data.update(changes)
+        return type(self)(**data)
+
+
+class Curso(Record):
+    __slots__ = ('id', 'titulo', 'categoria', 'status')
+
+    CAMPOS = ('id', 'titulo', 'categoria', 'status')
+    INTERNADOS = frozenset({'categoria', 'status'})
+
+
+class Arquivo(Record):
+    __slots__ = ('id', 'curso_id', 'nome', 'nome_armazenamento', 'categoria', 'tipo_mime',
+                 'tamanho', 'url_s3', 'is_publico')
+
+    CAMPOS = ('id', 'curso_id', 'nome', 'nome_armazenamento', 'categoria', 'tipo_mime',
+              'tamanho', 'url_s3', 'is_publico')
+    INTERNADOS = frozenset({'categoria', 'tipo_mime'})
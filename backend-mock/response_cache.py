@@ -0,0 +1,159 @@
+"""
+Cache de respostas pré-codificadas por versão dos dados
+Cada corpo é serializado e comprimido (gzip e, se disponível, brotli) uma
+única vez por versão; requisições condicionais (If-None-Match) recebem 304
+sem executar o handler.
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+from functools import wraps
+
+from flask import Response, request
+from werkzeug.http import http_date
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional
+    brotli = None
+
+# Corpos menores que isso não compensam compressão
+TAMANHO_MINIMO_COMPRESSAO = 512
+
+
+class CachedBody:
+    """Representações de um corpo de resposta para uma versão dos dados"""
+    __slots__ = ('version', 'mimetype', 'variants', 'etag', 'last_modified')
+
+    def __init__(self, version, body, mimetype):
+        self.version = version
+        self.mimetype = mimetype
+        self.last_modified = int(time.time())
+        digest = hashlib.sha1(body).hexdigest()
+        self.etag = digest
+        # codificação -> (corpo, etag forte da representação)
+        self.variants = {'identity': (body, f'"{digest}"')}
+        if len(body) >= TAMANHO_MINIMO_COMPRESSAO:
+            self.variants['gzip'] = (gzip.compress(body, compresslevel=6), f'"{digest}-gzip"')
+            if brotli is not None:
+                self.variants['br'] = (brotli.compress(body, quality=5), f'"{digest}-br"')
+
+    def matches(self, if_none_match):
+        """If-None-Match casa com qualquer representação desta versão"""
+        if if_none_match.star_tag:
+            return True
+        return any(if_none_match.contains_weak(etag.strip('"')) for _, etag in self.variants.values())
+
+
+class ResponseCache:
+    """Uma entrada por endpoint, reconstruída quando a versão muda"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.not_modified = 0
+        self.builds = 0
+
+    def peek(self, name, version):
+        entry = self._entries.get(name)
+        if entry is not None and entry.version == version:
+            return entry
+        return None
+
+    def store(self, name, version, body, mimetype):
+        entry = CachedBody(version, body, mimetype)
+        with self._lock:
+            self._entries[name] = entry
+            self.builds += 1
+        return entry
+
+    def invalidate(self, name=None):
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+
+    def get_stats(self):
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'not_modified': self.not_modified,
+            'builds': self.builds,
+            'brotli': brotli is not None
+        }
+
+    def cached(self, name, version_fn):
+        """
+        Decorator de rota: `version_fn()` devolve a versão atual dos dados
+        que o endpoint serializa; mudou a versão, o corpo é refeito.
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                version = version_fn()
+                entry = self.peek(name, version)
+                if entry is not None:
+                    nao_modificado = _not_modified(entry)
+                    with self._lock:
+                        if nao_modificado:
+                            self.not_modified += 1
+                        else:
+                            self.hits += 1
+                    if nao_modificado:
+                        return _response_304(entry)
+                    return _encoded_response(entry)
+
+                result = f(*args, **kwargs)
+                response = result if isinstance(result, Response) else Response(result, mimetype='text/html')
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                entry = self.store(name, version, response.get_data(), response.mimetype)
+                if _not_modified(entry):
+                    return _response_304(entry)
+                return _encoded_response(entry)
+            return decorated_function
+        return decorator
+
+
+def _not_modified(entry):
+    # Só o ETag: Last-Modified tem resolução de segundo, e uma versão refeita
+    # no mesmo segundo da anterior teria a mesma data (304 com corpo antigo).
+    # If-Modified-Since é ignorado (toda entrada tem ETag).
+    if request.if_none_match:
+        return entry.matches(request.if_none_match)
+    return False
+
+
+def _validators(entry, etag):
+    return {
+        'ETag': etag,
+        'Last-Modified': http_date(entry.last_modified),
+        'Cache-Control': 'no-cache',
+        'Vary': 'Accept-Encoding'
+    }
+
+
+def _escolher_codificacao(entry):
+    disponiveis = [c for c in ('br', 'gzip') if c in entry.variants]
+    return request.accept_encodings.best_match(disponiveis + ['identity'], default='identity')
+
+
+def _response_304(entry):
+    _, etag = entry.variants[_escolher_codificacao(entry)]
+    return Response(status=304, headers=_validators(entry, etag))
+
+
+def _encoded_response(entry):
+    codificacao = _escolher_codificacao(entry)
+    body, etag = entry.variants[codificacao]
+    response = Response(body, mimetype=entry.mimetype, headers=_validators(entry, etag))
+    if codificacao != 'identity':
+        response.headers['Content-Encoding'] = codificacao
+    return response
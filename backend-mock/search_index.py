@@ -0,0 +1,148 @@
+"""
+Índice invertido para busca textual de cursos
+Equivalente em memória ao índice GIN to_tsvector('portuguese', nome_curso)
+"""
+
+import bisect
+import re
+import sys
+import unicodedata
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# Stopwords do português (já sem acentos), como no dicionário 'portuguese'
+STOPWORDS_PT = frozenset("""
+a ao aos as com como da das de do dos e em entre na nas no nos o os ou
+para pela pelas pelo pelos por que se sem sob sobre um uma umas uns
+""".split())
+
+# Sufixos de plural -> forma singular (stemming leve)
+_SUFIXOS_PLURAL = (
+    ('coes', 'cao'),
+    ('oes', 'ao'),
+    ('aes', 'ao'),
+    ('ais', 'al'),
+    ('eis', 'el'),
+    ('ns', 'm'),
+)
+
+# Peso de um termo que casou apenas por prefixo
+PESO_PREFIXO = 0.5
+TAMANHO_MINIMO_PREFIXO = 2
+
+
+def normalizar(texto):
+    """Minúsculas e remoção de acentos (NFKD sem marcas combinantes)"""
+    decomposto = unicodedata.normalize('NFKD', texto.casefold())
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def radical(token):
+    for sufixo, troca in _SUFIXOS_PLURAL:
+        if token.endswith(sufixo) and len(token) > len(sufixo) + 2:
+            return token[:-len(sufixo)] + troca
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokenizar(texto):
+    """Texto -> lista de termos normalizados, sem stopwords"""
+    if not texto:
+        return []
+    return [radical(t) for t in _TOKEN_RE.findall(normalizar(str(texto)))
+            if t not in STOPWORDS_PT]
+
+
+class SearchIndex:
+    """
+    Índice invertido termo -> {doc_id: peso}, com vocabulário ordenado
+    para busca por prefixo via bisect.
+
+    `fields` define os campos indexados e seu peso no ranking. Atualizações
+    são incrementais: `add` de um documento novo e `remove` com o mesmo
+    conteúdo que foi indexado (os termos são recalculados a partir dele, em
+    vez de guardar a lista de termos de cada documento). Não é thread-safe
+    por si só: o repositório dono do índice serializa o acesso.
+    """
+
+    def __init__(self, fields):
+        self.fields = dict(fields)
+        self._postings = {}
+        self._vocab = []
+        self._docs = 0
+        # Pesos compartilhados entre documentos (poucos valores distintos)
+        self._pesos = {}
+
+    def __len__(self):
+        return self._docs
+
+    def dump_state(self):
+        return {'postings': self._postings, 'vocab': self._vocab, 'docs': self._docs}
+
+    def load_state(self, estado):
+        self._postings = estado['postings']
+        self._vocab = estado['vocab']
+        self._docs = estado['docs']
+        self._pesos = {}
+
+    def _termos(self, doc):
+        pesos = {}
+        for campo, peso in self.fields.items():
+            for termo in tokenizar(doc.get(campo)):
+                pesos[termo] = pesos.get(termo, 0.0) + peso
+        return pesos
+
+    def add(self, doc_id, doc):
+        for termo, peso in self._termos(doc).items():
+            postings = self._postings.get(termo)
+            if postings is None:
+                termo = sys.intern(termo)
+                postings = self._postings[termo] = {}
+                bisect.insort(self._vocab, termo)
+            postings[doc_id] = self._pesos.setdefault(peso, peso)
+        self._docs += 1
+
+    def remove(self, doc_id, doc):
+        for termo in self._termos(doc):
+            postings = self._postings.get(termo)
+            if postings is None or postings.pop(doc_id, None) is None:
+                continue
+            if not postings:
+                del self._postings[termo]
+                del self._vocab[bisect.bisect_left(self._vocab, termo)]
+        self._docs -= 1
+
+    def search(self, query):
+        """
+        Ids que contêm todos os termos da consulta (exatos ou por prefixo),
+        ordenados por relevância e depois por id.
+        """
+        termos = tokenizar(query)
+        if not termos:
+            return []
+        resultado = None
+        for termo in dict.fromkeys(termos):
+            scores = self._match(termo)
+            if resultado is None:
+                resultado = scores
+            else:
+                resultado = {d: s + scores[d] for d, s in resultado.items() if d in scores}
+            if not resultado:
+                return []
+        return sorted(resultado, key=lambda d: (-resultado[d], d))
+
+    def _match(self, termo):
+        """doc_id -> melhor score do termo (exato vale mais que prefixo)"""
+        scores = dict(self._postings.get(termo, {}))
+        if len(termo) < TAMANHO_MINIMO_PREFIXO:
+            return scores
+        vocab = self._vocab
+        i = bisect.bisect_right(vocab, termo)
+        while i < len(vocab) and vocab[i].startswith(termo):
+            for doc_id, peso in self._postings[vocab[i]].items():
+                parcial = peso * PESO_PREFIXO
+                if parcial > scores.get(doc_id, 0.0):
+                    scores[doc_id] = parcial
+            i += 1
+        return scores
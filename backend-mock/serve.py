@@ -0,0 +1,184 @@
+"""
+Modo de produção do Backend Mock
+Serve o app com vários processos (workers) e threads, carregando os dados
+uma única vez no processo mestre (preload) antes do fork.
+
+Uso:
+    python serve.py                       # workers = núcleos de CPU (1 sem ACERVO_DB)
+    python serve.py --workers 4 --threads 8 --port 5007
+    python serve.py --asgi                # app assíncrono (asgi.py) com uvicorn
+    python serve.py --profile-startup     # resumo do tempo de inicialização
+
+Com gunicorn instalado (Linux/macOS) usa o worker gthread. Sem gunicorn
+(ex.: Windows) cai para waitress, se disponível, ou para o servidor do
+Werkzeug com threads, sempre sem reloader e sem debugger. Com --asgi usa
+workers uvicorn no gunicorn (ou o uvicorn sozinho, em um processo).
+
+Estado com vários workers: os dados são carregados no mestre e
+compartilhados copy-on-write; após o fork cada worker recria seus locks e a
+thread de logs (ver `_reinit_after_fork` em server.py) e mantém o próprio
+cache e as próprias métricas (/api/metrics informa o pid do worker).
+Repositórios em memória não são compartilhados: uma alteração de curso ou
+arquivo chegaria só ao worker que a recebeu. Por isso, sem ACERVO_DB, o
+padrão é um único worker e --workers maior que 1 é recusado; com o banco
+SQLite cursos, arquivos, usuários, versões e o feed do Kanban são comuns a
+todos os workers. Continuam por processo, com vários workers: os buckets do
+limite de requisições (cada worker recebe 1/N de cada orçamento) e o buffer
+de /api/auditoria (eventos com o pid em `worker`; o destino em
+ACERVO_AUDIT_FILE recebe os eventos de todos).
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import sys
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Backend Mock - modo de produção')
+    parser.add_argument('--host', default=os.environ.get('HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5007)))
+    parser.add_argument('--workers', type=int,
+                        default=int(os.environ['WEB_CONCURRENCY']) if os.environ.get('WEB_CONCURRENCY') else None,
+                        help='processos (padrão: núcleos de CPU com ACERVO_DB, senão 1)')
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('THREADS', 8)))
+    parser.add_argument('--keepalive', type=int, default=5,
+                        help='segundos para manter conexões keep-alive abertas')
+    parser.add_argument('--timeout', type=int, default=30,
+                        help='segundos sem resposta antes de reiniciar um worker')
+    parser.add_argument('--graceful-timeout', type=int, default=20,
+                        help='segundos para concluir requisições ao encerrar')
+    parser.add_argument('--backlog', type=int, default=2048)
+    parser.add_argument('--max-requests', type=int, default=0,
+                        help='reciclar o worker após N requisições (0 = nunca)')
+    parser.add_argument('--asgi', action='store_true',
+                        help='servir a variante assíncrona (asgi.py; requer uvicorn)')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='medir a inicialização (importações por pacote e fases) e sair')
+    args = parser.parse_args(argv)
+    if args.workers is None:
+        args.workers = multiprocessing.cpu_count() if os.environ.get('ACERVO_DB') else 1
+    return args
+
+
+def load_app(asgi=False):
+    """Criar o app (create_app, que carrega os dados) e congelar o heap para o fork"""
+    if asgi:
+        from asgi import create_app
+    else:
+        from server import create_app
+
+    app = create_app()
+    # Objetos já criados saem do alcance do GC: a coleta nos workers não
+    # toca essas páginas e elas continuam compartilhadas (copy-on-write)
+    gc.collect()
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
+    return app
+
+
+def run_gunicorn(args):
+    from gunicorn.app.base import BaseApplication
+
+    class MockApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            self.application = None
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            if self.application is None:
+                self.application = load_app(args.asgi)
+            return self.application
+
+    def worker_exit(server, worker):
+        # Auditoria (write-behind) e logs pendentes antes do os._exit do worker
+        import server as mock
+        mock.encerrar_processo()
+
+    options = {
+        'bind': f'{args.host}:{args.port}',
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': 'uvicorn.workers.UvicornWorker' if args.asgi else 'gthread',
+        'preload_app': True,
+        'keepalive': args.keepalive,
+        'timeout': args.timeout,
+        'graceful_timeout': args.graceful_timeout,
+        'backlog': args.backlog,
+        'max_requests': args.max_requests,
+        'max_requests_jitter': args.max_requests // 10 if args.max_requests else 0,
+        'worker_exit': worker_exit,
+        'accesslog': None,
+    }
+    MockApplication(options).run()
+
+
+def run_uvicorn(args):
+    import uvicorn
+
+    # Um único processo: a concorrência vem do laço asyncio
+    uvicorn.run(load_app(asgi=True), host=args.host, port=args.port, backlog=args.backlog,
+                timeout_keep_alive=args.keepalive, lifespan='on')
+
+
+def run_waitress(args):
+    import waitress
+
+    # waitress usa um único processo; o paralelismo vem das threads
+    waitress.serve(load_app(), host=args.host, port=args.port,
+                   threads=args.workers * args.threads, backlog=args.backlog,
+                   channel_timeout=args.timeout)
+
+
+def run_werkzeug(args):
+    from werkzeug.serving import run_simple
+
+    run_simple(args.host, args.port, load_app(), threaded=True,
+               use_reloader=False, use_debugger=False)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.profile_startup:
+        from startup import perfil
+
+        perfil(asgi=args.asgi)
+        return 0
+    if args.workers > 1 and not os.environ.get('ACERVO_DB'):
+        print("❌ --workers > 1 requer ACERVO_DB: sem o banco cada worker teria a própria cópia "
+              "dos dados em memória", file=sys.stderr)
+        return 2
+    # Lido pelo create_app de load_app (preload)
+    os.environ['ACERVO_WORKERS'] = str(args.workers)
+    os.environ['ACERVO_THREADS'] = str(args.threads)
+    print(f"🚀 Iniciando Backend Mock (produção) em http://{args.host}:{args.port}")
+    if args.asgi:
+        try:
+            __import__('uvicorn')
+        except ImportError:
+            print("❌ --asgi requer uvicorn (pip install uvicorn)", file=sys.stderr)
+            return 1
+        runners = ((run_gunicorn, 'gunicorn'), (run_uvicorn, 'uvicorn'))
+    else:
+        runners = ((run_gunicorn, 'gunicorn'), (run_waitress, 'waitress'))
+    for runner, modulo in runners:
+        try:
+            __import__(modulo)
+        except ImportError:
+            continue
+        print(f"⚙️  Servidor: {modulo} | workers: {args.workers} | threads: {args.threads}"
+              f"{' | ASGI' if args.asgi else ''}")
+        return runner(args)
+    print("⚠️  gunicorn/waitress não encontrados: usando Werkzeug com threads (1 processo)",
+          file=sys.stderr)
+    return run_werkzeug(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
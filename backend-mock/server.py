@@ -3,129 +3,557 @@ Backend Mock Funcional para Acervo Educacional
 Demonstração completa de login e navegação
 """
 
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, current_app, g, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import jwt
 import datetime
+import os
 import json
+import base64
+import hashlib
+import math
+import zlib
 import logging
 import sys
-from functools import wraps
+import time
+import heapq
+import secrets
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from functools import partial, wraps
 
-app = Flask(__name__)
-# CORS seguro e funcional
-CORS(app, 
-     origins=["http://localhost:5175", "http://localhost:5174", "http://localhost:5176", "http://localhost:3000", "http://localhost:5004"],
-     methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-     allow_headers=["Content-Type", "Authorization", "Accept"],
-     supports_credentials=True)
+from werkzeug.local import LocalProxy
+from werkzeug.utils import send_file
+
+from json_codec import array_json, escolher_codec, gzip_stream, ndjson, objeto_json
+from log_pipeline import configure_logging
+from metrics import MetricsRegistry, PROCESS_START, uptime_seconds
+from rate_limit import ConcurrencyLimiter, Orcamento, RateLimiter, dividir_orcamentos, parse_orcamentos
+from object_store import LocalObjectStore, UploadNotFound, UploadOffsetMismatch, nome_seguro
+from response_cache import ResponseCache
+from audit_log import AuditLog, open_sink
+from change_feed import ChangeFeed, formatar_sse, marcador, parse_versao
+from loader import CATEGORIAS_ARQUIVO, load_from_env, seed_configured
+from records import Record
+from sqlite_store import SqliteArquivoStore, SqliteCourseStore, SqliteDatabase, SqliteUserStore
+from store import ArquivoStore, CourseStore
+from user_store import PasswordVerifier, UserStore, VerifierBusy, dummy_hash, normalize_email
+import snapshot
+from startup import ModuloAdiado, marco
+
+# PyJWT só é importado no primeiro login ou token verificado
+jwt = ModuloAdiado('jwt')
+marco('importacoes')
+
+# Rotas e hooks; create_app registra o blueprint em cada app que monta
+bp = Blueprint('acervo', __name__)
+
+# Estado de cada app (repositórios, caches, limites, métricas e threads) em
+# app.extensions['acervo'], montado por create_app. As rotas usam os nomes
+# do módulo (cache, curso_store...): proxies para o estado do app atual.
+def estado_do_app(app=None):
+    """EstadoAcervo de `app` (padrão: o app da requisição atual)"""
+    return (app or current_app).extensions['acervo']
+
+def _do_estado(nome):
+    return LocalProxy(lambda: getattr(current_app.extensions['acervo'], nome))
+
+
+class AcervoJSONProvider(DefaultJSONProvider):
+    """
+    Registros compactos (records.py) serializam no formato de dict. A
+    codificação é do codec de json_codec.py (orjson se instalado, ou
+    ACERVO_JSON=stdlib); com o app em debug (JSON indentado) ou opções
+    explícitas vale o provider padrão do Flask.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.codec = escolher_codec(self.default, os.environ.get('ACERVO_JSON'))
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Record):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.codec.dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return self.codec.loads(s)
+
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.codec.dumps(obj) + b'\n', mimetype=self.mimetype)
+
+
+# CORS seguro e funcional (registrado por create_app)
+CORS_ORIGINS = ["http://localhost:5175", "http://localhost:5174", "http://localhost:5176", "http://localhost:3000", "http://localhost:5004"]
+CORS_EXPOSE_HEADERS = ["Content-Range", "Accept-Ranges", "Content-Disposition", "Location",
+                       "Upload-Offset", "Upload-Length", "Retry-After"]
+CORS_OPCOES = {
+    'origins': CORS_ORIGINS,
+    'methods': ["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    'allow_headers': ["Content-Type", "Authorization", "Accept", "Range", "If-Range",
+                      "Upload-Offset", "Upload-Length", "X-File-Name"],
+    'expose_headers': CORS_EXPOSE_HEADERS,
+    'supports_credentials': True
+}
 
 # Configurações
 SECRET_KEY = "acervo-educacional-secret-key"
 
-# Configuração de Logs Estruturados
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Configuração de Logs Estruturados (JSON, fila + thread de escrita em lotes)
+# Eventos de alto volume são amostrados: mantém 1 a cada N
+LOG_SAMPLING = {
+    'cache.hit': 100,
+    'cache.miss': 10,
+    'request:/api/health': 10,
+    'response:/api/health': 10
+}
+
+log_pipeline = None
+_logs_lock = threading.Lock()
+
+def configurar_logs():
+    """Pipeline de logs do processo (logger raiz), instalado no primeiro create_app"""
+    global log_pipeline
+    with _logs_lock:
+        if log_pipeline is None:
+            log_pipeline = configure_logging(
+                level=getattr(logging, os.environ.get('LOG_LEVEL', 'INFO').upper(), logging.INFO),
+                sampling=LOG_SAMPLING
+            )
+    return log_pipeline
 
 logger = logging.getLogger(__name__)
 
-# Sistema de Cache Simples em Memória
-class SimpleCache:
+# Cache de respostas pré-codificadas (ETag, gzip/brotli) por versão dos dados
+response_cache = _do_estado('response_cache')
+
+def resposta_cacheada(nome, versao):
+    """ResponseCache.cached com o cache de respostas do app da requisição"""
+    return ResponseCache.cached(response_cache, nome, versao)
+
+# Sistema de Cache em Memória (LRU + TTL, thread-safe)
+class _CacheEntry:
+    """
+    Registro compacto de uma entrada do cache. Até `fresh_until` o valor é
+    fresco; entre `fresh_until` e `expires_at` é obsoleto (stale) e só é
+    servido por get_or_compute enquanto um refresh roda em segundo plano.
+    """
+    __slots__ = ('value', 'fresh_until', 'expires_at', 'size', 'created_at')
+
+    def __init__(self, value, fresh_until, expires_at, size, created_at):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.expires_at = expires_at
+        self.size = size
+        self.created_at = created_at
+
+
+class _Flight:
+    """Cálculo em andamento de uma chave (single-flight)"""
+    __slots__ = ('event', 'value', 'error')
+
     def __init__(self):
-        self.cache = {}
-        self.timestamps = {}
-    
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+def _estimate_size(value):
+    """Estimativa do tamanho do payload em bytes (JSON compacto)"""
+    try:
+        return len(json.dumps(value, default=str, separators=(',', ':')).encode('utf-8'))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+class SimpleCache:
+    """
+    Cache LRU com TTL por chave e limite de memória.
+
+    - Entradas ficam em um OrderedDict: hit move a chave para o fim e a
+      evicção remove do início, ambos O(1).
+    - Limites por quantidade de entradas e por bytes estimados do payload.
+    - Chaves expiradas são varridas de forma amortizada a partir de um heap
+      ordenado pela expiração, sem depender de uma nova leitura da chave.
+    - Todas as operações são protegidas por lock (servidor WSGI com threads).
+    - get_or_compute: apenas um chamador recalcula uma chave ausente (os
+      demais esperam o resultado) e, com `stale_ttl`, o valor obsoleto é
+      servido enquanto um único refresh roda em segundo plano.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=8 * 1024 * 1024, default_ttl=300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._expiry_heap = []
+        self._lock = threading.RLock()
+        self._payload_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._stale_hits = 0
+        self._coalesced = 0
+        self._refreshes = 0
+        self._inflight = {}
+
     def get(self, key):
-        if key in self.cache:
-            timestamp = self.timestamps.get(key, 0)
-            if datetime.datetime.now().timestamp() - timestamp < self.ttl.get(key, 300):
-                logger.info(f"Cache HIT para chave: {key}")
-                return self.cache[key]
-            else:
-                logger.info(f"Cache EXPIRED para chave: {key}")
-                self.delete(key)
-        logger.info(f"Cache MISS para chave: {key}")
+        entry = self._lookup(key, time.monotonic())
+        if entry is not None and entry.fresh_until > time.monotonic():
+            return entry.value
         return None
-    
-    def set(self, key, value, ttl=300):
-        self.cache[key] = value
-        self.timestamps[key] = datetime.datetime.now().timestamp()
-        if not hasattr(self, 'ttl'):
-            self.ttl = {}
-        self.ttl[key] = ttl
-        logger.info(f"Cache SET para chave: {key}, TTL: {ttl}s")
-    
+
+    def peek(self, key):
+        """
+        (valor, fresco) da chave, inclusive no período obsoleto (`stale_ttl`),
+        ou None se ausente/expirada. Para quem agenda o próprio refresh
+        (o app ASGI, no laço asyncio) em vez de usar get_or_compute.
+        """
+        now = time.monotonic()
+        entry = self._lookup(key, now)
+        if entry is None:
+            return None
+        fresco = entry.fresh_until > now
+        if not fresco:
+            with self._lock:
+                self._stale_hits += 1
+        return entry.value, fresco
+
+    def probe(self, key):
+        """Valor fresco da chave sem contar hit/miss nem mexer na ordem LRU"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.fresh_until > time.monotonic():
+                return entry.value
+            return None
+
+    def count_refresh(self):
+        """Refresh concluído fora de get_or_compute (estatísticas)"""
+        with self._lock:
+            self._refreshes += 1
+
+    def get_or_compute(self, key, compute, ttl=None, stale_ttl=0, wait_timeout=30):
+        """
+        Valor da chave ou `compute()` executado por um único chamador.
+
+        - Fresco: retorna direto.
+        - Obsoleto (dentro de `stale_ttl`): retorna o valor antigo e dispara
+          um refresh em segundo plano, se ainda não houver um.
+        - Ausente: o primeiro chamador calcula; os concorrentes aguardam o
+          mesmo resultado (ou a exceção) em vez de recalcular.
+        Qualquer valor calculado é cacheado, inclusive vazio/falsy.
+        """
+        now = time.monotonic()
+        entry = self._lookup(key, now)
+        if entry is not None:
+            if entry.fresh_until > now:
+                return entry.value
+            with self._lock:
+                self._stale_hits += 1
+                if key not in self._inflight:
+                    flight = self._inflight[key] = _Flight()
+                    threading.Thread(target=self._run_flight, name=f'cache-refresh-{key}',
+                                     args=(key, flight, compute, ttl, stale_ttl, True),
+                                     daemon=True).start()
+            return entry.value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self._coalesced += 1
+        if leader:
+            self._run_flight(key, flight, compute, ttl, stale_ttl, False)
+        elif not flight.event.wait(wait_timeout):
+            return compute()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def set(self, key, value, ttl=None, stale_ttl=0):
+        ttl = self.default_ttl if ttl is None else ttl
+        size = _estimate_size(value)
+        now = time.monotonic()
+        with self._lock:
+            self._sweep_expired(now)
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                logger.debug("Cache IGNORADO", extra={'event': 'cache.skip', 'key': key, 'size': size})
+                return
+            entry = _CacheEntry(value, now + ttl, now + ttl + stale_ttl, size, time.time())
+            self._entries[key] = entry
+            self._payload_bytes += size
+            heapq.heappush(self._expiry_heap, (entry.expires_at, key))
+            self._evict_overflow()
+        logger.debug("Cache SET", extra={'event': 'cache.set', 'key': key, 'ttl': ttl})
+
     def delete(self, key):
-        if key in self.cache:
-            del self.cache[key]
-        if key in self.timestamps:
-            del self.timestamps[key]
-        if hasattr(self, 'ttl') and key in self.ttl:
-            del self.ttl[key]
-    
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._expiry_heap.clear()
+            self._payload_bytes = 0
+
     def get_stats(self):
-        return {
-            'total_keys': len(self.cache),
-            'cache_size_bytes': sys.getsizeof(self.cache),
-            'oldest_entry': min(self.timestamps.values()) if self.timestamps else None
-        }
+        with self._lock:
+            self._sweep_expired(time.monotonic())
+            lookups = self._hits + self._misses
+            return {
+                'total_keys': len(self._entries),
+                'max_entries': self.max_entries,
+                'cache_size_bytes': self._payload_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'stale_hits': self._stale_hits,
+                'coalesced': self._coalesced,
+                'refreshes': self._refreshes,
+                'oldest_entry': min((e.created_at for e in self._entries.values()), default=None)
+            }
+
+    def reset_after_fork(self):
+        """No processo filho: recriar o lock (pode ter sido copiado adquirido)"""
+        self._lock = threading.RLock()
+        self._inflight = {}
+
+    def _lookup(self, key, now):
+        """Entrada ainda não expirada (fresca ou obsoleta), contando hit/miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    if entry.fresh_until > now:
+                        self._hits += 1
+                        logger.debug("Cache HIT", extra={'event': 'cache.hit', 'key': key})
+                        return entry
+                    logger.debug("Cache STALE", extra={'event': 'cache.stale', 'key': key})
+                    self._misses += 1
+                    return entry
+                self._remove(key)
+                self._expirations += 1
+                logger.debug("Cache EXPIRED", extra={'event': 'cache.expired', 'key': key})
+            self._misses += 1
+        logger.debug("Cache MISS", extra={'event': 'cache.miss', 'key': key})
+        return None
+
+    def _run_flight(self, key, flight, compute, ttl, stale_ttl, background):
+        try:
+            flight.value = compute()
+            self.set(key, flight.value, ttl=ttl, stale_ttl=stale_ttl)
+        except Exception as e:
+            flight.error = e
+            if background:
+                # Mantém o valor obsoleto; a próxima leitura tenta de novo
+                logger.error("Cache REFRESH falhou", extra={'event': 'cache.refresh_error',
+                                                            'key': key, 'error': str(e)})
+        finally:
+            with self._lock:
+                if background and flight.error is None:
+                    self._refreshes += 1
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    # Métodos internos (chamados com o lock adquirido)
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._payload_bytes -= entry.size
+        return entry
+
+    def _evict_overflow(self):
+        while self._entries and (len(self._entries) > self.max_entries or
+                                 self._payload_bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._payload_bytes -= entry.size
+            self._evictions += 1
 
-cache = SimpleCache()
+    def _sweep_expired(self, now):
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            # Itens do heap podem estar obsoletos (chave regravada ou removida)
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                self._expirations += 1
+        # Compacta o heap quando acumula muitas referências obsoletas
+        if len(heap) > 2 * len(self._entries) + 64:
+            self._expiry_heap = [(e.expires_at, k) for k, e in self._entries.items()]
+            heapq.heapify(self._expiry_heap)
+
+cache = _do_estado('cache')
+
+# Cache de tokens já verificados: chave = SHA-256 do token, expira no 'exp'
+# do próprio token. Tokens inválidos ou expirados nunca entram no cache.
+token_cache = _do_estado('token_cache')
+
+def decode_token(token):
+    """
+    Decodificar e validar um JWT, consultando antes o cache de tokens
+    verificados. Lança as mesmas exceções de jwt.decode.
+    """
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    payload = token_cache.get(digest)
+    if payload is not None:
+        if payload.get('exp', float('inf')) > time.time():
+            return payload
+        # Expirou desde que foi cacheado: jwt.decode produz o erro correto
+        token_cache.delete(digest)
+    
+    payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
+    exp = payload.get('exp')
+    ttl = exp - time.time() if exp is not None else None
+    if ttl is None or ttl > 0:
+        token_cache.set(digest, payload, ttl=ttl)
+    return payload
 
 # Decorator para logs estruturados
+def _status_code(result):
+    if isinstance(result, tuple):
+        return result[1] if len(result) > 1 and isinstance(result[1], int) else 200
+    return getattr(result, 'status_code', 200)
+
 def log_request(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        start_time = datetime.datetime.now()
+        start = time.perf_counter()
+        route = request.url_rule.rule if request.url_rule else request.path
         
-        # Log da requisição
-        logger.info("REQUEST", extra={
+        # Log da requisição (DEBUG: a linha de resposta já traz os mesmos campos)
+        logger.debug("REQUEST", extra={
+            'event': 'request',
             'method': request.method,
+            'route': route,
             'url': request.url,
             'remote_addr': request.remote_addr,
-            'user_agent': request.headers.get('User-Agent', ''),
-            'timestamp': start_time.isoformat()
+            'user_agent': request.headers.get('User-Agent', '')
         })
         
         try:
             result = f(*args, **kwargs)
             
             # Log da resposta
-            end_time = datetime.datetime.now()
-            duration = (end_time - start_time).total_seconds()
-            
             logger.info("RESPONSE", extra={
+                'event': 'response',
                 'method': request.method,
+                'route': route,
                 'url': request.url,
-                'status_code': getattr(result, 'status_code', 200),
-                'duration_seconds': duration,
-                'timestamp': end_time.isoformat()
+                'remote_addr': request.remote_addr,
+                'status_code': _status_code(result),
+                'duration_seconds': round(time.perf_counter() - start, 6)
             })
             
             return result
             
         except Exception as e:
             # Log do erro
-            end_time = datetime.datetime.now()
-            duration = (end_time - start_time).total_seconds()
-            
             logger.error("ERROR", extra={
+                'event': 'error',
                 'method': request.method,
+                'route': route,
                 'url': request.url,
                 'error': str(e),
-                'duration_seconds': duration,
-                'timestamp': end_time.isoformat()
+                'duration_seconds': round(time.perf_counter() - start, 6)
             })
             
             raise
     
     return decorated_function
 
+# Métricas em processo (expostas em /api/metrics no formato Prometheus)
+metrics = _do_estado('metrics')
+
+# Campo de SimpleCache.get_stats() -> nome da métrica
+_CACHE_METRICAS = {
+    'hits': 'acervo_cache_hits_total',
+    'misses': 'acervo_cache_misses_total',
+    'evictions': 'acervo_cache_evictions_total',
+    'expirations': 'acervo_cache_expirations_total',
+    'total_keys': 'acervo_cache_keys',
+    'cache_size_bytes': 'acervo_cache_payload_bytes'
+}
+
+def _cache_collector(estado):
+    for nome, instancia in (('dashboard', estado.cache), ('token', estado.token_cache)):
+        stats = instancia.get_stats()
+        labels = (('cache', nome),)
+        for campo, metrica in _CACHE_METRICAS.items():
+            yield metrica, labels, stats[campo]
+
+def _process_collector():
+    yield 'acervo_process_uptime_seconds', (), round(uptime_seconds(), 3)
+    yield 'acervo_process_start_time_seconds', (), PROCESS_START
+    yield 'acervo_process_pid', (), os.getpid()
+    log_stats = log_pipeline.get_stats()
+    yield 'acervo_log_records_dropped', (), log_stats['dropped']
+    yield 'acervo_log_queue_depth', (), log_stats['queue_depth']
+
+def criar_metricas(estado):
+    """Registro de métricas de um app, com os coletores do seu estado"""
+    registro = MetricsRegistry()
+    registro.describe('acervo_http_requests_total', 'counter', 'Requisições por rota, método e status')
+    registro.describe('acervo_http_request_duration_seconds', 'histogram', 'Latência das requisições por rota')
+    registro.describe('acervo_http_request_duration_seconds_quantile', 'gauge', 'Quantis estimados (p50/p95/p99) da latência por rota')
+    registro.describe('acervo_http_requests_in_flight', 'gauge', 'Requisições em andamento por rota')
+    registro.describe('acervo_rate_limited_total', 'counter', 'Requisições recusadas (429) por regra de limite')
+    registro.describe('acervo_load_shed_total', 'counter', 'Requisições recusadas (503) pelo teto de concorrência')
+    for campo in ('hits', 'misses', 'evictions', 'expirations'):
+        registro.describe(f'acervo_cache_{campo}_total', 'counter', f'Total de {campo} do cache')
+    registro.register_collector(partial(_cache_collector, estado))
+    registro.register_collector(_process_collector)
+    return registro
+
+def _metric_route():
+    return request.url_rule.rule if request.url_rule else '<unmatched>'
+
+@bp.before_app_request
+def _metrics_start():
+    g.metrics_start = time.perf_counter()
+    g.metrics_route = _metric_route()
+    metrics.gauge_add('acervo_http_requests_in_flight', (('route', g.metrics_route),), 1)
+
+@bp.after_app_request
+def _metrics_record(response):
+    start = g.get('metrics_start')
+    if start is not None:
+        route = g.metrics_route
+        metrics.inc('acervo_http_requests_total', (('route', route), ('method', request.method),
+                                                   ('status', str(response.status_code))))
+        metrics.observe('acervo_http_request_duration_seconds', (('route', route),),
+                        time.perf_counter() - start)
+    return response
+
+@bp.teardown_app_request
+def _metrics_finish(exc):
+    route = g.pop('metrics_route', None)
+    if route is not None:
+        metrics.gauge_add('acervo_http_requests_in_flight', (('route', route),), -1)
+
 # Dados mock
 usuarios_mock = [
     {
@@ -158,247 +586,285 @@ cursos_mock = [
     }
 ]
 
-@app.route('/api/auth/login', methods=['POST', 'OPTIONS'])
-@app.route('/api/v1/auth/login', methods=['POST', 'OPTIONS'])
-@log_request
-def login():
-    """Realizar login no sistema"""
-    # Responder a requisições OPTIONS (preflight)
-    if request.method == 'OPTIONS':
-        response = jsonify({'status': 'ok'})
-        response.headers.add('Access-Control-Allow-Origin', '*')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization,Accept')
-        response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
-        return response
-        
-    try:
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({
-                'success': False,
-                'message': 'Dados não fornecidos'
-            }), 400
-        
-        email = data.get('email', '').strip().lower()
-        senha = data.get('password', '')
-        
-        print(f"Tentativa de login: {email}")
-        
-        # Verificar credenciais
-        usuario = next((u for u in usuarios_mock if u['email'].lower() == email and u['senha'] == senha), None)
-        
-        if usuario:
-            # Gerar token JWT
-            payload = {
-                'user_id': usuario['id'],
-                'email': usuario['email'],
-                'is_admin': usuario['is_admin'],
-                'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=24)
-            }
-            
-            token = jwt.encode(payload, SECRET_KEY, algorithm='HS256')
-            
-            return jsonify({
-                'success': True,
-                'message': 'Login realizado com sucesso',
-                'data': {
-                    'accessToken': token,
-                    'refreshToken': token,  # Usando o mesmo token para simplificar
-                    'usuario': {
-                        'id': 1,
-                        'email': email,
-                        'nome': 'Administrador',
-                        'is_admin': True
-                    }
-                },
-                'accessToken': token,
-                'refreshToken': token,
-                'token': token,
-                'user': {
-                    'id': 1,
-                    'email': email,
-                    'nome': 'Administrador',
-                    'is_admin': True
-                }
-            }), 200
+# Colunas do Kanban -> status do curso
+KANBAN_COLUNAS = {
+    'backlog': 'Backlog',
+    'em_desenvolvimento': 'Em Desenvolvimento',
+    'veiculado': 'Veiculado'
+}
+
+# Estados vivos (reinicializados no processo filho após um fork)
+_ESTADOS = weakref.WeakSet()
+
+class EstadoAcervo:
+    """
+    Estado de um app montado por create_app. `environ` é o ambiente com as
+    chaves ACERVO_* do app.config por cima; os repositórios começam vazios
+    e a carga dos dados fica em `carregar_dados`.
+    """
+
+    def __init__(self, environ):
+        self.environ = environ
+        # Banco SQLite opcional (ACERVO_DB): cursos, arquivos e usuários
+        # persistem e são compartilhados entre workers; sem ele, repositórios
+        # em memória
+        self.banco = SqliteDatabase(environ['ACERVO_DB']) if environ.get('ACERVO_DB') else None
+        banco = self.banco
+        # Processos que servem o app (serve.py exporta ACERVO_WORKERS;
+        # gunicorn chamado direto usa WEB_CONCURRENCY). Sem o banco, cada
+        # worker teria sua própria cópia dos repositórios: as alterações
+        # ficam desativadas (409)
+        self.processos = int(environ.get('ACERVO_WORKERS') or environ.get('WEB_CONCURRENCY') or 1)
+
+        # Repositório de usuários (lookup por email normalizado, senhas em hash scrypt)
+        self.user_store = SqliteUserStore(banco) if banco else UserStore()
+        # Pool limitado para a verificação de senha (KDF lento) nos logins
+        self.password_verifier = PasswordVerifier(
+            max_workers=int(environ.get('LOGIN_POOL_SIZE', min(4, os.cpu_count() or 1))),
+            max_pending=int(environ.get('LOGIN_POOL_PENDING', 64))
+        )
+        # Repositório indexado de cursos (status, categoria e contadores)
+        self.curso_store = SqliteCourseStore(banco) if banco else CourseStore()
+        # Repositório de arquivos (indexado por curso_id) e conteúdo em disco,
+        # no lugar do bucket S3 (ACERVO_STORAGE_DIR; padrão no diretório
+        # temporário)
+        self.arquivo_store = SqliteArquivoStore(banco) if banco else ArquivoStore()
+        self.object_store = LocalObjectStore(
+            environ.get('ACERVO_STORAGE_DIR', os.path.join(tempfile.gettempdir(), 'acervo-mock-storage'))
+        )
+        # Auditoria (espelho de logs_atividade): a requisição só registra no
+        # buffer em memória; a gravação em JSONL ou SQLite (ACERVO_AUDIT_FILE
+        # com extensão .db) é feita em lotes por uma thread.
+        # ACERVO_AUDIT_FILE vazio: só memória.
+        self.audit_log = AuditLog(open_sink(
+            environ.get('ACERVO_AUDIT_FILE', os.path.join(tempfile.gettempdir(), 'acervo-mock-audit.jsonl'))
+        )).start()
+        # Feed de mudanças do Kanban: cada alteração de curso vira um evento
+        # com versão (SSE em /api/cursos/kanban/eventos, long-poll em
+        # .../mudancas). Com o banco SQLite a versão é compartilhada entre os
+        # workers.
+        self.change_feed = ChangeFeed(colunas={status: coluna for coluna, status in KANBAN_COLUNAS.items()},
+                                      banco=banco).start()
+
+        self.cache = SimpleCache()
+        self.token_cache = SimpleCache(max_entries=10000, max_bytes=4 * 1024 * 1024)
+        self.response_cache = ResponseCache()
+        self.rate_limiter = criar_rate_limiter(environ, self.processos)
+        self.concurrency_limiter = ConcurrencyLimiter(int(environ.get('ACERVO_MAX_IN_FLIGHT', 64)))
+        # Conexões SSE no WSGI: cada uma ocupa uma thread do worker por até
+        # SSE_DURACAO_MAXIMA e fica fora do teto acima. ACERVO_SSE_MAX (0
+        # desativa; padrão: metade das threads, que serve.py exporta em
+        # ACERVO_THREADS). O app ASGI serve o SSE sem threads e não usa este
+        # teto.
+        self.sse_limiter = ConcurrencyLimiter(int(
+            environ.get('ACERVO_SSE_MAX') or max(1, int(environ.get('ACERVO_THREADS') or 8) // 2)))
+        self.metrics = criar_metricas(self)
+
+        # Carga dos dados, uma vez: na create_app (antes do fork, no preload)
+        # ou, com LAZY_LOAD/ACERVO_LAZY_LOAD, na primeira requisição
+        self.dados_lock = threading.Lock()
+        self.dados_carregados = False
+        _ESTADOS.add(self)
+
+    def reset_after_fork(self):
+        """
+        Servidores com vários workers (fork após o preload): o processo
+        filho recria locks e threads e começa suas próprias métricas
+        """
+        self.dados_lock = threading.Lock()
+        for componente in (self.cache, self.token_cache, self.curso_store, self.arquivo_store,
+                           self.object_store, self.user_store, self.password_verifier,
+                           self.response_cache, self.concurrency_limiter, self.sse_limiter):
+            componente.reset_after_fork()
+        if self.rate_limiter is not None:
+            self.rate_limiter.reset_after_fork()
+        self.audit_log.restart_after_fork()
+        self.change_feed.restart_after_fork()
+        self.metrics.reset()
+
+    def close(self):
+        """Grava a auditoria pendente, para as threads e fecha o banco"""
+        self.audit_log.stop()
+        self.change_feed.stop()
+        if self.banco is not None:
+            self.banco.close()
+
+# Componentes do app atual, para as rotas
+user_store = _do_estado('user_store')
+password_verifier = _do_estado('password_verifier')
+curso_store = _do_estado('curso_store')
+arquivo_store = _do_estado('arquivo_store')
+object_store = _do_estado('object_store')
+audit_log = _do_estado('audit_log')
+change_feed = _do_estado('change_feed')
+concurrency_limiter = _do_estado('concurrency_limiter')
+marco('repositorios')
+
+def _configuracao(config):
+    """Ambiente com as chaves ACERVO_* passadas à create_app por cima"""
+    environ = dict(os.environ)
+    environ.update((chave, str(valor)) for chave, valor in config.items()
+                   if chave.startswith('ACERVO_') and valor is not None)
+    return environ
+
+def carregar_dados(estado):
+    """
+    Usuários e cursos de exemplo ou a carga configurada (ACERVO_SEED_FILE/
+    ACERVO_SEED_SYNTHETIC). Com ACERVO_SNAPSHOT (repositórios em memória) o
+    estado vem do snapshot binário, gravado após a primeira carga normal.
+    Um banco SQLite que já tem cursos não é carregado de novo.
+    """
+    with estado.dados_lock:
+        if estado.dados_carregados:
+            return
+        environ = estado.environ
+        user_store, curso_store, arquivo_store = estado.user_store, estado.curso_store, estado.arquivo_store
+        caminho = environ.get('ACERVO_SNAPSHOT') if estado.banco is None else None
+        repositorios = {'usuarios': user_store, 'cursos': curso_store, 'arquivos': arquivo_store}
+        digital = snapshot.impressao_digital(environ) if caminho else None
+        relatorio = snapshot.load(caminho, repositorios, digital) if caminho else None
+        if relatorio is not None:
+            logger.info("Dados restaurados do snapshot", extra={'event': 'snapshot.loaded', **relatorio})
         else:
-            return jsonify({
-                'success': False,
-                'message': 'Credenciais inválidas'
-            }), 401
-            
-    except Exception as e:
-        print(f"Erro no login: {str(e)}")
-        return jsonify({
-            'success': False,
-            'message': 'Erro interno do servidor'
-        }), 500
+            user_store.seed(usuarios_mock)
+            if len(curso_store) and seed_configured(environ):
+                logger.info("Carga inicial ignorada: banco já populado", extra={'event': 'seed.skipped'})
+            else:
+                # Com uma carga configurada os cursos de exemplo dão lugar aos dados carregados
+                curso_store.seed(() if seed_configured(environ) else cursos_mock)
+                for relatorio in load_from_env(curso_store, arquivo_store, user_store, environ):
+                    logger.info("Carga inicial concluída", extra={'event': 'seed.loaded', **relatorio})
+            if caminho:
+                tamanho = snapshot.save(caminho, repositorios, digital)
+                logger.info("Snapshot gravado", extra={'event': 'snapshot.saved', 'path': caminho,
+                                                       'bytes': tamanho})
+        # Só as mudanças posteriores à carga vão para o feed do Kanban
+        curso_store.observar(estado.change_feed.curso_alterado)
+        estado.dados_carregados = True
+    marco('dados')
 
-@app.route('/api/auth/verify', methods=['GET'])
-@app.route('/api/v1/auth/verify', methods=['GET'])
-@app.route('/api/v1/auth/me', methods=['GET'])
-@log_request
-def verify_token():
-    """Verificar token de autenticação"""
-    try:
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'valid': False, 'message': 'Token não fornecido'}), 401
-        
-        token = auth_header.split(' ')[1]
-        payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
-        
-        return jsonify({
-            'valid': True,
-            'user': {
-                'id': payload['user_id'],
-                'email': payload['email'],
-                'is_admin': payload['is_admin']
-            }
-        }), 200
-        
-    except jwt.ExpiredSignatureError:
-        return jsonify({'valid': False, 'message': 'Token expirado'}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({'valid': False, 'message': 'Token inválido'}), 401
+@bp.before_app_request
+def _garantir_dados():
+    estado = estado_do_app()
+    if not estado.dados_carregados:
+        carregar_dados(estado)
 
-@app.route('/api/dashboard/stats', methods=['GET'])
-@log_request
-def dashboard_stats():
-    """Estatísticas do dashboard com cache"""
-    cache_key = "dashboard_stats"
-    
-    # Tentar recuperar do cache primeiro
-    cached_stats = cache.get(cache_key)
-    if cached_stats:
-        return jsonify(cached_stats)
-    
-    # Se não estiver no cache, calcular as estatísticas
-    stats = {
-        'total_cursos': len(cursos_mock),
-        'total_usuarios': len(usuarios_mock),
-        'cursos_ativos': len([c for c in cursos_mock if c['status'] == 'Veiculado']),
-        'cursos_desenvolvimento': len([c for c in cursos_mock if c['status'] == 'Em Desenvolvimento']),
-        'cache_info': 'Dados calculados e armazenados em cache',
-        'timestamp': datetime.datetime.now().isoformat()
-    }
-    
-    # Armazenar no cache por 2 minutos (120 segundos)
-    cache.set(cache_key, stats, ttl=120)
-    
-    return jsonify(stats)
+# Controle de admissão: token bucket por cliente (usuário do token ou IP) e
+# regra de rota, e teto global de requisições em andamento. Acima do
+# orçamento: 429 com Retry-After; acima do teto: 503 imediato, antes de a
+# requisição esperar por uma thread. ACERVO_RATE_LIMIT sobrepõe os
+# orçamentos ('login=2:10,busca=20:40', taxa por segundo:rajada; '0'
+# desativa) e ACERVO_MAX_IN_FLIGHT o teto (0 desativa).
+RATE_LIMIT_ORCAMENTOS = {
+    'login': Orcamento(2, 10),
+    'busca': Orcamento(20, 40),
+    'padrao': Orcamento(100, 200)
+}
+def criar_rate_limiter(environ, processos):
+    """RateLimiter com os orçamentos de ACERVO_RATE_LIMIT (None: desativado)"""
+    orcamentos = parse_orcamentos(environ.get('ACERVO_RATE_LIMIT'), RATE_LIMIT_ORCAMENTOS)
+    if not orcamentos:
+        return None
+    if processos > 1:
+        # Buckets por processo: cada worker fica com a sua parte do orçamento
+        # (o kernel distribui as conexões entre eles), não com o orçamento inteiro
+        orcamentos = dividir_orcamentos(orcamentos, processos)
+    return RateLimiter(orcamentos, max_buckets=int(environ.get('ACERVO_RATE_LIMIT_BUCKETS', 100000)))
 
-@app.route('/api/cursos', methods=['GET'])
-@log_request
-def listar_cursos():
-    """Listar cursos com paginação"""
-    # Parâmetros de paginação
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
-    search = request.args.get('search', '', type=str)
-    
-    # Validar parâmetros
-    if page < 1:
-        page = 1
-    if per_page < 1 or per_page > 100:
-        per_page = 10
-    
-    # Filtrar cursos se houver busca
-    filtered_cursos = cursos_mock
-    if search:
-        search_lower = search.lower()
-        filtered_cursos = [
-            curso for curso in cursos_mock 
-            if search_lower in curso['titulo'].lower() or 
-               search_lower in curso['categoria'].lower()
-        ]
-    
-    # Calcular paginação
-    total = len(filtered_cursos)
-    start = (page - 1) * per_page
-    end = start + per_page
-    cursos_paginated = filtered_cursos[start:end]
-    
-    # Calcular informações de paginação
-    total_pages = (total + per_page - 1) // per_page
-    has_next = page < total_pages
-    has_prev = page > 1
-    
-    return jsonify({
-        'data': cursos_paginated,
-        'pagination': {
-            'page': page,
-            'per_page': per_page,
-            'total': total,
-            'total_pages': total_pages,
-            'has_next': has_next,
-            'has_prev': has_prev,
-            'next_page': page + 1 if has_next else None,
-            'prev_page': page - 1 if has_prev else None
-        },
-        'search': search
-    })
+# Fora do limite: health e métricas (monitoração); fora do teto: o feed do
+# Kanban, cujas conexões ficam abertas esperando eventos
+ROTAS_SEM_LIMITE = frozenset({'/api/health', '/api/metrics'})
+ROTAS_SEM_TETO = frozenset({'/api/cursos/kanban/eventos', '/api/cursos/kanban/mudancas'})
+ROTAS_LOGIN = frozenset({'/api/auth/login', '/api/v1/auth/login'})
+LIMITE_EXCEDIDO = {'success': False, 'message': 'Muitas requisições. Tente novamente em instantes.'}
+SERVIDOR_SOBRECARREGADO = {'success': False, 'message': 'Servidor sobrecarregado. Tente novamente em instantes.'}
 
-@app.route('/api/cursos/kanban', methods=['GET'])
-def cursos_kanban():
-    """Cursos organizados por status para Kanban"""
-    kanban = {
-        'backlog': [c for c in cursos_mock if c['status'] == 'Backlog'],
-        'em_desenvolvimento': [c for c in cursos_mock if c['status'] == 'Em Desenvolvimento'],
-        'veiculado': [c for c in cursos_mock if c['status'] == 'Veiculado']
-    }
-    return jsonify(kanban)
+def regra_limite(caminho, busca=False):
+    """Regra de orçamento da rota (None: sem limite)"""
+    if caminho in ROTAS_SEM_LIMITE or not caminho.startswith('/api/'):
+        return None
+    if caminho in ROTAS_LOGIN:
+        return 'login'
+    if busca and caminho == '/api/cursos':
+        return 'busca'
+    return 'padrao'
 
-@app.route('/api/usuarios', methods=['GET'])
-def listar_usuarios():
-    """Listar usuários"""
-    return jsonify(usuarios_mock)
+def admitir(metodo, caminho, busca, authorization, endereco):
+    """
+    (recusa, vaga) de uma requisição; `caminho` é o template da regra da
+    rota (ou o path, sem regra). `recusa` é None ou (status, payload,
+    Retry-After em segundos); com `vaga` a requisição ocupa o teto de
+    concorrência até concurrency_limiter.release().
+    """
+    regra = regra_limite(caminho, busca) if metodo != 'OPTIONS' else None
+    if regra is None:
+        return None, False
+    estado = estado_do_app()
+    if estado.rate_limiter is not None:
+        # Token já verificado: o orçamento é do usuário (vários IPs); senão
+        # do IP. Aqui o token não é decodificado: tokens inválidos em massa
+        # não custam uma verificação de assinatura antes do limite
+        usuario_id = usuario_verificado(authorization) if authorization else None
+        cliente = f'u:{usuario_id}' if usuario_id is not None else endereco
+        espera = estado.rate_limiter.check(regra, cliente)
+        if espera:
+            estado.metrics.inc('acervo_rate_limited_total', (('rule', regra),))
+            return (429, LIMITE_EXCEDIDO, math.ceil(espera)), False
+    if caminho in ROTAS_SEM_TETO:
+        return None, False
+    if not estado.concurrency_limiter.try_acquire():
+        estado.metrics.inc('acervo_load_shed_total', ())
+        return (503, SERVIDOR_SOBRECARREGADO, 1), False
+    return None, True
 
-@app.route('/api/health', methods=['GET'])
-@log_request
-def health_check():
-    """Health check com informações detalhadas"""
-    try:
-        # Verificar status do cache
-        cache_stats = cache.get_stats()
-        
-        # Informações do sistema
-        health_info = {
-            'status': 'healthy',
-            'timestamp': datetime.datetime.now().isoformat(),
-            'version': '1.0.0',
-            'environment': 'development',
-            'services': {
-                'api': 'healthy',
-                'cache': 'healthy',
-                'logging': 'healthy'
-            },
-            'cache_stats': cache_stats,
-            'endpoints': {
-                'auth': 'active',
-                'dashboard': 'active',
-                'cursos': 'active',
-                'usuarios': 'active'
-            },
-            'uptime_seconds': (datetime.datetime.now() - datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)).total_seconds()
-        }
-        
-        return jsonify(health_info), 200
-        
-    except Exception as e:
-        logger.error("Health check failed", error=str(e))
-        return jsonify({
-            'status': 'unhealthy',
-            'timestamp': datetime.datetime.now().isoformat(),
-            'error': 'Health check failed',
-            'version': '1.0.0'
-        }), 500
+def resposta_recusa(recusa):
+    status, payload, retry_after = recusa
+    response = jsonify(payload)
+    response.status_code = status
+    response.headers['Retry-After'] = str(retry_after)
+    return response
 
-@app.route('/swagger', methods=['GET'])
-def swagger_ui():
-    """Swagger UI com documentação completa"""
-    html = """
+@bp.before_app_request
+def _admissao():
+    # O app ASGI já fez a admissão antes de passar a requisição ao Flask
+    if request.environ.get('acervo.admissao'):
+        return None
+    caminho = request.url_rule.rule if request.url_rule else request.path
+    recusa, g.admissao_vaga = admitir(request.method, caminho, bool(request.args.get('search')),
+                                      request.headers.get('Authorization'), request.remote_addr)
+    if recusa is not None:
+        return resposta_recusa(recusa)
+    return None
+
+@bp.teardown_app_request
+def _admissao_fim(exc):
+    if g.pop('admissao_vaga', False):
+        concurrency_limiter.release()
+
+# Servidores com vários workers (fork após o preload): cada processo filho
+# recria locks e threads dos estados e a thread de logs
+def _reinit_after_fork():
+    for estado in list(_ESTADOS):
+        estado.reset_after_fork()
+    if log_pipeline is not None:
+        log_pipeline.restart_after_fork()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+def encerrar_processo():
+    """
+    Saída de um worker do gunicorn (os._exit: os handlers de atexit não
+    rodam): grava a auditoria pendente, para as threads dos estados e
+    descarrega os logs
+    """
+    for estado in list(_ESTADOS):
+        estado.close()
+    if log_pipeline is not None:
+        log_pipeline.writer.stop()
+
+# Página de documentação (conteúdo estático, servido pelo cache de respostas)
+SWAGGER_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -446,6 +912,8 @@ def swagger_ui():
             }
             .method.get { background: #8FBF00; }
             .method.post { background: #C12D00; }
+            .method.patch { background: #E08A00; }
+            .method.delete { background: #7A1E00; }
             .status { 
                 background: #28a745; 
                 color: white; 
@@ -509,26 +977,107 @@ def swagger_ui():
             <h2>📚 Cursos</h2>
             <div class="endpoint">
                 <span class="method get">GET</span> <strong>/api/cursos</strong> <span class="status">✅ Ativo</span>
-                <div class="description">Listar todos os cursos com paginação</div>
+                <div class="description">Listar cursos com paginação (page/per_page ou cursor/limit) e filtros (search, status, categoria)</div>
             </div>
             
             <div class="endpoint">
-                <span class="method get">GET</span> <strong>/api/cursos/kanban</strong> <span class="status">✅ Ativo</span>
-                <div class="description">Cursos organizados por status (Kanban)</div>
+                <span class="method post">POST</span> <strong>/api/cursos</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Criar curso (titulo, categoria, status)</div>
             </div>
             
-            <h2>👥 Usuários</h2>
             <div class="endpoint">
-                <span class="method get">GET</span> <strong>/api/usuarios</strong> <span class="status">✅ Ativo</span>
-                <div class="description">Listar todos os usuários</div>
+                <span class="method get">GET</span> <strong>/api/cursos/{id}</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Dados de um curso</div>
+            </div>
+            
+            <div class="endpoint">
+                <span class="method patch">PUT/PATCH</span> <strong>/api/cursos/{id}</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Alterar curso (PUT: todos os campos; PATCH: só os enviados, ex. status ou coluna do Kanban)</div>
+            </div>
+            
+            <div class="endpoint">
+                <span class="method delete">DELETE</span> <strong>/api/cursos/{id}</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Excluir curso sem arquivos</div>
+            </div>
+            
+            <div class="endpoint">
+                <span class="method post">POST</span> <strong>/api/cursos/lote</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Várias operações (criar, alterar, excluir) em uma requisição</div>
+            </div>
+            
+            <div class="endpoint">
+                <span class="method get">GET</span> <strong>/api/cursos/kanban</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Cursos organizados por status (Kanban); em streaming se grande ou com Accept: application/x-ndjson</div>
+            </div>
+            
+            <div class="endpoint">
+                <span class="method get">GET</span> <strong>/api/cursos/kanban/eventos</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Mudanças do Kanban em Server-Sent Events (retoma com Last-Event-ID)</div>
+            </div>
+            
+            <div class="endpoint">
+                <span class="method get">GET</span> <strong>/api/cursos/kanban/mudancas</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Long-poll das mudanças do Kanban (since, timeout)</div>
+            </div>
+            
+            <h2>📁 Arquivos</h2>
+            <div class="endpoint">
+                <span class="method get">GET</span> <strong>/api/arquivos</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Listar arquivos com paginação (filtro opcional curso_id)</div>
+            </div>
+            
+            <div class="endpoint">
+                <span class="method get">GET</span> <strong>/api/arquivos/{id}</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Metadados de um arquivo</div>
+            </div>
+            
+            <div class="endpoint">
+                <span class="method get">GET</span> <strong>/api/arquivos/{id}/download</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Download em streaming com suporte a Range (206) e ?inline</div>
+            </div>
+            
+            <div class="endpoint">
+                <span class="method post">POST</span> <strong>/api/arquivos/curso/{curso_id}/upload</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Upload em uma requisição (multipart 'file' ou corpo bruto com ?nome=)</div>
+            </div>
+            
+            <div class="endpoint">
+                <span class="method post">POST</span> <strong>/api/arquivos/curso/{curso_id}/uploads</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Iniciar upload retomável ({nome, tamanho, tipo_mime, categoria})</div>
+            </div>
+            
+            <div class="endpoint">
+                <span class="method patch">PATCH</span> <strong>/api/arquivos/uploads/{upload_id}</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Enviar bloco a partir de Upload-Offset (HEAD/GET informa o offset atual)</div>
+            </div>
+            
+            <div class="endpoint">
+                <span class="method delete">DELETE</span> <strong>/api/arquivos/{id}</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Excluir arquivo e conteúdo</div>
+            </div>
+            
+            <h2>👥 Usuários</h2>
+            <div class="endpoint">
+                <span class="method get">GET</span> <strong>/api/usuarios</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Listar todos os usuários (array JSON ou NDJSON em streaming se grande)</div>
+            </div>
+            
+            <h2>🔍 Sistema</h2>
+            <div class="endpoint">
+                <span class="method get">GET</span> <strong>/api/auditoria</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Log de auditoria recente (filtros usuario_id, curso_id, arquivo_id, tipo_acao, desde/ate; before_id/limit)</div>
             </div>
             
-            <h2>🔍 Sistema</h2>
             <div class="endpoint">
                 <span class="method get">GET</span> <strong>/api/health</strong> <span class="status">✅ Ativo</span>
                 <div class="description">Health check com informações do sistema</div>
             </div>
             
+            <div class="endpoint">
+                <span class="method get">GET</span> <strong>/api/metrics</strong> <span class="status">✅ Ativo</span>
+                <div class="description">Métricas no formato Prometheus (contadores, latência p50/p95/p99, cache, uptime)</div>
+            </div>
+            
             <div class="credentials">
                 <h3>🔑 Credenciais de Teste</h3>
                 <p><strong>Email:</strong> admin@acervoeducacional.com</p>
@@ -565,11 +1114,1100 @@ def swagger_ui():
     </body>
     </html>
     """
-    return html
+
+# Auditoria das ações, com IP e user agent da requisição
+def usuario_verificado(auth_header):
+    """Id do usuário de um token Bearer já no cache de tokens verificados (sem decodificar)"""
+    if not auth_header or not auth_header.startswith('Bearer '):
+        return None
+    payload = token_cache.probe(hashlib.sha256(auth_header[7:].encode('utf-8')).digest())
+    if payload is None or payload.get('exp', float('inf')) <= time.time():
+        return None
+    return payload.get('user_id')
+
+def usuario_do_token(auth_header):
+    """Id do usuário de um cabeçalho Authorization Bearer com token válido"""
+    if not auth_header or not auth_header.startswith('Bearer '):
+        return None
+    try:
+        return decode_token(auth_header[7:])['user_id']
+    except jwt.InvalidTokenError:
+        return None
+
+def _usuario_da_requisicao():
+    """Id do usuário do token Bearer, se houver um token válido"""
+    return usuario_do_token(request.headers.get('Authorization', ''))
+
+# Padrão de `usuario_id`: o usuário do token da requisição. None explícito
+# (token recusado, login sem sucesso) não decodifica o token de novo
+_DA_REQUISICAO = object()
+
+def _auditar(tipo_acao, descricao, usuario_id=_DA_REQUISICAO, **campos):
+    if usuario_id is _DA_REQUISICAO:
+        usuario_id = _usuario_da_requisicao()
+    audit_log.record(tipo_acao, descricao, usuario_id=usuario_id,
+                     endereco_ip=request.remote_addr,
+                     user_agent=request.user_agent.string or None, **campos)
+
+@bp.route('/api/auth/login', methods=['POST', 'OPTIONS'])
+@bp.route('/api/v1/auth/login', methods=['POST', 'OPTIONS'])
+@log_request
+def login():
+    """Realizar login no sistema"""
+    # Responder a requisições OPTIONS (preflight)
+    if request.method == 'OPTIONS':
+        response = jsonify({'status': 'ok'})
+        response.headers.add('Access-Control-Allow-Origin', '*')
+        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization,Accept')
+        response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
+        return response
+        
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'Dados não fornecidos'
+            }), 400
+        
+        email = normalize_email(data.get('email', ''))
+        senha = data.get('password', '')
+        
+        logger.info("Tentativa de login", extra={'event': 'auth.login', 'email': email})
+        
+        # Verificar credenciais: lookup O(1) e KDF no pool dedicado. Email
+        # desconhecido também paga o custo do hash (DUMMY_HASH).
+        usuario = user_store.get_by_email(email)
+        password_hash = usuario['password_hash'] if usuario else dummy_hash()
+        try:
+            senha_ok = password_verifier.verify(password_hash, senha)
+        except (VerifierBusy, FuturesTimeoutError):
+            response = jsonify({
+                'success': False,
+                'message': 'Serviço de autenticação ocupado, tente novamente'
+            })
+            response.headers['Retry-After'] = '1'
+            return response, 503
+        
+        if usuario and senha_ok and usuario.get('is_active', True):
+            # Gerar token JWT
+            payload = {
+                'user_id': usuario['id'],
+                'email': usuario['email'],
+                'is_admin': usuario['is_admin'],
+                'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=24)
+            }
+            
+            token = jwt.encode(payload, SECRET_KEY, algorithm='HS256')
+            _auditar('Login', 'Login realizado com sucesso', usuario_id=usuario['id'])
+            
+            return jsonify({
+                'success': True,
+                'message': 'Login realizado com sucesso',
+                'data': {
+                    'accessToken': token,
+                    'refreshToken': token,  # Usando o mesmo token para simplificar
+                    'usuario': UserStore.public(usuario)
+                },
+                'accessToken': token,
+                'refreshToken': token,
+                'token': token,
+                'user': UserStore.public(usuario)
+            }), 200
+        else:
+            _auditar('Login', f'Falha de login para {email}',
+                     usuario_id=usuario['id'] if usuario else None)
+            return jsonify({
+                'success': False,
+                'message': 'Credenciais inválidas'
+            }), 401
+            
+    except Exception:
+        logger.exception("Erro no login", extra={'event': 'auth.login_error'})
+        return jsonify({
+            'success': False,
+            'message': 'Erro interno do servidor'
+        }), 500
+
+@bp.route('/api/auth/verify', methods=['GET'])
+@bp.route('/api/v1/auth/verify', methods=['GET'])
+@bp.route('/api/v1/auth/me', methods=['GET'])
+@log_request
+def verify_token():
+    """Verificar token de autenticação"""
+    try:
+        auth_header = request.headers.get('Authorization')
+        if not auth_header or not auth_header.startswith('Bearer '):
+            return jsonify({'valid': False, 'message': 'Token não fornecido'}), 401
+        
+        token = auth_header.split(' ')[1]
+        payload = decode_token(token)
+        _auditar('VerificacaoToken', 'Token verificado', usuario_id=payload['user_id'])
+        
+        return jsonify({
+            'valid': True,
+            'user': {
+                'id': payload['user_id'],
+                'email': payload['email'],
+                'is_admin': payload['is_admin']
+            }
+        }), 200
+        
+    except jwt.ExpiredSignatureError:
+        _auditar('VerificacaoToken', 'Token expirado', usuario_id=None)
+        return jsonify({'valid': False, 'message': 'Token expirado'}), 401
+    except jwt.InvalidTokenError:
+        _auditar('VerificacaoToken', 'Token inválido', usuario_id=None)
+        return jsonify({'valid': False, 'message': 'Token inválido'}), 401
+
+# A chave inclui a versão dos dados: uma mutação invalida na hora. Sem
+# mutações, frescas por 2 minutos e por mais 1 minuto o valor anterior é
+# servido enquanto um único refresh recalcula em segundo plano
+DASHBOARD_TTL = 120
+DASHBOARD_STALE_TTL = 60
+
+@bp.route('/api/dashboard/stats', methods=['GET'])
+@log_request
+def dashboard_stats():
+    """Estatísticas do dashboard com cache (single-flight + stale-while-revalidate)"""
+    # O refresh em segundo plano roda em outra thread, fora do contexto do app
+    app = current_app._get_current_object()
+    stats = cache.get_or_compute(chave_dashboard(), partial(_calcular_no_app, app), ttl=DASHBOARD_TTL,
+                                 stale_ttl=DASHBOARD_STALE_TTL)
+    return jsonify(stats)
+
+def versao_dados():
+    """
+    Versão global dos dados do dashboard: sobe a cada mutação de cursos
+    ou usuários (as versões dos repositórios são incrementais)
+    """
+    return f'{curso_store.version}.{user_store.version}'
+
+def chave_dashboard():
+    return f'dashboard_stats:{versao_dados()}'
+
+# Consultas independentes do dashboard (o app ASGI as executa em paralelo)
+DASHBOARD_CONSULTAS = {
+    'total_cursos': lambda: len(curso_store),
+    'total_usuarios': lambda: len(user_store),
+    'cursos_ativos': lambda: curso_store.count_by_status('Veiculado'),
+    'cursos_desenvolvimento': lambda: curso_store.count_by_status('Em Desenvolvimento')
+}
+
+def montar_dashboard_stats(valores):
+    """Payload do dashboard a partir dos resultados de DASHBOARD_CONSULTAS"""
+    return dict(valores,
+                cache_info='Dados calculados e armazenados em cache',
+                timestamp=datetime.datetime.now().isoformat())
+
+def _calcular_dashboard_stats():
+    """Estatísticas a partir dos contadores do repositório, O(1)"""
+    return montar_dashboard_stats({nome: consulta() for nome, consulta in DASHBOARD_CONSULTAS.items()})
+
+def _calcular_no_app(app):
+    with app.app_context():
+        return _calcular_dashboard_stats()
+
+# Paginação por cursor (keyset): token opaco com o último id entregue e
+# uma assinatura dos filtros, para não ser reaproveitado em outra consulta
+def _filtros_assinatura(*filtros):
+    return format(zlib.crc32(json.dumps(filtros).encode('utf-8')), '08x')
+
+def encode_cursor(last_id, assinatura):
+    raw = json.dumps({'id': last_id, 'f': assinatura}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, assinatura):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        data = json.loads(raw)
+        if data['f'] != assinatura:
+            return None
+        return data['id']
+    except (ValueError, KeyError, TypeError):
+        return None
+
+@bp.route('/api/cursos', methods=['GET'])
+@log_request
+def listar_cursos():
+    """Listar cursos com paginação (page/per_page ou cursor/limit)"""
+    # Parâmetros de paginação
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
+    search = request.args.get('search', '', type=str)
+    status = request.args.get('status', type=str)
+    categoria = request.args.get('categoria', type=str)
+    cursor = request.args.get('cursor', type=str)
+    assinatura = _filtros_assinatura(search, status, categoria)
+    
+    # Validar parâmetros
+    if page < 1:
+        page = 1
+    if per_page < 1 or per_page > 100:
+        per_page = 10
+    
+    # Filtros indexados (status/categoria) e busca no índice invertido
+    if search:
+        ids = curso_store.search(search, status=status, categoria=categoria)
+    else:
+        ids = curso_store.ids(status=status, categoria=categoria)
+    
+    if cursor is not None:
+        return _listar_cursos_cursor(ids, cursor, assinatura, search)
+    
+    # Calcular paginação (apenas a página pedida é materializada)
+    total = len(ids)
+    start = (page - 1) * per_page
+    cursos_paginated = curso_store.page(start, per_page, ids)
+    
+    # Calcular informações de paginação
+    total_pages = (total + per_page - 1) // per_page
+    has_next = page < total_pages
+    has_prev = page > 1
+    
+    # Sem busca a ordem é por id, então a página também pode seguir por cursor
+    next_cursor = None
+    if has_next and cursos_paginated and not search:
+        next_cursor = encode_cursor(cursos_paginated[-1]['id'], assinatura)
+    
+    return jsonify({
+        'data': cursos_paginated,
+        'pagination': {
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'total_pages': total_pages,
+            'has_next': has_next,
+            'has_prev': has_prev,
+            'next_page': page + 1 if has_next else None,
+            'prev_page': page - 1 if has_prev else None
+        },
+        'next_cursor': next_cursor,
+        'search': search
+    })
+
+def _listar_cursos_cursor(ids, cursor, assinatura, search):
+    """Modo cursor: ordem estável por id, retomada via bisect no índice"""
+    limit = request.args.get('limit', request.args.get('per_page', 10, type=int), type=int)
+    if limit < 1 or limit > 100:
+        limit = 10
+    
+    # Cursor vazio inicia a primeira página
+    after_id = None
+    if cursor:
+        after_id = decode_cursor(cursor, assinatura)
+        if after_id is None:
+            return jsonify({
+                'success': False,
+                'message': 'Cursor inválido'
+            }), 400
+    
+    # A busca é ordenada por relevância; no modo cursor a ordem é por id
+    if search:
+        ids = sorted(ids)
+    
+    page_ids = curso_store.ids_after(ids, after_id, limit + 1)
+    has_next = len(page_ids) > limit
+    cursos_paginated = curso_store.page(0, limit, page_ids)
+    next_cursor = encode_cursor(cursos_paginated[-1]['id'], assinatura) if has_next else None
+    
+    return jsonify({
+        'data': cursos_paginated,
+        'pagination': {
+            'per_page': limit,
+            'limit': limit,
+            'total': len(ids),
+            'has_next': has_next,
+            'has_prev': after_id is not None,
+            'cursor': cursor or None,
+            'next_cursor': next_cursor
+        },
+        'next_cursor': next_cursor,
+        'search': search
+    })
+
+# Coleções grandes em streaming: acima de STREAM_MINIMO itens (ou com
+# Accept: application/x-ndjson) o corpo é gerado em blocos a partir dos
+# repositórios, lidos em lotes, em vez de montado inteiro (e cacheado) em
+# memória. Comprimido em gzip no caminho se o cliente aceitar.
+STREAM_MINIMO = int(os.environ.get('ACERVO_JSON_STREAM_MIN', 2000))
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def pede_ndjson():
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def resposta_streaming(blocos, mimetype):
+    headers = {'Cache-Control': 'no-cache', 'Vary': 'Accept, Accept-Encoding'}
+    if request.accept_encodings['gzip']:
+        blocos = gzip_stream(blocos)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(blocos, mimetype=mimetype, headers=headers)
+
+def resposta_colecao(itens):
+    """Array JSON (ou NDJSON) em streaming de um iterável de registros"""
+    dumps = current_app.json.codec.dumps
+    if pede_ndjson():
+        return resposta_streaming(ndjson(itens, dumps), NDJSON_MIMETYPE)
+    return resposta_streaming(array_json(itens, dumps), 'application/json')
+
+@bp.route('/api/cursos/kanban', methods=['GET'])
+def cursos_kanban():
+    """Cursos organizados por status para Kanban"""
+    if pede_ndjson() or len(curso_store) > STREAM_MINIMO:
+        return kanban_streaming()
+    return _kanban_cache()
+
+@resposta_cacheada('kanban', lambda: curso_store.version)
+def _kanban_cache():
+    kanban = {coluna: curso_store.by_status(status) for coluna, status in KANBAN_COLUNAS.items()}
+    return jsonify(kanban)
+
+def kanban_streaming():
+    """Kanban em blocos; em NDJSON uma linha por curso, na ordem das colunas"""
+    dumps = current_app.json.codec.dumps
+    # Os geradores rodam depois do fim do contexto da requisição
+    store = curso_store._get_current_object()
+    if pede_ndjson():
+        cursos = (curso for status in KANBAN_COLUNAS.values()
+                  for curso in store.iter_by_status(status))
+        return resposta_streaming(ndjson(cursos, dumps), NDJSON_MIMETYPE)
+    colunas = ((coluna, store.iter_by_status(status))
+               for coluna, status in sorted(KANBAN_COLUNAS.items()))
+    return resposta_streaming(objeto_json(colunas, dumps), 'application/json')
+
+# Conexões SSE: intervalo do comentário keep-alive (proxies fecham conexões
+# mudas), prazo de reconexão sugerido ao EventSource e duração máxima (no
+# WSGI cada conexão ocupa uma thread; o cliente reconecta com Last-Event-ID)
+SSE_HEARTBEAT = 15
+SSE_RETRY_MS = 3000
+SSE_DURACAO_MAXIMA = 300
+LONG_POLL_TIMEOUT_MAXIMO = 55
+
+SSE_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+def parametros_feed(last_event_id, since, timeout=None):
+    """
+    (versão de retomada, timeout do long-poll) a partir de Last-Event-ID,
+    ?since= e ?timeout=; ValueError se inválidos
+    """
+    desde = parse_versao(last_event_id or since)
+    timeout = max(0.0, min(float(timeout or 25), LONG_POLL_TIMEOUT_MAXIMO))
+    return desde, timeout
+
+def montar_mudancas(desde, eventos, reset):
+    """Resposta do long-poll: eventos e a versão de onde o cliente continua"""
+    return {
+        'success': True,
+        'version': eventos[-1]['version'] if eventos else (change_feed.version if desde is None else desde),
+        'eventos': eventos,
+        'reset': reset
+    }
+
+FEED_PARAMETRO_INVALIDO = {'success': False, 'message': 'Versão ou timeout inválido'}
+SSE_LOTADO = {'success': False, 'message': 'Limite de conexões SSE atingido; use o long-poll '
+                                           '/api/cursos/kanban/mudancas'}
+
+@bp.route('/api/cursos/kanban/eventos', methods=['GET'])
+def kanban_eventos():
+    """
+    Mudanças do Kanban em Server-Sent Events. Um cliente novo recebe o
+    marcador `sync` com a versão atual e depois só as mudanças; quem
+    reconecta retoma do Last-Event-ID ou recebe `reset` (recarregar o
+    Kanban) se ficou para trás. Acima do teto de conexões SSE: 503 com
+    Retry-After (o cliente pode passar ao long-poll).
+    """
+    try:
+        desde, _ = parametros_feed(request.headers.get('Last-Event-ID'), request.args.get('since'))
+    except ValueError:
+        return jsonify(FEED_PARAMETRO_INVALIDO), 400
+
+    limiter = estado_do_app().sse_limiter
+    if not limiter.try_acquire():
+        metrics.inc('acervo_load_shed_total', ())
+        return resposta_recusa((503, SSE_LOTADO, SSE_RETRY_MS // 1000))
+    feed = change_feed._get_current_object()
+
+    def gerar():
+        feed.conectar()
+        try:
+            cursor = desde
+            yield f'retry: {SSE_RETRY_MS}\n\n'
+            if cursor is None:
+                evento = marcador('sync', feed.version)
+                cursor = evento['version']
+                yield formatar_sse(evento)
+            fim = time.monotonic() + SSE_DURACAO_MAXIMA
+            while (restante := fim - time.monotonic()) > 0:
+                eventos, _ = feed.esperar(cursor, min(SSE_HEARTBEAT, restante))
+                if not eventos:
+                    yield ': keep-alive\n\n'
+                    continue
+                cursor = eventos[-1]['version']
+                yield ''.join(formatar_sse(evento) for evento in eventos)
+        finally:
+            feed.desconectar()
+
+    response = Response(gerar(), mimetype='text/event-stream', headers=SSE_HEADERS)
+    # A vaga é liberada quando o servidor fecha a resposta, mesmo se o
+    # gerador nem chegou a rodar
+    response.call_on_close(limiter.release)
+    return response
+
+@bp.route('/api/cursos/kanban/mudancas', methods=['GET'])
+@log_request
+def kanban_mudancas():
+    """
+    Long-poll das mudanças do Kanban (alternativa ao SSE): responde assim
+    que houver eventos após ?since= ou, sem mudanças, ao fim de ?timeout=
+    segundos (padrão 25). Sem since devolve só a versão atual.
+    """
+    try:
+        desde, timeout = parametros_feed(request.headers.get('Last-Event-ID'), request.args.get('since'),
+                                         request.args.get('timeout'))
+    except ValueError:
+        return jsonify(FEED_PARAMETRO_INVALIDO), 400
+    eventos, reset = change_feed.esperar(desde, timeout)
+    return jsonify(montar_mudancas(desde, eventos, reset))
+
+# Edição de cursos: o repositório atualiza na mesma operação os índices
+# por status (colunas do Kanban) e os contadores do dashboard, e sobe a
+# versão que invalida as respostas derivadas (Kanban, dashboard)
+CURSO_CAMPOS_EDITAVEIS = ('titulo', 'categoria', 'status')
+LOTE_MAXIMO = 1000
+
+ESTADO_NAO_COMPARTILHADO = {
+    'success': False,
+    'message': 'Alterações exigem ACERVO_DB quando o servidor roda com vários workers'
+}
+
+def requer_estado_compartilhado(f):
+    """
+    Rotas que alteram os repositórios: com vários processos e repositórios
+    em memória a alteração chegaria só ao worker que atendeu (Kanban,
+    dashboard e feed divergiriam entre workers)
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        estado = estado_do_app()
+        if estado.banco is None and estado.processos > 1:
+            return jsonify(ESTADO_NAO_COMPARTILHADO), 409
+        return f(*args, **kwargs)
+    return decorated_function
+
+def _curso_nao_encontrado():
+    return jsonify({'success': False, 'message': 'Curso não encontrado'}), 404
+
+def _validar_curso(dados, obrigatorios=()):
+    """
+    (campos, None) ou (None, mensagem de erro) para o corpo de uma criação
+    ou edição. Aceita `coluna` do Kanban no lugar de `status`.
+    """
+    if not isinstance(dados, dict):
+        return None, 'Corpo JSON inválido'
+    if 'coluna' in dados and 'status' not in dados:
+        if dados['coluna'] not in KANBAN_COLUNAS:
+            return None, f"Coluna inválida; use uma de: {', '.join(KANBAN_COLUNAS)}"
+        dados = dict(dados, status=KANBAN_COLUNAS[dados['coluna']])
+    campos = {}
+    for campo in CURSO_CAMPOS_EDITAVEIS:
+        if campo not in dados:
+            if campo in obrigatorios:
+                return None, f'Campo obrigatório: {campo}'
+            continue
+        valor = dados[campo]
+        if not isinstance(valor, str) or not valor.strip():
+            return None, f'Campo inválido: {campo}'
+        campos[campo] = valor.strip()
+    if 'status' in campos and campos['status'] not in KANBAN_COLUNAS.values():
+        return None, f"Status inválido; use um de: {', '.join(KANBAN_COLUNAS.values())}"
+    if not campos:
+        return None, 'Nenhum campo para alterar'
+    return campos, None
+
+def _validar_exclusao(curso_id):
+    """Mensagem de erro (ou None): cursos com arquivos não são excluídos"""
+    if arquivo_store.ids(curso_id):
+        return 'Curso possui arquivos; exclua-os antes'
+    return None
+
+def _auditar_curso(anterior, novo, usuario_id=_DA_REQUISICAO):
+    """Evento de auditoria de uma mutação de curso (criação, edição, movimentação, exclusão)"""
+    if anterior is None:
+        _auditar('CriacaoCurso', f'Criação de {novo.titulo}', usuario_id=usuario_id,
+                 curso_id=novo.id, dados_novos=novo.to_dict())
+    elif novo is None:
+        _auditar('ExclusaoCurso', f'Exclusão de {anterior.titulo}', usuario_id=usuario_id,
+                 curso_id=anterior.id, dados_anteriores=anterior.to_dict())
+    elif anterior.status != novo.status:
+        _auditar('MovimentacaoStatus', f'{novo.titulo}: {anterior.status} -> {novo.status}',
+                 usuario_id=usuario_id, curso_id=novo.id,
+                 dados_anteriores=anterior.to_dict(), dados_novos=novo.to_dict())
+    else:
+        _auditar('EdicaoCurso', f'Edição de {novo.titulo}', usuario_id=usuario_id,
+                 curso_id=novo.id, dados_anteriores=anterior.to_dict(), dados_novos=novo.to_dict())
+
+@bp.route('/api/cursos', methods=['POST'])
+@log_request
+@requer_estado_compartilhado
+def criar_curso():
+    """Criar um curso (titulo e categoria obrigatórios; status padrão Backlog)"""
+    campos, erro = _validar_curso(request.get_json(silent=True), obrigatorios=('titulo', 'categoria'))
+    if erro:
+        return jsonify({'success': False, 'message': erro}), 400
+    campos.setdefault('status', 'Backlog')
+    curso = curso_store.add(campos)
+    _auditar_curso(None, curso)
+    response = jsonify({'success': True, 'data': curso})
+    response.headers['Location'] = f'/api/cursos/{curso.id}'
+    return response, 201
+
+@bp.route('/api/cursos/<int:curso_id>', methods=['GET'])
+@log_request
+def obter_curso(curso_id):
+    """Dados de um curso"""
+    curso = curso_store.get(curso_id)
+    if curso is None:
+        return _curso_nao_encontrado()
+    return jsonify({'success': True, 'data': curso})
+
+@bp.route('/api/cursos/<int:curso_id>', methods=['PUT', 'PATCH'])
+@log_request
+@requer_estado_compartilhado
+def alterar_curso(curso_id):
+    """
+    Alterar um curso: PUT substitui titulo, categoria e status; PATCH altera
+    só os campos enviados (ex.: mover no Kanban com {"status"} ou {"coluna"})
+    """
+    obrigatorios = CURSO_CAMPOS_EDITAVEIS if request.method == 'PUT' else ()
+    campos, erro = _validar_curso(request.get_json(silent=True), obrigatorios=obrigatorios)
+    if erro:
+        return jsonify({'success': False, 'message': erro}), 400
+    resultado = curso_store.update(curso_id, campos)
+    if resultado is None:
+        return _curso_nao_encontrado()
+    _auditar_curso(*resultado)
+    return jsonify({'success': True, 'data': resultado[1]})
+
+@bp.route('/api/cursos/<int:curso_id>', methods=['DELETE'])
+@log_request
+@requer_estado_compartilhado
+def excluir_curso(curso_id):
+    """Excluir um curso sem arquivos"""
+    erro = _validar_exclusao(curso_id)
+    if erro:
+        return jsonify({'success': False, 'message': erro}), 409
+    curso = curso_store.remove(curso_id)
+    if curso is None:
+        return _curso_nao_encontrado()
+    _auditar_curso(curso, None)
+    return jsonify({'success': True, 'data': True})
+
+@bp.route('/api/cursos/lote', methods=['POST'])
+@log_request
+@requer_estado_compartilhado
+def lote_cursos():
+    """
+    Várias mutações em uma requisição: {"operacoes": [{"acao": "criar" |
+    "alterar" | "excluir", "id": ..., "dados": {...}}]}. O lote é validado
+    por inteiro antes de aplicar qualquer operação (400 com o índice da
+    inválida); curso inexistente falha só a própria operação.
+    """
+    data = request.get_json(silent=True) or {}
+    operacoes = data.get('operacoes')
+    if not isinstance(operacoes, list) or not operacoes:
+        return jsonify({'success': False, 'message': 'Informe a lista operacoes'}), 400
+    if len(operacoes) > LOTE_MAXIMO:
+        return jsonify({'success': False, 'message': f'Máximo de {LOTE_MAXIMO} operações por lote'}), 400
+    
+    lote = []
+    for indice, operacao in enumerate(operacoes):
+        erro = None
+        acao = operacao.get('acao') if isinstance(operacao, dict) else None
+        curso_id = operacao.get('id') if isinstance(operacao, dict) else None
+        if acao == 'criar':
+            campos, erro = _validar_curso(operacao.get('dados'), obrigatorios=('titulo', 'categoria'))
+            if campos is not None:
+                lote.append(('add', dict({'status': 'Backlog'}, **campos)))
+        elif acao in ('alterar', 'excluir'):
+            if type(curso_id) is not int:
+                erro = 'Informe o id do curso'
+            elif acao == 'alterar':
+                campos, erro = _validar_curso(operacao.get('dados'))
+                lote.append(('update', curso_id, campos))
+            else:
+                erro = _validar_exclusao(curso_id)
+                lote.append(('remove', curso_id))
+        else:
+            erro = 'Ação inválida; use criar, alterar ou excluir'
+        if erro:
+            return jsonify({'success': False, 'message': f'Operação {indice}: {erro}', 'indice': indice}), 400
+    
+    usuario_id = _usuario_da_requisicao()
+    resultados = []
+    for operacao, resultado in zip(lote, curso_store.apply_batch(lote)):
+        if resultado is None:
+            resultados.append({'id': operacao[1], 'success': False, 'message': 'Curso não encontrado'})
+            continue
+        if operacao[0] == 'add':
+            anterior, novo = None, resultado
+        elif operacao[0] == 'update':
+            anterior, novo = resultado
+        else:
+            anterior, novo = resultado, None
+        _auditar_curso(anterior, novo, usuario_id=usuario_id)
+        resultados.append({'id': (novo or anterior).id, 'success': True, 'data': novo})
+    return jsonify({
+        'success': True,
+        'data': resultados,
+        'aplicadas': sum(1 for r in resultados if r['success'])
+    })
+
+@bp.route('/api/usuarios', methods=['GET'])
+def listar_usuarios():
+    """Listar usuários"""
+    if pede_ndjson() or len(user_store) > STREAM_MINIMO:
+        return resposta_colecao(user_store.iter_public())
+    return _usuarios_cache()
+
+@resposta_cacheada('usuarios', lambda: user_store.version)
+def _usuarios_cache():
+    return jsonify(user_store.public_list())
+
+# Arquivos: metadados no ArquivoStore, conteúdo no armazenamento local
+def _arquivo_nao_encontrado():
+    return jsonify({'success': False, 'message': 'Arquivo não encontrado'}), 404
+
+def _novo_arquivo(curso_id, nome, categoria, tipo_mime, tamanho, key):
+    """
+    Registrar um arquivo enviado. Só o ArquivoStore guarda os metadados:
+    vários workers exigem ACERVO_DB (ver `requer_estado_compartilhado`).
+    """
+    return arquivo_store.add({
+        'curso_id': curso_id,
+        'nome': nome,
+        'nome_armazenamento': key,
+        'categoria': categoria,
+        'tipo_mime': tipo_mime or 'application/octet-stream',
+        'tamanho': tamanho,
+        'url_s3': object_store.url(key),
+        'is_publico': False
+    })
+
+def _validar_upload(curso_id, categoria):
+    """Mensagem de erro (ou None) para o destino de um upload"""
+    if curso_store.get(curso_id) is None:
+        return 'Curso não encontrado', 404
+    if categoria not in CATEGORIAS_ARQUIVO:
+        return f"Categoria inválida; use uma de: {', '.join(CATEGORIAS_ARQUIVO)}", 400
+    return None
+
+def _chave_objeto(curso_id, nome):
+    return f'cursos/{curso_id}/{secrets.token_hex(8)}-{nome_seguro(nome)}'
+
+@bp.route('/api/arquivos', methods=['GET'])
+@log_request
+def listar_arquivos():
+    """Listar arquivos com paginação (opcionalmente de um curso)"""
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
+    curso_id = request.args.get('curso_id', type=int)
+    
+    if page < 1:
+        page = 1
+    if per_page < 1 or per_page > 100:
+        per_page = 10
+    
+    ids = arquivo_store.ids(curso_id)
+    total = len(ids)
+    total_pages = (total + per_page - 1) // per_page
+    
+    return jsonify({
+        'data': arquivo_store.page((page - 1) * per_page, per_page, ids),
+        'pagination': {
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'total_pages': total_pages,
+            'has_next': page < total_pages,
+            'has_prev': page > 1
+        }
+    })
+
+@bp.route('/api/arquivos/curso/<int:curso_id>', methods=['GET'])
+@log_request
+def listar_arquivos_curso(curso_id):
+    """Arquivos de um curso"""
+    return jsonify({'success': True, 'data': arquivo_store.by_curso(curso_id)})
+
+@bp.route('/api/arquivos/<int:arquivo_id>', methods=['GET'])
+@log_request
+def obter_arquivo(arquivo_id):
+    """Metadados de um arquivo"""
+    arquivo = arquivo_store.get(arquivo_id)
+    if arquivo is None:
+        return _arquivo_nao_encontrado()
+    return jsonify({'success': True, 'data': arquivo})
+
+@bp.route('/api/arquivos/<int:arquivo_id>/download', methods=['GET'])
+@log_request
+def download_arquivo(arquivo_id):
+    """
+    Conteúdo do arquivo em streaming, com Range/206 e If-Range (ETag e
+    Last-Modified). Em servidores com wsgi.file_wrapper (gunicorn) o corpo
+    completo sai via sendfile, sem passar pelo Python.
+    """
+    arquivo = arquivo_store.get(arquivo_id)
+    if arquivo is None:
+        return _arquivo_nao_encontrado()
+    if not arquivo.nome_armazenamento or not object_store.exists(arquivo.nome_armazenamento):
+        return jsonify({'success': False, 'message': 'Conteúdo do arquivo não disponível'}), 404
+    
+    # O file_wrapper do gunicorn não é "seekable": com Range o Werkzeug leria
+    # o arquivo desde o início até o offset. Nesse caso usa o wrapper padrão,
+    # que posiciona com seek().
+    environ = request.environ
+    if 'HTTP_RANGE' in environ:
+        environ = {k: v for k, v in environ.items() if k != 'wsgi.file_wrapper'}
+    
+    response = send_file(
+        object_store.path(arquivo.nome_armazenamento),
+        environ,
+        mimetype=arquivo.tipo_mime,
+        as_attachment=request.args.get('inline') is None,
+        download_name=arquivo.nome,
+        conditional=True,
+        max_age=0,
+        response_class=current_app.response_class
+    )
+    
+    # Um evento por download; 304 e continuações com Range (seek do player)
+    # não contam
+    if response.status_code != 304 and environ.get('HTTP_RANGE', 'bytes=0-').startswith('bytes=0-'):
+        _auditar('DownloadArquivo', f'Download de {arquivo.nome}', curso_id=arquivo.curso_id,
+                 arquivo_id=arquivo.id)
+    return response
+
+@bp.route('/api/arquivos/curso/<int:curso_id>/upload', methods=['POST'])
+@log_request
+@requer_estado_compartilhado
+def upload_arquivo(curso_id):
+    """
+    Upload em uma requisição: multipart (campo 'file') ou corpo bruto com o
+    nome em ?nome= ou X-File-Name. O corpo é gravado em blocos.
+    """
+    categoria = request.args.get('categoria') or request.form.get('categoria') or 'OutrosArquivos'
+    erro = _validar_upload(curso_id, categoria)
+    if erro:
+        return jsonify({'success': False, 'message': erro[0]}), erro[1]
+    
+    if request.mimetype == 'multipart/form-data':
+        enviado = request.files.get('file')
+        if enviado is None:
+            return jsonify({'success': False, 'message': "Campo 'file' não enviado"}), 400
+        nome, tipo_mime, stream = enviado.filename, enviado.mimetype, enviado.stream
+    else:
+        nome = request.args.get('nome') or request.headers.get('X-File-Name')
+        tipo_mime, stream = request.mimetype, request.stream
+    if not nome:
+        return jsonify({'success': False, 'message': 'Nome do arquivo não informado'}), 400
+    
+    key = _chave_objeto(curso_id, nome)
+    tamanho = object_store.put_stream(key, stream)
+    arquivo = _novo_arquivo(curso_id, nome, categoria, tipo_mime, tamanho, key)
+    _auditar('UploadArquivo', f'Upload de {nome}', curso_id=curso_id, arquivo_id=arquivo.id,
+             dados_novos=arquivo.to_dict())
+    logger.info("Upload concluído", extra={'event': 'arquivo.upload', 'arquivo_id': arquivo.id,
+                                           'curso_id': curso_id, 'tamanho': tamanho})
+    return jsonify({'success': True, 'data': arquivo}), 201
+
+# Upload retomável (no estilo do protocolo tus): POST cria a sessão, PATCH
+# envia blocos a partir de Upload-Offset, HEAD/GET informa onde parou
+@bp.route('/api/arquivos/curso/<int:curso_id>/uploads', methods=['POST'])
+@log_request
+@requer_estado_compartilhado
+def iniciar_upload(curso_id):
+    """Iniciar upload retomável: JSON {nome, tamanho, tipo_mime, categoria}"""
+    data = request.get_json(silent=True) or {}
+    categoria = data.get('categoria') or 'OutrosArquivos'
+    erro = _validar_upload(curso_id, categoria)
+    if erro:
+        return jsonify({'success': False, 'message': erro[0]}), erro[1]
+    
+    nome = data.get('nome')
+    tamanho = data.get('tamanho', request.headers.get('Upload-Length'))
+    try:
+        tamanho = int(tamanho)
+    except (TypeError, ValueError):
+        tamanho = -1
+    if not nome or tamanho < 0:
+        return jsonify({'success': False, 'message': 'Informe nome e tamanho'}), 400
+    
+    upload_id = object_store.create_upload(_chave_objeto(curso_id, nome), tamanho, {
+        'curso_id': curso_id,
+        'nome': nome,
+        'categoria': categoria,
+        'tipo_mime': data.get('tipo_mime')
+    })
+    location = f'/api/arquivos/uploads/{upload_id}'
+    response = jsonify({'success': True, 'upload_id': upload_id, 'offset': 0,
+                        'tamanho': tamanho, 'upload_url': location})
+    response.headers.update({'Location': location, 'Upload-Offset': '0',
+                             'Upload-Length': str(tamanho)})
+    return response, 201
+
+@bp.route('/api/arquivos/uploads/<upload_id>', methods=['GET'])
+@log_request
+def status_upload(upload_id):
+    """Offset atual de um upload (HEAD devolve só os cabeçalhos)"""
+    try:
+        estado = object_store.upload_status(upload_id)
+    except UploadNotFound:
+        return jsonify({'success': False, 'message': 'Upload não encontrado'}), 404
+    response = jsonify({'success': True, 'upload_id': upload_id, 'offset': estado['offset'],
+                        'tamanho': estado['length']})
+    response.headers.update({'Upload-Offset': str(estado['offset']),
+                             'Upload-Length': str(estado['length']),
+                             'Cache-Control': 'no-store'})
+    return response
+
+@bp.route('/api/arquivos/uploads/<upload_id>', methods=['PATCH'])
+@log_request
+@requer_estado_compartilhado
+def enviar_bloco_upload(upload_id):
+    """
+    Enviar um bloco a partir do offset em Upload-Offset. Offset divergente
+    responde 409 com o offset correto; o último bloco conclui o upload e
+    registra o arquivo (201).
+    """
+    offset = request.headers.get('Upload-Offset', type=int)
+    if offset is None:
+        return jsonify({'success': False, 'message': 'Cabeçalho Upload-Offset obrigatório'}), 400
+    try:
+        estado = object_store.append_upload(upload_id, offset, request.stream)
+    except UploadNotFound:
+        return jsonify({'success': False, 'message': 'Upload não encontrado'}), 404
+    except UploadOffsetMismatch as e:
+        response = jsonify({'success': False, 'message': str(e), 'offset': e.offset})
+        response.headers['Upload-Offset'] = str(e.offset)
+        return response, 409
+    
+    if estado['offset'] < estado['length']:
+        return Response(status=204, headers={'Upload-Offset': str(estado['offset'])})
+    
+    try:
+        estado = object_store.complete_upload(upload_id)
+    except (UploadNotFound, UploadOffsetMismatch):
+        # Outra requisição concluiu o mesmo upload
+        return jsonify({'success': False, 'message': 'Upload já concluído'}), 409
+    meta = estado['metadata']
+    arquivo = _novo_arquivo(meta['curso_id'], meta['nome'], meta['categoria'], meta.get('tipo_mime'),
+                            estado['length'], estado['key'])
+    _auditar('UploadArquivo', f"Upload retomável de {meta['nome']}", curso_id=arquivo.curso_id,
+             arquivo_id=arquivo.id, dados_novos=arquivo.to_dict())
+    logger.info("Upload concluído", extra={'event': 'arquivo.upload', 'arquivo_id': arquivo.id,
+                                           'curso_id': arquivo.curso_id, 'tamanho': arquivo.tamanho})
+    response = jsonify({'success': True, 'data': arquivo})
+    response.headers['Upload-Offset'] = str(estado['length'])
+    return response, 201
+
+@bp.route('/api/arquivos/uploads/<upload_id>', methods=['DELETE'])
+@log_request
+def cancelar_upload(upload_id):
+    """Cancelar um upload em andamento e descartar os blocos recebidos"""
+    try:
+        object_store.abort_upload(upload_id)
+    except UploadNotFound:
+        return jsonify({'success': False, 'message': 'Upload não encontrado'}), 404
+    return Response(status=204)
+
+@bp.route('/api/arquivos/<int:arquivo_id>', methods=['DELETE'])
+@log_request
+@requer_estado_compartilhado
+def excluir_arquivo(arquivo_id):
+    """Excluir um arquivo (metadados e conteúdo)"""
+    arquivo = arquivo_store.remove(arquivo_id)
+    if arquivo is None:
+        return _arquivo_nao_encontrado()
+    if arquivo.nome_armazenamento:
+        object_store.delete(arquivo.nome_armazenamento)
+    _auditar('ExclusaoArquivo', f'Exclusão de {arquivo.nome}', curso_id=arquivo.curso_id,
+             arquivo_id=arquivo_id, dados_anteriores=arquivo.to_dict())
+    return jsonify({'success': True, 'data': True})
+
+def _parse_instante(valor):
+    """ISO 8601 (sem fuso = UTC) ou epoch em segundos -> timestamp"""
+    if valor is None:
+        return None
+    try:
+        return float(valor)
+    except ValueError:
+        pass
+    instante = datetime.datetime.fromisoformat(valor)
+    if instante.tzinfo is None:
+        instante = instante.replace(tzinfo=datetime.timezone.utc)
+    return instante.timestamp()
+
+@bp.route('/api/auditoria', methods=['GET'])
+@log_request
+def consultar_auditoria():
+    """
+    Eventos de auditoria recentes (buffer em memória), mais novos primeiro.
+    Filtros: usuario_id, curso_id, arquivo_id, tipo_acao, desde/ate
+    (created_at); paginação com before_id/limit. Com vários workers o
+    buffer é o do worker que atende (ids por worker, campo `worker`); o
+    histórico completo fica no destino (ACERVO_AUDIT_FILE).
+    """
+    limit = request.args.get('limit', 100, type=int)
+    if limit < 1 or limit > 1000:
+        limit = 100
+    try:
+        desde = _parse_instante(request.args.get('desde'))
+        ate = _parse_instante(request.args.get('ate'))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Data inválida (use ISO 8601)'}), 400
+    
+    eventos = audit_log.query(
+        usuario_id=request.args.get('usuario_id', type=int),
+        curso_id=request.args.get('curso_id', type=int),
+        arquivo_id=request.args.get('arquivo_id', type=int),
+        tipo_acao=request.args.get('tipo_acao'),
+        desde=desde,
+        ate=ate,
+        before_id=request.args.get('before_id', type=int),
+        limit=limit
+    )
+    return jsonify({
+        'success': True,
+        'data': eventos,
+        'next_before_id': eventos[-1]['id'] if len(eventos) == limit else None
+    })
+
+def _rate_limit_stats(estado):
+    return {
+        'processes': estado.processos,
+        'rate_limiter': estado.rate_limiter.get_stats() if estado.rate_limiter is not None else None,
+        'concurrency': estado.concurrency_limiter.get_stats(),
+        'sse': estado.sse_limiter.get_stats()
+    }
+
+def _database_stats(estado):
+    return estado.banco.get_stats() if estado.banco is not None else None
+
+# Seções do health check: independentes entre si (o app ASGI as calcula em
+# paralelo); algumas consultam o banco ou o disco
+HEALTH_FONTES = {
+    'cache_stats': lambda: cache.get_stats(),
+    'token_cache_stats': lambda: token_cache.get_stats(),
+    'login_pool_stats': lambda: password_verifier.get_stats(),
+    'log_stats': lambda: log_pipeline.get_stats(),
+    'response_cache_stats': lambda: response_cache.get_stats(),
+    'audit_stats': lambda: audit_log.get_stats(),
+    'change_feed_stats': lambda: change_feed.get_stats(),
+    'rate_limit_stats': lambda: _rate_limit_stats(estado_do_app()),
+    'storage_stats': lambda: dict(object_store.get_stats(), arquivos=len(arquivo_store),
+                                  total_bytes=arquivo_store.total_bytes),
+    'database_stats': lambda: _database_stats(estado_do_app())
+}
+
+# Seções que consultam os repositórios (I/O quando o banco é SQLite)
+HEALTH_FONTES_REPOSITORIO = frozenset({'storage_stats'})
+
+def montar_health(secoes):
+    """Payload do health check a partir dos resultados de HEALTH_FONTES"""
+    return {
+        'status': 'healthy',
+        'timestamp': datetime.datetime.now().isoformat(),
+        'version': '1.0.0',
+        'environment': 'development',
+        'services': {
+            'api': 'healthy',
+            'cache': 'healthy',
+            'logging': 'healthy'
+        },
+        **secoes,
+        'endpoints': {
+            'auth': 'active',
+            'dashboard': 'active',
+            'cursos': 'active',
+            'arquivos': 'active',
+            'usuarios': 'active'
+        },
+        'uptime_seconds': round(uptime_seconds(), 3)
+    }
+
+def montar_health_falha():
+    return {
+        'status': 'unhealthy',
+        'timestamp': datetime.datetime.now().isoformat(),
+        'error': 'Health check failed',
+        'version': '1.0.0'
+    }
+
+@bp.route('/api/health', methods=['GET'])
+@log_request
+def health_check():
+    """Health check com informações detalhadas"""
+    try:
+        health_info = montar_health({nome: fonte() for nome, fonte in HEALTH_FONTES.items()})
+        return jsonify(health_info), 200
+        
+    except Exception as e:
+        logger.error("Health check failed", extra={'error': str(e)})
+        return jsonify(montar_health_falha()), 500
+
+@bp.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Métricas no formato de exposição do Prometheus"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@bp.route('/swagger', methods=['GET'])
+@resposta_cacheada('swagger', lambda: 0)
+def swagger_ui():
+    """Swagger UI com documentação completa"""
+    return SWAGGER_HTML
+
+def create_app(config=None):
+    """
+    Fábrica do app: cada chamada monta um app Flask novo, com o próprio
+    estado (EstadoAcervo: repositórios, caches, limites, métricas e as
+    threads de auditoria e do feed). `config` vai para app.config; além das
+    chaves do Flask (ex.: TESTING) as chaves ACERVO_* (ACERVO_DB,
+    ACERVO_STORAGE_DIR, ACERVO_AUDIT_FILE, ACERVO_RATE_LIMIT, ACERVO_SEED_FILE,
+    ACERVO_SNAPSHOT...) sobrepõem o ambiente, e LAZY_LOAD adia a carga para
+    a primeira requisição. O pipeline de logs é do processo: instalado na
+    primeira chamada.
+    """
+    configurar_logs()
+    app = Flask(__name__)
+    app.json = AcervoJSONProvider(app)
+    app.config.update(config or {})
+    CORS(app, **CORS_OPCOES)
+    estado = app.extensions['acervo'] = EstadoAcervo(_configuracao(app.config))
+    app.register_blueprint(bp)
+    lazy = app.config.get('LAZY_LOAD', estado.environ.get('ACERVO_LAZY_LOAD', '') not in ('', '0'))
+    if not lazy:
+        carregar_dados(estado)
+    return app
+
+# `server:app` (gunicorn server:app, flask --app server run): app padrão,
+# montado no primeiro acesso ao atributo; importar o módulo não monta nenhum
+_app_padrao_lock = threading.Lock()
+
+def __getattr__(nome):
+    if nome != 'app':
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    global app
+    with _app_padrao_lock:
+        if 'app' not in globals():
+            app = create_app()
+    return app
+
+marco('rotas')
 
 if __name__ == '__main__':
+    app = create_app()
     print("🚀 Iniciando Backend Mock")
     print("📍 Swagger UI: http://localhost:5007/swagger")
     print("🔐 Credenciais: admin@acervoeducacional.com / Admin@123")
     app.run(host='0.0.0.0', port=5007, debug=True)
-
@@ -0,0 +1,123 @@
+"""
+Snapshot binário dos dados carregados (repositórios em memória)
+Depois da primeira carga (seed JSONL/CSV/SQL, sintético ou dados de
+exemplo), o estado dos repositórios - registros, índices e contadores - é
+gravado com marshal em um único arquivo. Nos inícios seguintes o arquivo é
+mapeado em memória (mmap) e decodificado direto para os repositórios: sem
+parse de JSON/SQL, sem mapeamento de linhas, sem refazer os índices nem o
+hash das senhas.
+
+O arquivo guarda uma impressão digital da origem (arquivos de seed com
+tamanho e mtime, spec sintética, versão do Python/marshal): se a origem
+mudar, o snapshot é ignorado e regravado após a carga normal.
+
+Uso no servidor: ACERVO_SNAPSHOT=/caminho/dados.snap (só sem ACERVO_DB; o
+banco SQLite já é persistente).
+
+Formato: MAGIC, seções marshal (uma por repositório), índice marshal
+{nome: (offset, tamanho)} + impressão digital e rodapé com a posição do índice.
+"""
+
+import json
+import marshal
+import mmap
+import os
+import struct
+import sys
+import time
+
+MAGIC = b'ACERVOSN'
+VERSAO_FORMATO = 1
+# offset e tamanho do índice, MAGIC de novo (arquivo truncado não é aceito)
+_RODAPE = struct.Struct('<QQ8s')
+
+
+def impressao_digital(environ=os.environ):
+    """Identificação da origem da carga; snapshots de outra origem são ignorados"""
+    arquivos = []
+    for path in filter(None, (environ.get('ACERVO_SEED_FILE') or '').split(',')):
+        try:
+            info = os.stat(path.strip())
+            arquivos.append([path.strip(), info.st_size, info.st_mtime_ns])
+        except OSError:
+            arquivos.append([path.strip(), None, None])
+    return json.dumps({
+        'formato': VERSAO_FORMATO,
+        'python': list(sys.version_info[:2]),
+        'marshal': marshal.version,
+        'seed_file': arquivos,
+        'seed_synthetic': environ.get('ACERVO_SEED_SYNTHETIC') or None
+    }, sort_keys=True)
+
+
+def save(path, repositorios, digital):
+    """
+    Grava o estado de `repositorios` (nome -> repositório com dump_state)
+    em um arquivo temporário renomeado no fim: quem lê nunca vê um
+    snapshot pela metade. Retorna o tamanho em bytes.
+    """
+    temporario = f'{path}.{os.getpid()}.tmp'
+    indice = {}
+    with open(temporario, 'wb') as f:
+        f.write(MAGIC)
+        for nome, repositorio in repositorios.items():
+            dados = marshal.dumps(repositorio.dump_state())
+            indice[nome] = (f.tell(), len(dados))
+            f.write(dados)
+        dados = marshal.dumps({'secoes': indice, 'digital': digital})
+        posicao = f.tell()
+        f.write(dados)
+        f.write(_RODAPE.pack(posicao, len(dados), MAGIC))
+        tamanho = f.tell()
+    os.replace(temporario, path)
+    return tamanho
+
+
+def load(path, repositorios, digital):
+    """
+    Restaura os repositórios a partir do snapshot. Retorna um relatório ou
+    None se o arquivo não existe, é inválido ou de outra origem (nesse caso
+    nenhum repositório é alterado).
+    """
+    inicio = time.perf_counter()
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    with f:
+        tamanho = os.fstat(f.fileno()).st_size
+        if tamanho < len(MAGIC) + _RODAPE.size:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            visao = memoryview(mapa)
+            try:
+                estados = _decodificar(visao, tamanho, repositorios, digital)
+            finally:
+                visao.release()
+    if estados is None:
+        return None
+    for nome, estado in estados.items():
+        repositorios[nome].load_state(estado)
+    return {
+        'path': path,
+        'bytes': tamanho,
+        'secoes': sorted(estados),
+        'seconds': round(time.perf_counter() - inicio, 4)
+    }
+
+
+def _decodificar(visao, tamanho, repositorios, digital):
+    if bytes(visao[:len(MAGIC)]) != MAGIC:
+        return None
+    posicao, comprimento, fim = _RODAPE.unpack(visao[tamanho - _RODAPE.size:])
+    if fim != MAGIC or posicao + comprimento > tamanho - _RODAPE.size:
+        return None
+    try:
+        indice = marshal.loads(visao[posicao:posicao + comprimento])
+        if indice['digital'] != digital or set(indice['secoes']) != set(repositorios):
+            return None
+        # Decodifica tudo antes de alterar os repositórios
+        return {nome: marshal.loads(visao[offset:offset + n])
+                for nome, (offset, n) in indice['secoes'].items()}
+    except (EOFError, ValueError, TypeError, KeyError):
+        return None
@@ -0,0 +1,724 @@
+"""
+Repositórios persistentes em SQLite (opcional)
+Espelham as tabelas cursos/arquivos/usuarios de 02_create_tables.sql, com
+os índices do Postgres (incluindo o id, para listagens ordenadas só pelo
+índice) e FTS5 no lugar do índice GIN to_tsvector de nome_curso. Oferecem
+a mesma interface de store.py e user_store.py: as rotas funcionam com
+qualquer um dos dois. Como o estado fica no arquivo, vários workers (e
+reinícios do servidor) enxergam os mesmos dados.
+
+No servidor: ACERVO_DB=acervo.db (sem a variável, repositórios em memória).
+"""
+
+import bisect
+import contextlib
+import datetime
+import json
+import os
+import sqlite3
+import threading
+
+from loader import STATUS_DB_PARA_MOCK, STATUS_MOCK_PARA_DB
+from records import Arquivo, Curso
+from search_index import TAMANHO_MINIMO_PREFIXO, tokenizar
+from user_store import UserStore, hash_password, normalize_email
+
+# Colunas do mock (titulo/categoria) gravadas nas colunas do banco
+# (nome_curso/descricao_academia); campos fora do esquema vão em `extras`.
+# As chaves estrangeiras são declaradas mas não verificadas (como nos
+# repositórios em memória, a carga pode trazer arquivos antes dos cursos).
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL,
+    password_hash TEXT NOT NULL,
+    nome TEXT,
+    is_admin INTEGER NOT NULL DEFAULT 0,
+    is_active INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_usuarios_email ON usuarios(lower(email));
+CREATE INDEX IF NOT EXISTS idx_usuarios_active ON usuarios(is_active);
+
+CREATE TABLE IF NOT EXISTS cursos (
+    id INTEGER PRIMARY KEY,
+    nome_curso TEXT,
+    descricao_academia TEXT,
+    status TEXT NOT NULL DEFAULT 'Backlog',
+    extras TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cursos_status ON cursos(status, id);
+CREATE INDEX IF NOT EXISTS idx_cursos_academia ON cursos(descricao_academia, id);
+CREATE INDEX IF NOT EXISTS idx_cursos_created_at ON cursos(created_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS cursos_busca USING fts5(
+    nome_curso, descricao_academia,
+    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+
+CREATE TABLE IF NOT EXISTS arquivos (
+    id INTEGER PRIMARY KEY,
+    curso_id INTEGER NOT NULL REFERENCES cursos(id) ON DELETE CASCADE,
+    nome TEXT,
+    nome_armazenamento TEXT,
+    categoria TEXT,
+    tipo_mime TEXT,
+    tamanho INTEGER NOT NULL DEFAULT 0,
+    url_s3 TEXT,
+    is_publico INTEGER NOT NULL DEFAULT 0,
+    extras TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_arquivos_curso_id ON arquivos(curso_id, id);
+CREATE INDEX IF NOT EXISTS idx_arquivos_categoria ON arquivos(categoria);
+CREATE INDEX IF NOT EXISTS idx_arquivos_tipo_mime ON arquivos(tipo_mime);
+CREATE INDEX IF NOT EXISTS idx_arquivos_publico ON arquivos(is_publico);
+
+-- Feed de mudanças do Kanban (change_feed.py): o id é a versão do evento
+CREATE TABLE IF NOT EXISTS eventos_cursos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tipo TEXT NOT NULL,
+    dados TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+-- Versão por tabela (invalida os caches de resposta de todos os workers)
+CREATE TABLE IF NOT EXISTS versoes (
+    tabela TEXT PRIMARY KEY,
+    versao INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+_SQL_VERSAO = 'SELECT versao FROM versoes WHERE tabela = ?'
+_SQL_INCREMENTAR = ('INSERT INTO versoes (tabela, versao) VALUES (?, 1) '
+                    'ON CONFLICT(tabela) DO UPDATE SET versao = versao + 1')
+
+
+def _agora():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def _extras(registro):
+    return json.dumps(registro.extras, default=str, ensure_ascii=False) if registro.extras else None
+
+
+class SqliteDatabase:
+    """
+    Arquivo SQLite em modo WAL com um pool de conexões.
+
+    Cada operação pega uma conexão ociosa (ou abre uma nova), usa-a em uma
+    única thread e a devolve ao pool. O sqlite3 guarda um cache de
+    statements preparados por conexão: como as consultas são strings
+    constantes deste módulo, cada uma é compilada uma vez por conexão.
+    """
+
+    def __init__(self, path, pool_size=8, timeout=30, cached_statements=256):
+        self.path = os.path.abspath(path)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self._lock = threading.Lock()
+        self._ociosas = []
+        self.opened = 0
+        with self.conexao() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(ESQUEMA)
+
+    def _abrir(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                               check_same_thread=False, cached_statements=self.cached_statements)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-16384')
+        conn.execute('PRAGMA mmap_size=268435456')
+        self.opened += 1
+        return conn
+
+    @contextlib.contextmanager
+    def conexao(self):
+        """Conexão do pool, exclusiva da thread até o fim do bloco"""
+        with self._lock:
+            conn = self._ociosas.pop() if self._ociosas else None
+        if conn is None:
+            conn = self._abrir()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            with self._lock:
+                devolver = len(self._ociosas) < self.pool_size
+                if devolver:
+                    self._ociosas.append(conn)
+            if not devolver:
+                conn.close()
+
+    @contextlib.contextmanager
+    def transacao(self):
+        """
+        Transação de escrita (BEGIN IMMEDIATE: o lock de escrita é obtido no
+        início, então leituras seguidas de escrita não falham por conflito)
+        """
+        with self.conexao() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def versao(self, tabela):
+        with self.conexao() as conn:
+            linha = conn.execute(_SQL_VERSAO, (tabela,)).fetchone()
+        return linha[0] if linha else 0
+
+    @staticmethod
+    def incrementar_versao(conn, tabela):
+        conn.execute(_SQL_INCREMENTAR, (tabela,))
+
+    def reset_after_fork(self):
+        """
+        No processo filho: descarta (sem fechar) as conexões herdadas do pai,
+        que não podem ser usadas após o fork; novas são abertas sob demanda
+        """
+        self._lock = threading.Lock()
+        self._ociosas = []
+
+    def close(self):
+        with self._lock:
+            ociosas, self._ociosas = self._ociosas, []
+        for conn in ociosas:
+            conn.close()
+
+    def get_stats(self):
+        return {
+            'path': self.path,
+            'pool_size': self.pool_size,
+            'idle_connections': len(self._ociosas),
+            'opened_connections': self.opened
+        }
+
+
+class Selecao:
+    """
+    Ids ordenados de uma consulta, sem materializá-los: len() faz um COUNT,
+    fatias viram LIMIT/OFFSET e `apos` pagina por keyset (id > ?). É o que
+    `ids()` retorna, para que listagens grandes não tragam todos os ids.
+    """
+
+    def __init__(self, banco, tabela, filtros=()):
+        self.banco = banco
+        self.tabela = tabela
+        self.filtros = tuple(filtros)
+        self.where = ' AND '.join(f'{coluna} = ?' for coluna, _ in self.filtros)
+        self.params = tuple(valor for _, valor in self.filtros)
+
+    def _sql(self, colunas, extra=''):
+        where = f' WHERE {self.where}' if self.where else ''
+        return f'SELECT {colunas} FROM {self.tabela}{where}{extra}'
+
+    def __len__(self):
+        with self.banco.conexao() as conn:
+            return conn.execute(self._sql('COUNT(*)'), self.params).fetchone()[0]
+
+    def __iter__(self):
+        return iter(self.linhas('id'))
+
+    def __getitem__(self, item):
+        if isinstance(item, slice) and item.step is None and (item.start or 0) >= 0 \
+                and (item.stop is None or item.stop >= 0):
+            inicio = item.start or 0
+            limite = -1 if item.stop is None else max(0, item.stop - inicio)
+            return self.linhas('id', inicio, limite)
+        return list(self)[item]
+
+    def linhas(self, colunas, offset=0, limit=-1):
+        """Linhas (ou ids, com colunas='id') na ordem de id"""
+        sql = self._sql(colunas, ' ORDER BY id LIMIT ? OFFSET ?')
+        with self.banco.conexao() as conn:
+            linhas = conn.execute(sql, self.params + (limit, offset)).fetchall()
+        return [linha[0] for linha in linhas] if colunas == 'id' else linhas
+
+    def apos(self, after_id, limit, colunas='id'):
+        """Até `limit` linhas com id maior que `after_id`"""
+        if after_id is None:
+            return self.linhas(colunas, 0, limit)
+        condicao = f'{self.where} AND id > ?' if self.where else 'id > ?'
+        sql = f'SELECT {colunas} FROM {self.tabela} WHERE {condicao} ORDER BY id LIMIT ?'
+        with self.banco.conexao() as conn:
+            linhas = conn.execute(sql, self.params + (after_id, limit)).fetchall()
+        return [linha[0] for linha in linhas] if colunas == 'id' else linhas
+
+
+def _por_ids(banco, sql, ids, converter):
+    """Registros de uma lista de ids (uma consulta), na ordem da lista"""
+    if not ids:
+        return []
+    with banco.conexao() as conn:
+        encontrados = {linha[0]: converter(linha)
+                       for linha in conn.execute(sql, (json.dumps(list(ids)),))}
+    return [encontrados[i] for i in ids if i in encontrados]
+
+
+# Cursos
+_COLUNAS_CURSO = 'id, nome_curso, descricao_academia, status, extras'
+_SQL_CURSO = f'SELECT {_COLUNAS_CURSO} FROM cursos WHERE id = ?'
+_SQL_CURSOS_IDS = (f'SELECT {_COLUNAS_CURSO} FROM cursos '
+                   f'WHERE id IN (SELECT value FROM json_each(?))')
+_SQL_INSERIR_CURSO = ('INSERT INTO cursos (id, nome_curso, descricao_academia, status, extras, '
+                      'created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)')
+_SQL_ALTERAR_CURSO = ('UPDATE cursos SET nome_curso = ?, descricao_academia = ?, status = ?, '
+                      'extras = ?, updated_at = ? WHERE id = ?')
+_SQL_INDEXAR_CURSO = ('INSERT INTO cursos_busca (rowid, nome_curso, descricao_academia) '
+                      'VALUES (?, ?, ?)')
+_SQL_DESINDEXAR_CURSO = 'DELETE FROM cursos_busca WHERE rowid = ?'
+_SQL_BUSCA = ('SELECT cursos_busca.rowid FROM cursos_busca{join} WHERE cursos_busca MATCH ?{filtros} '
+              'ORDER BY bm25(cursos_busca, 2.0, 1.0), cursos_busca.rowid')
+
+
+def _curso(linha):
+    curso_id, titulo, categoria, status, extras = linha
+    data = {
+        'id': curso_id,
+        'titulo': titulo,
+        'categoria': categoria,
+        'status': STATUS_DB_PARA_MOCK.get(status, status)
+    }
+    if extras:
+        data.update(json.loads(extras))
+    return Curso.from_dict(data)
+
+
+def _consulta_fts(query):
+    """Termos normalizados como em search_index; todos obrigatórios, com prefixo"""
+    termos = dict.fromkeys(tokenizar(query))
+    return ' AND '.join(f'"{t}"*' if len(t) >= TAMANHO_MINIMO_PREFIXO else f'"{t}"'
+                        for t in termos)
+
+
+class SqliteCourseStore:
+    """
+    Cursos na tabela `cursos`, com a interface de store.CourseStore.
+
+    Filtros por status/categoria usam os índices (status, id) e
+    (descricao_academia, id); `ids()` devolve uma `Selecao`, paginada no
+    banco. A busca usa a tabela FTS5 `cursos_busca`, alimentada com os
+    termos já normalizados por search_index.tokenizar (mesmas stopwords e
+    radicais da busca em memória) e ordenada por bm25.
+    """
+
+    def __init__(self, banco, cursos=()):
+        self.banco = banco
+        self._observadores = []
+        self.seed(cursos)
+
+    def seed(self, cursos):
+        """Cursos iniciais, só com a tabela vazia (na mesma transação)"""
+        if not cursos:
+            return
+        with self.banco.transacao() as conn:
+            if conn.execute('SELECT 1 FROM cursos LIMIT 1').fetchone() is None:
+                self._inserir_todos(conn, cursos)
+
+    @property
+    def version(self):
+        return self.banco.versao('cursos')
+
+    def observar(self, observador):
+        """Como em CourseStore; a notificação ocorre após o commit"""
+        self._observadores.append(observador)
+
+    def _notificar(self, anterior, novo):
+        for observador in self._observadores:
+            observador(anterior, novo)
+
+    # Escrita
+    def _inserir(self, conn, curso):
+        curso = Curso.from_dict(curso)
+        agora = _agora()
+        if curso.id is not None and conn.execute(_SQL_CURSO, (curso.id,)).fetchone() is not None:
+            raise ValueError(f"Curso {curso.id} já existe")
+        cursor = conn.execute(_SQL_INSERIR_CURSO, (
+            curso.id, curso.titulo, curso.categoria,
+            STATUS_MOCK_PARA_DB.get(curso.status, curso.status), _extras(curso), agora, agora
+        ))
+        if curso.id is None:
+            curso = curso.replace({'id': cursor.lastrowid})
+        self._indexar(conn, curso)
+        return curso
+
+    def _inserir_todos(self, conn, cursos):
+        total = 0
+        for curso in cursos:
+            self._inserir(conn, curso)
+            total += 1
+        self.banco.incrementar_versao(conn, 'cursos')
+        return total
+
+    @staticmethod
+    def _indexar(conn, curso):
+        conn.execute(_SQL_INDEXAR_CURSO, (curso.id, ' '.join(tokenizar(curso.titulo)),
+                                          ' '.join(tokenizar(curso.categoria))))
+
+    def add(self, curso):
+        """Inserir um curso; atribui id quando não informado"""
+        with self.banco.transacao() as conn:
+            curso = self._inserir(conn, curso)
+            self.banco.incrementar_versao(conn, 'cursos')
+        self._notificar(None, curso)
+        return curso
+
+    def add_many(self, cursos):
+        """Inserção em lote: uma transação para o lote inteiro"""
+        with self.banco.transacao() as conn:
+            total = self._inserir_todos(conn, cursos)
+        if total:
+            self._notificar(None, None)
+        return total
+
+    def _alterar(self, conn, curso_id, changes):
+        linha = conn.execute(_SQL_CURSO, (curso_id,)).fetchone()
+        if linha is None:
+            return None
+        anterior = _curso(linha)
+        novo = anterior.replace(dict(changes, id=curso_id))
+        conn.execute(_SQL_ALTERAR_CURSO, (
+            novo.titulo, novo.categoria, STATUS_MOCK_PARA_DB.get(novo.status, novo.status),
+            _extras(novo), _agora(), curso_id
+        ))
+        conn.execute(_SQL_DESINDEXAR_CURSO, (curso_id,))
+        self._indexar(conn, novo)
+        return anterior, novo
+
+    def _excluir(self, conn, curso_id):
+        linha = conn.execute(_SQL_CURSO, (curso_id,)).fetchone()
+        if linha is None:
+            return None
+        conn.execute('DELETE FROM cursos WHERE id = ?', (curso_id,))
+        conn.execute(_SQL_DESINDEXAR_CURSO, (curso_id,))
+        return _curso(linha)
+
+    def update(self, curso_id, changes):
+        """Alterar campos de um curso; retorna (anterior, novo) ou None"""
+        with self.banco.transacao() as conn:
+            resultado = self._alterar(conn, curso_id, changes)
+            if resultado is None:
+                return None
+            self.banco.incrementar_versao(conn, 'cursos')
+        self._notificar(*resultado)
+        return resultado
+
+    def remove(self, curso_id):
+        """Excluir um curso; retorna o registro removido ou None"""
+        with self.banco.transacao() as conn:
+            curso = self._excluir(conn, curso_id)
+            if curso is None:
+                return None
+            self.banco.incrementar_versao(conn, 'cursos')
+        self._notificar(curso, None)
+        return curso
+
+    def apply_batch(self, operacoes):
+        """
+        Operações em lote como em CourseStore.apply_batch, em uma única
+        transação (a versão sobe uma vez); as notificações saem após o commit.
+        """
+        resultados = []
+        mudancas = []
+        with self.banco.transacao() as conn:
+            for operacao in operacoes:
+                acao = operacao[0]
+                if acao == 'add':
+                    resultado = self._inserir(conn, operacao[1])
+                    mudanca = (None, resultado)
+                elif acao == 'update':
+                    resultado = mudanca = self._alterar(conn, *operacao[1:])
+                else:
+                    resultado = self._excluir(conn, operacao[1])
+                    mudanca = (resultado, None) if resultado is not None else None
+                resultados.append(resultado)
+                if mudanca is not None:
+                    mudancas.append(mudanca)
+            if mudancas:
+                self.banco.incrementar_versao(conn, 'cursos')
+        for anterior, novo in mudancas:
+            self._notificar(anterior, novo)
+        return resultados
+
+    def reset_after_fork(self):
+        self.banco.reset_after_fork()
+
+    # Leitura
+    def get(self, curso_id):
+        with self.banco.conexao() as conn:
+            linha = conn.execute(_SQL_CURSO, (curso_id,)).fetchone()
+        return _curso(linha) if linha else None
+
+    def __len__(self):
+        return len(Selecao(self.banco, 'cursos'))
+
+    def count_by_status(self, status):
+        return len(self._selecao(status, None))
+
+    def status_counts(self):
+        with self.banco.conexao() as conn:
+            linhas = conn.execute('SELECT status, COUNT(*) FROM cursos GROUP BY status').fetchall()
+        return {STATUS_DB_PARA_MOCK.get(status, status): total for status, total in linhas}
+
+    def by_status(self, status):
+        return [_curso(linha) for linha in self._selecao(status, None).linhas(_COLUNAS_CURSO)]
+
+    def by_categoria(self, categoria):
+        return [_curso(linha) for linha in self._selecao(None, categoria).linhas(_COLUNAS_CURSO)]
+
+    def _selecao(self, status, categoria):
+        filtros = []
+        if status is not None:
+            filtros.append(('status', STATUS_MOCK_PARA_DB.get(status, status)))
+        if categoria is not None:
+            filtros.append(('descricao_academia', categoria))
+        return Selecao(self.banco, 'cursos', filtros)
+
+    def ids(self, status=None, categoria=None):
+        """Ids (ordenados) que atendem aos filtros indexados"""
+        return self._selecao(status, categoria)
+
+    def search(self, query, status=None, categoria=None):
+        """Ids que casam com a busca, ordenados por relevância"""
+        expressao = _consulta_fts(query)
+        if not expressao:
+            return []
+        selecao = self._selecao(status, categoria)
+        join = ' JOIN cursos ON cursos.id = cursos_busca.rowid' if selecao.where else ''
+        filtros = f' AND {selecao.where}' if selecao.where else ''
+        with self.banco.conexao() as conn:
+            linhas = conn.execute(_SQL_BUSCA.format(join=join, filtros=filtros),
+                                  (expressao,) + selecao.params).fetchall()
+        return [linha[0] for linha in linhas]
+
+    def ids_after(self, ids, after_id, limit):
+        """Paginação por cursor (keyset): no banco para uma Selecao, bisect para listas"""
+        if isinstance(ids, Selecao):
+            return ids.apos(after_id, limit)
+        start = bisect.bisect_right(ids, after_id) if after_id is not None else 0
+        return ids[start:start + limit]
+
+    def page(self, offset, limit, ids=None):
+        """Uma página de cursos (LIMIT/OFFSET no banco ou pelos ids informados)"""
+        if ids is None:
+            ids = Selecao(self.banco, 'cursos')
+        if isinstance(ids, Selecao):
+            return [_curso(linha) for linha in ids.linhas(_COLUNAS_CURSO, offset, limit)]
+        return _por_ids(self.banco, _SQL_CURSOS_IDS, ids[offset:offset + limit], _curso)
+
+    def __iter__(self):
+        return iter([_curso(linha) for linha in Selecao(self.banco, 'cursos').linhas(_COLUNAS_CURSO)])
+
+    def iter_by_status(self, status=None, batch_size=1000):
+        """Cursos em ordem de id, uma consulta por lote (keyset, sem OFFSET)"""
+        selecao = self._selecao(status, None)
+        after_id = None
+        while True:
+            linhas = selecao.apos(after_id, batch_size, _COLUNAS_CURSO)
+            if not linhas:
+                return
+            yield from (_curso(linha) for linha in linhas)
+            after_id = linhas[-1][0]
+
+
+# Arquivos
+_COLUNAS_ARQUIVO = ('id, curso_id, nome, nome_armazenamento, categoria, tipo_mime, tamanho, '
+                    'url_s3, is_publico, extras')
+_SQL_ARQUIVO = f'SELECT {_COLUNAS_ARQUIVO} FROM arquivos WHERE id = ?'
+_SQL_ARQUIVOS_IDS = (f'SELECT {_COLUNAS_ARQUIVO} FROM arquivos '
+                     f'WHERE id IN (SELECT value FROM json_each(?))')
+_SQL_INSERIR_ARQUIVO = ('INSERT INTO arquivos (id, curso_id, nome, nome_armazenamento, categoria, '
+                        'tipo_mime, tamanho, url_s3, is_publico, extras, created_at, updated_at) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)')
+
+
+def _arquivo(linha):
+    data = dict(zip(Arquivo.CAMPOS, linha[:-1]))
+    data['is_publico'] = bool(data['is_publico'])
+    if linha[-1]:
+        data.update(json.loads(linha[-1]))
+    return Arquivo.from_dict(data)
+
+
+class SqliteArquivoStore:
+    """Arquivos na tabela `arquivos`, com a interface de store.ArquivoStore"""
+
+    def __init__(self, banco, arquivos=()):
+        self.banco = banco
+        if arquivos:
+            self.add_many(arquivos)
+
+    @property
+    def version(self):
+        return self.banco.versao('arquivos')
+
+    def _inserir(self, conn, arquivo):
+        arquivo = Arquivo.from_dict(arquivo)
+        if arquivo.id is not None and conn.execute(_SQL_ARQUIVO, (arquivo.id,)).fetchone() is not None:
+            raise ValueError(f"Arquivo {arquivo.id} já existe")
+        agora = _agora()
+        cursor = conn.execute(_SQL_INSERIR_ARQUIVO, (
+            arquivo.id, arquivo.curso_id, arquivo.nome, arquivo.nome_armazenamento,
+            arquivo.categoria, arquivo.tipo_mime, arquivo.tamanho or 0, arquivo.url_s3,
+            int(bool(arquivo.is_publico)), _extras(arquivo), agora, agora
+        ))
+        if arquivo.id is None:
+            arquivo = arquivo.replace({'id': cursor.lastrowid})
+        return arquivo
+
+    def add(self, arquivo):
+        with self.banco.transacao() as conn:
+            arquivo = self._inserir(conn, arquivo)
+            self.banco.incrementar_versao(conn, 'arquivos')
+        return arquivo
+
+    def add_many(self, arquivos):
+        with self.banco.transacao() as conn:
+            total = 0
+            for arquivo in arquivos:
+                self._inserir(conn, arquivo)
+                total += 1
+            self.banco.incrementar_versao(conn, 'arquivos')
+            return total
+
+    def remove(self, arquivo_id):
+        """Excluir um arquivo; retorna o registro removido ou None"""
+        with self.banco.transacao() as conn:
+            linha = conn.execute(_SQL_ARQUIVO, (arquivo_id,)).fetchone()
+            if linha is None:
+                return None
+            conn.execute('DELETE FROM arquivos WHERE id = ?', (arquivo_id,))
+            self.banco.incrementar_versao(conn, 'arquivos')
+        return _arquivo(linha)
+
+    def get(self, arquivo_id):
+        with self.banco.conexao() as conn:
+            linha = conn.execute(_SQL_ARQUIVO, (arquivo_id,)).fetchone()
+        return _arquivo(linha) if linha else None
+
+    @property
+    def total_bytes(self):
+        with self.banco.conexao() as conn:
+            return conn.execute('SELECT COALESCE(SUM(tamanho), 0) FROM arquivos').fetchone()[0]
+
+    def by_curso(self, curso_id):
+        return [_arquivo(linha) for linha in self.ids(curso_id).linhas(_COLUNAS_ARQUIVO)]
+
+    def ids(self, curso_id=None):
+        """Ids ordenados (de todos os arquivos ou de um curso)"""
+        filtros = [] if curso_id is None else [('curso_id', curso_id)]
+        return Selecao(self.banco, 'arquivos', filtros)
+
+    def page(self, offset, limit, ids=None):
+        if ids is None:
+            ids = self.ids()
+        if isinstance(ids, Selecao):
+            return [_arquivo(linha) for linha in ids.linhas(_COLUNAS_ARQUIVO, offset, limit)]
+        return _por_ids(self.banco, _SQL_ARQUIVOS_IDS, ids[offset:offset + limit], _arquivo)
+
+    def __len__(self):
+        return len(self.ids())
+
+    def reset_after_fork(self):
+        self.banco.reset_after_fork()
+
+
+# Usuários
+_COLUNAS_USUARIO = ('id', 'email', 'password_hash', 'nome', 'is_admin', 'is_active')
+_SQL_USUARIO = f'SELECT {", ".join(_COLUNAS_USUARIO)} FROM usuarios WHERE id = ?'
+_SQL_USUARIO_EMAIL = f'SELECT {", ".join(_COLUNAS_USUARIO)} FROM usuarios WHERE lower(email) = ?'
+_SQL_INSERIR_USUARIO = ('INSERT INTO usuarios (id, email, password_hash, nome, is_admin, is_active, '
+                        'created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)')
+
+
+def _usuario(linha):
+    usuario = dict(zip(_COLUNAS_USUARIO, linha))
+    usuario['is_admin'] = bool(usuario['is_admin'])
+    usuario['is_active'] = bool(usuario['is_active'])
+    return usuario
+
+
+class SqliteUserStore:
+    """Usuários na tabela `usuarios`, com a interface de user_store.UserStore"""
+
+    CAMPOS_PUBLICOS = UserStore.CAMPOS_PUBLICOS
+    public = staticmethod(UserStore.public)
+
+    def __init__(self, banco, usuarios=()):
+        self.banco = banco
+        self.seed(usuarios)
+
+    def seed(self, usuarios):
+        # Usuários iniciais só em um banco vazio (evita refazer o hash a cada início)
+        if usuarios and not len(self):
+            for usuario in usuarios:
+                try:
+                    self.add(usuario)
+                except ValueError:
+                    pass
+
+    @property
+    def version(self):
+        return self.banco.versao('usuarios')
+
+    def add(self, usuario):
+        usuario = dict(usuario)
+        senha = usuario.pop('senha', None)
+        if senha is not None:
+            usuario['password_hash'] = hash_password(senha)
+        usuario.setdefault('is_admin', False)
+        usuario.setdefault('is_active', True)
+        usuario['email'] = usuario['email'].strip()
+        agora = _agora()
+        with self.banco.transacao() as conn:
+            if conn.execute(_SQL_USUARIO_EMAIL, (normalize_email(usuario['email']),)).fetchone():
+                raise ValueError(f"Email {normalize_email(usuario['email'])} já cadastrado")
+            cursor = conn.execute(_SQL_INSERIR_USUARIO, (
+                usuario.get('id'), usuario['email'], usuario['password_hash'], usuario.get('nome'),
+                int(bool(usuario['is_admin'])), int(bool(usuario['is_active'])), agora, agora
+            ))
+            usuario['id'] = cursor.lastrowid
+            self.banco.incrementar_versao(conn, 'usuarios')
+        return usuario
+
+    def get(self, usuario_id):
+        with self.banco.conexao() as conn:
+            linha = conn.execute(_SQL_USUARIO, (usuario_id,)).fetchone()
+        return _usuario(linha) if linha else None
+
+    def get_by_email(self, email):
+        with self.banco.conexao() as conn:
+            linha = conn.execute(_SQL_USUARIO_EMAIL, (normalize_email(email),)).fetchone()
+        return _usuario(linha) if linha else None
+
+    def __len__(self):
+        return len(Selecao(self.banco, 'usuarios'))
+
+    def public_list(self):
+        with self.banco.conexao() as conn:
+            linhas = conn.execute(f'SELECT {", ".join(_COLUNAS_USUARIO)} FROM usuarios '
+                                  f'ORDER BY id').fetchall()
+        return [self.public(_usuario(linha)) for linha in linhas]
+
+    def iter_public(self, batch_size=1000):
+        """Como public_list, uma consulta por lote (keyset)"""
+        selecao = Selecao(self.banco, 'usuarios')
+        after_id = None
+        while True:
+            linhas = selecao.apos(after_id, batch_size, ', '.join(_COLUNAS_USUARIO))
+            if not linhas:
+                return
+            yield from (self.public(_usuario(linha)) for linha in linhas)
+            after_id = linhas[-1][0]
+
+    def reset_after_fork(self):
+        self.banco.reset_after_fork()
@@ -0,0 +1,119 @@
+"""
+Inicialização do Backend Mock: fases medidas e importações adiadas
+- `marco(nome)`: registra o tempo gasto desde o marco anterior (fases da
+  importação de server.py, carga dos dados, create_app)
+- `ModuloAdiado`: módulo importado só no primeiro acesso a um atributo
+- `perfil()`: inicia o app em um processo novo com -X importtime e resume o
+  tempo de importação por pacote e as fases (python serve.py --profile-startup)
+"""
+
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+_inicio = time.perf_counter()
+_ultimo = _inicio
+FASES = []
+
+
+def marco(nome):
+    """Fecha a fase `nome` (tempo desde o marco anterior)"""
+    global _ultimo
+    agora = time.perf_counter()
+    FASES.append((nome, agora - _ultimo))
+    _ultimo = agora
+
+
+def relatorio():
+    return {
+        'fases': [{'fase': nome, 'ms': round(duracao * 1000, 2)} for nome, duracao in FASES],
+        'total_ms': round((_ultimo - _inicio) * 1000, 2)
+    }
+
+
+class ModuloAdiado:
+    """
+    Substituto de um módulo pesado e pouco usado (ex.: jwt): a importação
+    acontece no primeiro acesso a um atributo, que fica guardado no próprio
+    objeto (os acessos seguintes não passam por __getattr__).
+    """
+
+    def __init__(self, nome):
+        self._nome = nome
+
+    def __getattr__(self, atributo):
+        valor = getattr(importlib.import_module(self._nome), atributo)
+        setattr(self, atributo, valor)
+        return valor
+
+    def __repr__(self):
+        return f'<módulo adiado {self._nome!r}>'
+
+
+# Perfil de inicialização
+_PROGRAMA = """
+import json, sys, time
+inicio = time.perf_counter()
+import startup
+import server
+if {asgi!r}:
+    import asgi
+    startup.marco('asgi')
+    asgi.create_app()
+else:
+    server.create_app()
+startup.marco('create_app')
+dados = startup.relatorio()
+dados['processo_ms'] = round((time.perf_counter() - inicio) * 1000, 2)
+sys.stdout.write(json.dumps(dados))
+"""
+
+
+def _importtime(linhas):
+    """Linhas de -X importtime -> (tempo próprio em µs por pacote raiz, total em µs)"""
+    pacotes = {}
+    total = 0
+    for linha in linhas:
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, _, nome = linha[len('import time:'):].split('|', 2)
+        raiz = nome.strip().split('.', 1)[0]
+        pacotes[raiz] = pacotes.get(raiz, 0) + int(proprio)
+        total += int(proprio)
+    return pacotes, total
+
+
+def perfil(asgi=False, top=15, environ=None, saida=sys.stdout):
+    """
+    Mede a inicialização em um interpretador novo (PYTHONPROFILEIMPORTTIME)
+    e imprime o resumo; retorna os dados medidos
+    """
+    env = dict(os.environ if environ is None else environ, PYTHONPROFILEIMPORTTIME='1')
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    inicio = time.perf_counter()
+    processo = subprocess.run([sys.executable, '-c', _PROGRAMA.format(asgi=asgi)], cwd=diretorio,
+                              env=env, capture_output=True, text=True)
+    parede = (time.perf_counter() - inicio) * 1000
+    if processo.returncode != 0:
+        saida.write(processo.stderr)
+        raise RuntimeError('Falha ao iniciar o app para o perfil')
+    dados = json.loads(processo.stdout.strip().splitlines()[-1])
+    pacotes, total = _importtime(processo.stderr.splitlines())
+    dados.update(importacao_ms=round(total / 1000, 2), processo_completo_ms=round(parede, 2),
+                 pacotes={nome: round(us / 1000, 2) for nome, us in pacotes.items()})
+
+    saida.write(f"Inicialização ({'asgi' if asgi else 'wsgi'}): {parede:.0f} ms no total "
+                f"(interpretador + app), {dados['processo_ms']:.0f} ms no app\n\n")
+    saida.write(f"Importações: {total / 1000:.1f} ms (tempo próprio por pacote)\n")
+    for nome, us in sorted(pacotes.items(), key=lambda item: -item[1])[:top]:
+        saida.write(f"  {nome:<28} {us / 1000:8.1f} ms  {100 * us / total:5.1f}%\n")
+    outros = sorted(pacotes.values(), reverse=True)[top:]
+    if outros:
+        saida.write(f"  {f'outros ({len(outros)})':<28} {sum(outros) / 1000:8.1f} ms\n")
+    saida.write("\nFases (import startup -> create_app):\n")
+    for fase in dados['fases']:
+        saida.write(f"  {fase['fase']:<28} {fase['ms']:8.1f} ms\n")
+    return dados
@@ -0,0 +1,403 @@
+"""
+Repositórios em memória de cursos e arquivos com índices secundários
+Mantém índices por status e categoria, por curso_id e contadores incrementais.
+Os registros são armazenados compactos (ver records.py).
+"""
+
+import bisect
+import threading
+
+from records import Arquivo, Curso
+from search_index import SearchIndex
+
+# Campos indexados para busca textual e seus pesos no ranking
+CAMPOS_BUSCA = {'titulo': 2.0, 'categoria': 1.0}
+
+
+class CourseStore:
+    """
+    Repositório de cursos indexado.
+
+    - `_cursos`: id -> curso (registro `Curso` com __slots__), acesso O(1)
+    - `_ids`: ids ordenados, usado para listagem e paginação sem cópia
+    - `_by_status` / `_by_categoria`: valor -> lista ordenada de ids,
+      mantida com bisect a cada inserção ou alteração (permite paginação
+      por cursor dentro de um filtro)
+    - `_status_counts`: contadores por status para o dashboard
+    - `_busca`: índice invertido de titulo/categoria para o parâmetro search
+
+    Os cursos armazenados nunca são alterados no lugar: `update` grava um
+    novo registro, então quem já leu um curso continua com um snapshot coerente.
+
+    Observadores (`observar`) recebem `(anterior, novo)` a cada mudança
+    (`novo` None: exclusão), ainda com o lock adquirido (na ordem das
+    versões); uma carga em lote (`add_many`) gera uma única notificação
+    `(None, None)`.
+    """
+
+    def __init__(self, cursos=()):
+        self._lock = threading.RLock()
+        self._cursos = {}
+        self._ids = []
+        self._by_status = {}
+        self._by_categoria = {}
+        self._status_counts = {}
+        self._busca = SearchIndex(CAMPOS_BUSCA)
+        self._next_id = 1
+        self._observadores = []
+        self.version = 0
+        for curso in cursos:
+            self.add(curso)
+
+    def observar(self, observador):
+        self._observadores.append(observador)
+
+    def _notificar(self, anterior, novo):
+        for observador in self._observadores:
+            observador(anterior, novo)
+
+    # Escrita
+    def add(self, curso):
+        """Inserir um curso; atribui id quando não informado"""
+        with self._lock:
+            curso = self._add(curso)
+            self._notificar(None, curso)
+            return curso
+
+    def _add(self, curso):
+        """Inserção sem notificação (chamado com o lock adquirido)"""
+        curso = Curso.from_dict(curso)
+        curso_id = curso.id
+        if curso_id is None:
+            curso_id = self._next_id
+            curso = curso.replace({'id': curso_id})
+        if curso_id in self._cursos:
+            raise ValueError(f"Curso {curso_id} já existe")
+        self._cursos[curso_id] = curso
+        if not self._ids or curso_id > self._ids[-1]:
+            self._ids.append(curso_id)
+        else:
+            bisect.insort(self._ids, curso_id)
+        self._next_id = max(self._next_id, curso_id + 1)
+        self._index(curso)
+        self.version += 1
+        return curso
+
+    def add_many(self, cursos):
+        """Inserção em lote (carga inicial): adquire o lock uma única vez"""
+        with self._lock:
+            total = 0
+            for curso in cursos:
+                self._add(curso)
+                total += 1
+            if total:
+                self._notificar(None, None)
+            return total
+
+    def seed(self, cursos):
+        """Cursos iniciais, só em um repositório vazio (sem notificação)"""
+        with self._lock:
+            if not self._cursos:
+                for curso in cursos:
+                    self._add(curso)
+
+    def update(self, curso_id, changes):
+        """Alterar campos de um curso; retorna (anterior, novo) ou None"""
+        with self._lock:
+            anterior = self._cursos.get(curso_id)
+            if anterior is None:
+                return None
+            novo = anterior.replace(dict(changes, id=curso_id))
+            self._unindex(anterior)
+            self._cursos[curso_id] = novo
+            self._index(novo)
+            self.version += 1
+            self._notificar(anterior, novo)
+            return anterior, novo
+
+    def remove(self, curso_id):
+        """Excluir um curso; retorna o registro removido ou None"""
+        with self._lock:
+            curso = self._cursos.pop(curso_id, None)
+            if curso is None:
+                return None
+            del self._ids[bisect.bisect_left(self._ids, curso_id)]
+            self._unindex(curso)
+            self.version += 1
+            self._notificar(curso, None)
+            return curso
+
+    def apply_batch(self, operacoes):
+        """
+        Operações em lote, com o lock adquirido uma única vez: ('add', curso),
+        ('update', curso_id, changes) ou ('remove', curso_id). Retorna o
+        resultado de cada uma (o mesmo do método correspondente).
+        """
+        metodos = {'add': self.add, 'update': self.update, 'remove': self.remove}
+        with self._lock:
+            return [metodos[operacao[0]](*operacao[1:]) for operacao in operacoes]
+
+    def reset_after_fork(self):
+        """No processo filho: recriar o lock (pode ter sido copiado adquirido)"""
+        self._lock = threading.RLock()
+
+    # Snapshot (snapshot.py): registros e índices em tipos nativos
+    def dump_state(self):
+        with self._lock:
+            return {
+                'cursos': [curso.to_row() for curso in self._cursos.values()],
+                'ids': self._ids,
+                'by_status': self._by_status,
+                'by_categoria': self._by_categoria,
+                'status_counts': self._status_counts,
+                'busca': self._busca.dump_state(),
+                'next_id': self._next_id,
+                'version': self.version
+            }
+
+    def load_state(self, estado):
+        """Substitui o conteúdo pelo de `dump_state`, sem reindexar"""
+        cursos = [Curso.from_row(row) for row in estado['cursos']]
+        with self._lock:
+            self._cursos = {curso.id: curso for curso in cursos}
+            self._ids = estado['ids']
+            self._by_status = estado['by_status']
+            self._by_categoria = estado['by_categoria']
+            self._status_counts = estado['status_counts']
+            self._busca.load_state(estado['busca'])
+            self._next_id = estado['next_id']
+            self.version = estado['version']
+
+    # Leitura
+    def get(self, curso_id):
+        return self._cursos.get(curso_id)
+
+    def __len__(self):
+        return len(self._cursos)
+
+    def count_by_status(self, status):
+        return self._status_counts.get(status, 0)
+
+    def status_counts(self):
+        with self._lock:
+            return dict(self._status_counts)
+
+    def by_status(self, status):
+        """Cursos de um status, O(tamanho do resultado)"""
+        with self._lock:
+            return [self._cursos[i] for i in self._by_status.get(status, ())]
+
+    def by_categoria(self, categoria):
+        with self._lock:
+            return [self._cursos[i] for i in self._by_categoria.get(categoria, ())]
+
+    def ids(self, status=None, categoria=None):
+        """Ids (ordenados) que atendem aos filtros indexados"""
+        with self._lock:
+            if status is None and categoria is None:
+                return self._ids
+            if categoria is None:
+                return self._by_status.get(status, [])
+            if status is None:
+                return self._by_categoria.get(categoria, [])
+            por_status = self._by_status.get(status, [])
+            por_categoria = self._by_categoria.get(categoria, [])
+            if len(por_status) <= len(por_categoria):
+                return [i for i in por_status if self._cursos[i].get('categoria') == categoria]
+            return [i for i in por_categoria if self._cursos[i].get('status') == status]
+
+    def search(self, query, status=None, categoria=None):
+        """Ids que casam com a busca, ordenados por relevância"""
+        with self._lock:
+            ids = self._busca.search(query)
+            if status is not None or categoria is not None:
+                ids = [i for i in ids if self._matches(self._cursos[i], status, categoria)]
+            return ids
+
+    def ids_after(self, ids, after_id, limit):
+        """
+        Paginação por cursor (keyset): até `limit` ids maiores que
+        `after_id` em uma sequência ordenada, localizados via bisect.
+        """
+        with self._lock:
+            start = bisect.bisect_right(ids, after_id) if after_id is not None else 0
+            return ids[start:start + limit]
+
+    def page(self, offset, limit, ids=None):
+        """Uma página de cursos sem copiar a lista filtrada inteira"""
+        with self._lock:
+            ids = self._ids if ids is None else ids
+            return [self._cursos[i] for i in ids[offset:offset + limit]]
+
+    def __iter__(self):
+        with self._lock:
+            cursos = list(self._cursos.values())
+        return iter(cursos)
+
+    def iter_by_status(self, status=None, batch_size=1000):
+        """
+        Cursos (de um status ou todos) em ordem de id, lidos em lotes por
+        keyset: nada é copiado além do lote atual, e mudanças entre lotes
+        não repetem nem pulam os cursos que continuam no resultado
+        """
+        after_id = None
+        while True:
+            with self._lock:
+                ids = self._ids if status is None else self._by_status.get(status, [])
+                start = bisect.bisect_right(ids, after_id) if after_id is not None else 0
+                lote = [self._cursos[i] for i in ids[start:start + batch_size]]
+            if not lote:
+                return
+            yield from lote
+            after_id = lote[-1]['id']
+
+    # Índices (chamados com o lock adquirido)
+    @staticmethod
+    def _matches(curso, status, categoria):
+        return ((status is None or curso.get('status') == status) and
+                (categoria is None or curso.get('categoria') == categoria))
+
+    def _index(self, curso):
+        curso_id = curso['id']
+        status = curso.get('status')
+        self._insert(self._by_status, status, curso_id)
+        self._insert(self._by_categoria, curso.get('categoria'), curso_id)
+        self._status_counts[status] = self._status_counts.get(status, 0) + 1
+        self._busca.add(curso_id, curso)
+
+    def _unindex(self, curso):
+        curso_id = curso['id']
+        status = curso.get('status')
+        self._discard(self._by_status, status, curso_id)
+        self._discard(self._by_categoria, curso.get('categoria'), curso_id)
+        self._status_counts[status] -= 1
+        if not self._status_counts[status]:
+            del self._status_counts[status]
+        self._busca.remove(curso_id, curso)
+
+    @staticmethod
+    def _insert(index, key, curso_id):
+        ids = index.setdefault(key, [])
+        if not ids or curso_id > ids[-1]:
+            ids.append(curso_id)
+        else:
+            bisect.insort(ids, curso_id)
+
+    @staticmethod
+    def _discard(index, key, curso_id):
+        ids = index.get(key)
+        if ids is not None:
+            pos = bisect.bisect_left(ids, curso_id)
+            if pos < len(ids) and ids[pos] == curso_id:
+                del ids[pos]
+            if not ids:
+                del index[key]
+
+
+class ArquivoStore:
+    """
+    Repositório de arquivos (tabela arquivos) indexado por id e curso_id,
+    com contador do tamanho total armazenado. Registros `Arquivo` compactos.
+    """
+
+    def __init__(self, arquivos=()):
+        self._lock = threading.RLock()
+        self._arquivos = {}
+        self._ids = []
+        self._by_curso = {}
+        self._next_id = 1
+        self.total_bytes = 0
+        self.version = 0
+        self.add_many(arquivos)
+
+    def add(self, arquivo):
+        with self._lock:
+            arquivo = Arquivo.from_dict(arquivo)
+            arquivo_id = arquivo.id
+            if arquivo_id is None:
+                arquivo_id = self._next_id
+                arquivo = arquivo.replace({'id': arquivo_id})
+            if arquivo_id in self._arquivos:
+                raise ValueError(f"Arquivo {arquivo_id} já existe")
+            self._arquivos[arquivo_id] = arquivo
+            if not self._ids or arquivo_id > self._ids[-1]:
+                self._ids.append(arquivo_id)
+            else:
+                bisect.insort(self._ids, arquivo_id)
+            # Tupla (menor que lista): poucos arquivos por curso
+            self._by_curso[arquivo.curso_id] = self._by_curso.get(arquivo.curso_id, ()) + (arquivo_id,)
+            self._next_id = max(self._next_id, arquivo_id + 1)
+            self.total_bytes += arquivo.tamanho or 0
+            self.version += 1
+            return arquivo
+
+    def add_many(self, arquivos):
+        with self._lock:
+            total = 0
+            for arquivo in arquivos:
+                self.add(arquivo)
+                total += 1
+            return total
+
+    def remove(self, arquivo_id):
+        """Excluir um arquivo; retorna o registro removido ou None"""
+        with self._lock:
+            arquivo = self._arquivos.pop(arquivo_id, None)
+            if arquivo is None:
+                return None
+            del self._ids[bisect.bisect_left(self._ids, arquivo_id)]
+            restantes = tuple(i for i in self._by_curso[arquivo.curso_id] if i != arquivo_id)
+            if restantes:
+                self._by_curso[arquivo.curso_id] = restantes
+            else:
+                del self._by_curso[arquivo.curso_id]
+            self.total_bytes -= arquivo.tamanho or 0
+            self.version += 1
+            return arquivo
+
+    def get(self, arquivo_id):
+        return self._arquivos.get(arquivo_id)
+
+    # Snapshot (snapshot.py)
+    def dump_state(self):
+        with self._lock:
+            return {
+                'arquivos': [arquivo.to_row() for arquivo in self._arquivos.values()],
+                'ids': self._ids,
+                'by_curso': self._by_curso,
+                'next_id': self._next_id,
+                'total_bytes': self.total_bytes,
+                'version': self.version
+            }
+
+    def load_state(self, estado):
+        arquivos = [Arquivo.from_row(row) for row in estado['arquivos']]
+        with self._lock:
+            self._arquivos = {arquivo.id: arquivo for arquivo in arquivos}
+            self._ids = estado['ids']
+            self._by_curso = estado['by_curso']
+            self._next_id = estado['next_id']
+            self.total_bytes = estado['total_bytes']
+            self.version = estado['version']
+
+    def by_curso(self, curso_id):
+        with self._lock:
+            return [self._arquivos[i] for i in self._by_curso.get(curso_id, ())]
+
+    def ids(self, curso_id=None):
+        """Ids ordenados (de todos os arquivos ou de um curso)"""
+        with self._lock:
+            if curso_id is None:
+                return self._ids
+            return sorted(self._by_curso.get(curso_id, ()))
+
+    def page(self, offset, limit, ids=None):
+        with self._lock:
+            ids = self._ids if ids is None else ids
+            return [self._arquivos[i] for i in ids[offset:offset + limit]]
+
+    def __len__(self):
+        return len(self._arquivos)
+
+    def reset_after_fork(self):
+        self._lock = threading.RLock()
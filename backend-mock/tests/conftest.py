@@ -0,0 +1,78 @@
+"""
+Fixtures dos testes do Backend Mock
+Cada teste recebe um app novo de create_app: repositórios em memória,
+auditoria só em memória, armazenamento em um diretório temporário e sem
+limite de requisições (os testes do limitador ligam o seu).
+
+Uso (na pasta backend-mock):
+    pip install pytest
+    python -m pytest -q
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+import server  # noqa: E402
+
+CREDENCIAIS = {'email': 'admin@acervoeducacional.com', 'password': 'Admin@123'}
+
+
+@pytest.fixture
+def criar_app(tmp_path):
+    """Fábrica: criar_app(**config) -> app com a configuração de teste por baixo"""
+    apps = []
+
+    def criar(**config):
+        base = {
+            'TESTING': True,
+            'ACERVO_DB': '',
+            'ACERVO_AUDIT_FILE': '',
+            'ACERVO_STORAGE_DIR': str(tmp_path / 'storage'),
+            'ACERVO_SEED_FILE': '',
+            'ACERVO_SEED_SYNTHETIC': '',
+            'ACERVO_SNAPSHOT': '',
+            'ACERVO_LAZY_LOAD': '',
+            'ACERVO_RATE_LIMIT': '0',
+            'ACERVO_WORKERS': '1'
+        }
+        app = server.create_app(dict(base, **config))
+        apps.append(app)
+        return app
+
+    yield criar
+    for app in apps:
+        server.estado_do_app(app).close()
+
+
+@pytest.fixture
+def app(criar_app):
+    return criar_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth(client):
+    """Cabeçalho Authorization do administrador"""
+    resposta = client.post('/api/auth/login', json=CREDENCIAIS)
+    assert resposta.status_code == 200
+    return {'Authorization': f"Bearer {resposta.get_json()['token']}"}
+
+
+def criar_cursos(client, auth, cursos):
+    """POST de cada (titulo, categoria[, status]); retorna os ids criados"""
+    ids = []
+    for curso in cursos:
+        dados = dict(zip(('titulo', 'categoria', 'status'), curso))
+        resposta = client.post('/api/cursos', json=dados, headers=auth)
+        assert resposta.status_code == 201, resposta.get_json()
+        ids.append(resposta.get_json()['data']['id'])
+    return ids
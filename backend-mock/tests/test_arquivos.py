@@ -0,0 +1,38 @@
+"""Arquivos: metadados só no ArquivoStore, conteúdo no armazenamento local (user-014)"""
+
+from conftest import CREDENCIAIS, criar_cursos
+
+
+def enviar(client, auth, curso_id, conteudo=b'conteudo'):
+    resposta = client.post(f'/api/arquivos/curso/{curso_id}/upload?nome=a.txt&categoria=PPT',
+                           data=conteudo, content_type='text/plain', headers=auth)
+    assert resposta.status_code == 201
+    return resposta.get_json()['data']
+
+
+def test_upload_download_e_exclusao(client, auth):
+    [curso_id] = criar_cursos(client, auth, [('Com anexo', 'Geral')])
+    arquivo = enviar(client, auth, curso_id)
+
+    assert client.get('/api/arquivos').get_json()['pagination']['total'] == 1
+    download = client.get(f"/api/arquivos/{arquivo['id']}/download", headers=auth)
+    assert download.data == b'conteudo'
+    download.close()
+
+    assert client.delete(f"/api/arquivos/{arquivo['id']}", headers=auth).status_code == 200
+    assert client.get(f"/api/arquivos/{arquivo['id']}").status_code == 404
+    assert client.delete(f"/api/arquivos/{arquivo['id']}", headers=auth).status_code == 404
+    assert client.delete(f'/api/cursos/{curso_id}', headers=auth).status_code == 200
+
+
+def test_reinicio_com_o_mesmo_diretorio_nao_ressuscita_arquivos(criar_app, client, auth):
+    arquivo = enviar(client, auth, 1)
+
+    novo = criar_app().test_client()
+
+    # Leituras não alteram o estado: listagem, busca por id e exclusão concordam
+    assert novo.get('/api/arquivos').get_json()['pagination']['total'] == 0
+    assert novo.get(f"/api/arquivos/{arquivo['id']}").status_code == 404
+    assert novo.get('/api/arquivos').get_json()['pagination']['total'] == 0
+    token = novo.post('/api/auth/login', json=CREDENCIAIS).get_json()['token']
+    assert novo.delete('/api/cursos/1', headers={'Authorization': f'Bearer {token}'}).status_code == 200
@@ -0,0 +1,64 @@
+"""App ASGI: admissão no laço e rótulos de métricas por regra (user-018)"""
+
+import asyncio
+
+import pytest
+
+import asgi
+import server
+
+
+def chamar(app, path, metodo='GET', cliente='10.0.0.1'):
+    """Executa uma requisição HTTP no app ASGI; retorna (status, cabeçalhos)"""
+    path, _, query = path.partition('?')
+    scope = {'type': 'http', 'method': metodo, 'path': path, 'query_string': query.encode(),
+             'headers': [(b'host', b'testserver')], 'client': (cliente, 1234),
+             'scheme': 'http', 'server': ('testserver', 80), 'http_version': '1.1',
+             'root_path': ''}
+    enviados = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(mensagem):
+        enviados.append(mensagem)
+
+    asyncio.run(app(scope, receive, send))
+    inicio = enviados[0]
+    return inicio['status'], dict(inicio['headers'])
+
+
+@pytest.fixture
+def app_asgi(criar_app):
+    wsgi = criar_app(ACERVO_RATE_LIMIT='padrao=0.01:2')
+    app = asgi.AcervoASGI(wsgi, wsgi_threads=2)
+    yield app
+    for pool in (app._wsgi_pool, app._consultas):
+        if pool is not None:
+            pool.shutdown()
+
+
+def rotas_nas_metricas(app):
+    texto = server.estado_do_app(app.wsgi_app).metrics.render()
+    return {linha.split('route="', 1)[1].split('"', 1)[0]
+            for linha in texto.splitlines()
+            if linha.startswith('acervo_http_requests_total{')}
+
+
+def test_recusas_usam_a_regra_como_rotulo(app_asgi):
+    status = [chamar(app_asgi, f'/api/cursos/{i}')[0] for i in range(1, 6)]
+    assert status[:2] == [200, 200] and set(status[2:]) == {429}
+    status, cabecalhos = chamar(app_asgi, '/api/nada/123')
+    assert status == 429 and b'retry-after' in cabecalhos
+
+    rotas = rotas_nas_metricas(app_asgi)
+    assert '/api/cursos/<int:curso_id>' in rotas and '<unmatched>' in rotas
+    assert not any(rota.startswith('/api/cursos/') and rota[-1].isdigit() for rota in rotas)
+    assert '/api/nada/123' not in rotas
+
+
+def test_rotas_nativas_mantem_o_template(app_asgi):
+    assert chamar(app_asgi, '/api/health')[0] == 200
+    assert chamar(app_asgi, '/api/cursos/kanban/mudancas?timeout=0', cliente='10.0.0.2')[0] == 200
+
+    assert {'/api/health', '/api/cursos/kanban/mudancas'} <= rotas_nas_metricas(app_asgi)
@@ -0,0 +1,113 @@
+"""Auditoria: filtros de /api/auditoria, paginação com before_id e buffer circular (user-015)"""
+
+import time
+
+import server
+from audit_log import AuditLog
+from conftest import criar_cursos
+
+
+def consultar(client, **params):
+    resposta = client.get('/api/auditoria', query_string=params)
+    assert resposta.status_code == 200
+    return resposta.get_json()
+
+
+def test_eventos_das_mutacoes_com_filtros(client, auth):
+    python, react = criar_cursos(client, auth, [('Python Web', 'Programação'), ('React Native', 'Mobile')])
+    client.patch(f'/api/cursos/{python}', json={'status': 'Veiculado'}, headers=auth)
+    client.patch(f'/api/cursos/{react}', json={'titulo': 'React Native 2'}, headers=auth)
+
+    eventos = consultar(client, curso_id=python)['data']
+    assert [e['tipo_acao'] for e in eventos] == ['MovimentacaoStatus', 'CriacaoCurso']
+    assert eventos[0]['dados_anteriores']['status'] == 'Backlog'
+    assert eventos[0]['dados_novos']['status'] == 'Veiculado'
+
+    criacoes = consultar(client, tipo_acao='CriacaoCurso')['data']
+    assert [e['curso_id'] for e in criacoes] == [react, python]
+
+    assert [e['tipo_acao'] for e in consultar(client, curso_id=react, tipo_acao='EdicaoCurso')['data']] == ['EdicaoCurso']
+    assert consultar(client, curso_id=react, tipo_acao='MovimentacaoStatus')['data'] == []
+
+    # Login e mutações do administrador (usuário 1)
+    do_usuario = consultar(client, usuario_id=1)['data']
+    assert len(do_usuario) == 5
+    assert do_usuario[-1]['tipo_acao'] == 'Login'
+    assert all(e['usuario_id'] == 1 for e in do_usuario)
+
+
+def test_paginacao_before_id_sem_lacunas_nem_repeticoes(client, auth):
+    criar_cursos(client, auth, [(f'Curso {i}', 'Geral') for i in range(23)])
+
+    todos = consultar(client, limit=1000)['data']
+    paginas, before_id = [], None
+    while True:
+        params = {'limit': 5}
+        if before_id is not None:
+            params['before_id'] = before_id
+        corpo = consultar(client, **params)
+        paginas.extend(corpo['data'])
+        before_id = corpo['next_before_id']
+        if before_id is None:
+            break
+
+    ids = [e['id'] for e in paginas]
+    assert ids == [e['id'] for e in todos]
+    assert ids == sorted(ids, reverse=True)
+    assert len(ids) == 24
+
+
+def test_paginacao_before_id_com_filtro(client, auth):
+    criar_cursos(client, auth, [(f'Curso {i}', 'Geral') for i in range(7)])
+
+    primeira = consultar(client, tipo_acao='CriacaoCurso', limit=3)
+    segunda = consultar(client, tipo_acao='CriacaoCurso', limit=3, before_id=primeira['next_before_id'])
+
+    assert len(primeira['data']) == len(segunda['data']) == 3
+    assert primeira['data'][-1]['id'] > segunda['data'][0]['id']
+    assert all(e['tipo_acao'] == 'CriacaoCurso' for e in primeira['data'] + segunda['data'])
+
+
+def test_filtro_por_intervalo_de_tempo(client, auth):
+    antes = time.time()
+    time.sleep(0.01)
+    criar_cursos(client, auth, [('Curso A', 'Geral')])
+    time.sleep(0.01)
+    depois = time.time()
+    criar_cursos(client, auth, [('Curso B', 'Geral')])
+
+    no_intervalo = consultar(client, desde=antes, ate=depois)['data']
+    assert [e['descricao'] for e in no_intervalo] == ['Criação de Curso A']
+
+    assert client.get('/api/auditoria', query_string={'desde': 'ontem'}).status_code == 400
+
+
+def test_buffer_circular_descarta_os_mais_antigos_e_os_indices():
+    audit = AuditLog(capacity=4)
+    for i in range(10):
+        audit.record('Teste', f'evento {i}', usuario_id=i % 2, curso_id=i)
+
+    assert [e['id'] for e in audit.query()] == [10, 9, 8, 7]
+    assert audit.query(curso_id=2) == []
+    assert [e['curso_id'] for e in audit.query(usuario_id=1)] == [9, 7]
+    # Índices limitados à capacidade do buffer
+    assert sum(len(seqs) for seqs in audit._indices['curso_id'].values()) == 4
+    assert sum(len(seqs) for seqs in audit._indices['usuario_id'].values()) == 4
+    assert [e['id'] for e in audit.query(before_id=9, limit=10)] == [8, 7]
+
+
+def test_token_recusado_e_decodificado_uma_vez(client, monkeypatch):
+    chamadas = []
+    original = server.decode_token
+
+    def contar(token):
+        chamadas.append(token)
+        return original(token)
+
+    monkeypatch.setattr(server, 'decode_token', contar)
+
+    resposta = client.get('/api/auth/verify', headers={'Authorization': 'Bearer lixo'})
+    assert resposta.status_code == 401
+    assert chamadas == ['lixo']
+    [evento] = consultar(client, tipo_acao='VerificacaoToken')['data']
+    assert (evento['descricao'], evento['usuario_id']) == ('Token inválido', None)
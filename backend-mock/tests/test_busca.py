@@ -0,0 +1,82 @@
+"""Busca textual de cursos: ranking por relevância e acentos (user-003)"""
+
+from conftest import criar_cursos
+from search_index import SearchIndex, normalizar, tokenizar
+
+
+def ids_da_busca(client, termo, **filtros):
+    resposta = client.get('/api/cursos', query_string=dict(filtros, search=termo, per_page=100))
+    assert resposta.status_code == 200
+    return [curso['id'] for curso in resposta.get_json()['data']]
+
+
+def test_normalizacao_remove_acentos_e_stopwords():
+    assert normalizar('Introdução à Programação') == 'introducao a programacao'
+    assert tokenizar('Introdução à Programação de Sistemas') == ['introducao', 'programacao', 'sistema']
+
+
+def test_busca_ignora_acentos_nos_dois_sentidos(client, auth):
+    com_acento, sem_acento = criar_cursos(client, auth, [
+        ('Gestão de Projetos', 'Administração'),
+        ('Gestao Financeira', 'Administracao')
+    ])
+
+    assert sorted(ids_da_busca(client, 'gestao')) == [com_acento, sem_acento]
+    assert sorted(ids_da_busca(client, 'GESTÃO')) == [com_acento, sem_acento]
+    assert sorted(ids_da_busca(client, 'administração')) == [com_acento, sem_acento]
+
+
+def test_titulo_pesa_mais_que_categoria(client, auth):
+    na_categoria, no_titulo = criar_cursos(client, auth, [
+        ('Fundamentos de Dados', 'Kotlin'),
+        ('Kotlin para Android', 'Mobile')
+    ])
+
+    assert ids_da_busca(client, 'kotlin') == [no_titulo, na_categoria]
+
+
+def test_termo_exato_antes_de_prefixo(client, auth):
+    prefixo, exato, plural = criar_cursos(client, auth, [
+        ('Redentor e o Barroco', 'Arte'),
+        ('Rede Corporativa', 'Infra'),
+        ('Redes Neurais', 'IA')
+    ])
+
+    # 'redes' tem o radical 'rede': casa exato, como o singular
+    assert ids_da_busca(client, 'rede') == [exato, plural, prefixo]
+    assert ids_da_busca(client, 'redentor') == [prefixo]
+
+
+def test_todos_os_termos_sao_exigidos(client, auth):
+    ambos, so_um = criar_cursos(client, auth, [
+        ('Terraform e Kubernetes', 'DevOps'),
+        ('Terraform Essencial', 'DevOps')
+    ])
+
+    assert ids_da_busca(client, 'terraform kubernetes') == [ambos]
+    assert set(ids_da_busca(client, 'terraform')) == {ambos, so_um}
+    assert ids_da_busca(client, 'terraform inexistente') == []
+
+
+def test_busca_combina_com_filtro_de_status(client, auth):
+    backlog, veiculado = criar_cursos(client, auth, [
+        ('Excel Básico', 'Office', 'Backlog'),
+        ('Excel Avançado', 'Office', 'Veiculado')
+    ])
+
+    assert ids_da_busca(client, 'excel', status='Veiculado') == [veiculado]
+    assert ids_da_busca(client, 'excel', status='Backlog') == [backlog]
+
+
+def test_indice_empata_por_id_e_remove_incrementalmente():
+    indice = SearchIndex({'titulo': 1.0})
+    docs = {3: {'titulo': 'Curso de Java'}, 1: {'titulo': 'Java'}, 2: {'titulo': 'Javascript'}}
+    for doc_id, doc in docs.items():
+        indice.add(doc_id, doc)
+
+    # Exatos empatados em ordem de id; o prefixo (javascript) por último
+    assert indice.search('java') == [1, 3, 2]
+
+    indice.remove(1, docs[1])
+    assert indice.search('java') == [3, 2]
+    assert len(indice) == 2
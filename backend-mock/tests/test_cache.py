@@ -0,0 +1,172 @@
+"""SimpleCache: single-flight e stale-while-revalidate (user-010)"""
+
+import threading
+import time
+
+import pytest
+
+import server
+from server import SimpleCache
+
+
+class Contador:
+    """compute() lento que conta as chamadas"""
+
+    def __init__(self, valor='v', espera=0.1):
+        self.valor = valor
+        self.espera = espera
+        self.chamadas = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.chamadas += 1
+            chamada = self.chamadas
+        time.sleep(self.espera)
+        return f'{self.valor}{chamada}'
+
+
+def em_paralelo(funcao, n):
+    resultados = [None] * n
+    barreira = threading.Barrier(n)
+
+    def executar(i):
+        barreira.wait()
+        resultados[i] = funcao()
+
+    threads = [threading.Thread(target=executar, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return resultados
+
+
+def esperar(condicao, timeout=2.0):
+    limite = time.monotonic() + timeout
+    while not condicao():
+        if time.monotonic() > limite:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def _capturar(funcao):
+    try:
+        return funcao()
+    except Exception as e:
+        return e
+
+
+def test_miss_concorrente_calcula_uma_vez():
+    cache = SimpleCache()
+    compute = Contador()
+
+    resultados = em_paralelo(lambda: cache.get_or_compute('k', compute, ttl=60), 8)
+
+    assert compute.chamadas == 1
+    assert resultados == ['v1'] * 8
+    assert cache.get_stats()['coalesced'] == 7
+
+
+def test_erro_do_calculo_chega_a_todos_e_nao_e_cacheado():
+    cache = SimpleCache()
+
+    def falhar():
+        time.sleep(0.05)
+        raise RuntimeError('falhou')
+
+    erros = em_paralelo(lambda: _capturar(lambda: cache.get_or_compute('k', falhar)), 4)
+
+    assert all(isinstance(erro, RuntimeError) for erro in erros)
+    assert cache.get('k') is None
+    assert cache.get_or_compute('k', lambda: 'ok') == 'ok'
+
+
+def test_valor_obsoleto_e_servido_com_um_unico_refresh():
+    cache = SimpleCache()
+    cache.set('k', 'antigo', ttl=0.05, stale_ttl=60)
+    time.sleep(0.1)
+    liberar = threading.Event()
+    chamadas = []
+
+    def compute():
+        chamadas.append(1)
+        liberar.wait(5)
+        return 'novo'
+
+    # Todos respondem com o refresh ainda bloqueado
+    resultados = em_paralelo(lambda: cache.get_or_compute('k', compute, ttl=60, stale_ttl=60), 6)
+    assert resultados == ['antigo'] * 6
+    liberar.set()
+
+    assert esperar(lambda: cache.get('k') == 'novo')
+    assert len(chamadas) == 1
+    stats = cache.get_stats()
+    assert stats['stale_hits'] == 6
+    assert esperar(lambda: cache.get_stats()['refreshes'] == 1)
+
+
+def test_refresh_com_erro_mantem_o_valor_obsoleto():
+    cache = SimpleCache()
+    cache.set('k', 'antigo', ttl=0.05, stale_ttl=60)
+    time.sleep(0.1)
+
+    def falhar():
+        raise RuntimeError('falhou')
+
+    assert cache.get_or_compute('k', falhar, ttl=60, stale_ttl=60) == 'antigo'
+    assert esperar(lambda: not cache._inflight)
+    assert cache.peek('k') == ('antigo', False)
+    assert cache.get_stats()['refreshes'] == 0
+
+
+def test_fim_do_periodo_obsoleto_volta_a_calcular():
+    cache = SimpleCache()
+    cache.set('k', 'antigo', ttl=0.02, stale_ttl=0.02)
+    time.sleep(0.1)
+
+    assert cache.peek('k') is None
+    assert cache.get_or_compute('k', lambda: 'novo', ttl=60) == 'novo'
+
+
+def test_peek_e_probe_nao_alteram_as_estatisticas():
+    cache = SimpleCache()
+    cache.set('k', 'v', ttl=60)
+
+    assert cache.probe('k') == 'v'
+    assert cache.peek('k') == ('v', True)
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['stale_hits']) == (1, 0)
+
+
+@pytest.fixture
+def calculos(monkeypatch):
+    """Conta os cálculos das estatísticas do dashboard"""
+    contagem = []
+    original = server.montar_dashboard_stats
+
+    def montar(valores):
+        contagem.append(1)
+        return original(valores)
+
+    monkeypatch.setattr(server, 'montar_dashboard_stats', montar)
+    return contagem
+
+
+def test_dashboard_obsoleto_responde_na_hora_e_atualiza_em_segundo_plano(app, client, calculos):
+    assert client.get('/api/dashboard/stats').status_code == 200
+    assert len(calculos) == 1
+
+    estado = server.estado_do_app(app)
+    with app.app_context():
+        chave = server.chave_dashboard()
+    estado.cache._entries[chave].fresh_until = time.monotonic() - 1
+    anterior = estado.cache.peek(chave)[0]
+
+    # O valor obsoleto sai na hora; o refresh roda em outra thread
+    assert client.get('/api/dashboard/stats').get_json()['timestamp'] == anterior['timestamp']
+    client.get('/api/dashboard/stats')
+    assert esperar(lambda: estado.cache.peek(chave)[1])
+    assert len(calculos) == 2
+    assert client.get('/api/dashboard/stats').get_json()['timestamp'] != anterior['timestamp']
@@ -0,0 +1,74 @@
+"""Paginação por cursor de /api/cursos (user-004)"""
+
+import pytest
+
+import server
+
+
+@pytest.fixture
+def client(criar_app):
+    return criar_app(ACERVO_SEED_SYNTHETIC='45:0:0:7').test_client()
+
+
+def percorrer(client, **params):
+    """Segue next_cursor desde o cursor vazio; retorna os ids na ordem entregue"""
+    ids, cursor = [], ''
+    while cursor is not None:
+        resposta = client.get('/api/cursos', query_string=dict(params, cursor=cursor, limit=10))
+        assert resposta.status_code == 200
+        corpo = resposta.get_json()
+        ids.extend(curso['id'] for curso in corpo['data'])
+        cursor = corpo['next_cursor']
+    return ids
+
+
+def test_cursor_percorre_todos_os_cursos_uma_vez_em_ordem(client):
+    ids = percorrer(client)
+
+    total = client.get('/api/cursos').get_json()['pagination']['total']
+    assert len(ids) == total == 45
+    assert ids == sorted(set(ids))
+
+
+def test_cursor_com_filtro_percorre_so_o_filtro(client):
+    ids = percorrer(client, status='Backlog')
+
+    esperado = client.get('/api/cursos', query_string={'status': 'Backlog', 'per_page': 100}).get_json()
+    assert ids == sorted(curso['id'] for curso in esperado['data'])
+
+
+def test_pagina_por_numero_continua_por_cursor(client):
+    pagina1 = client.get('/api/cursos', query_string={'page': 1, 'per_page': 10}).get_json()
+    pagina2 = client.get('/api/cursos', query_string={'page': 2, 'per_page': 10}).get_json()
+
+    seguinte = client.get('/api/cursos', query_string={'cursor': pagina1['next_cursor'], 'limit': 10}).get_json()
+    assert [c['id'] for c in seguinte['data']] == [c['id'] for c in pagina2['data']]
+    assert seguinte['pagination']['has_prev'] is True
+
+
+def test_cursor_de_outro_filtro_e_recusado(client):
+    corpo = client.get('/api/cursos', query_string={'status': 'Backlog', 'cursor': '', 'limit': 5}).get_json()
+    cursor = corpo['next_cursor']
+    assert cursor is not None
+
+    outro = client.get('/api/cursos', query_string={'status': 'Veiculado', 'cursor': cursor, 'limit': 5})
+    assert outro.status_code == 400
+    assert outro.get_json() == {'success': False, 'message': 'Cursor inválido'}
+
+    mesmo = client.get('/api/cursos', query_string={'status': 'Backlog', 'cursor': cursor, 'limit': 5})
+    assert mesmo.status_code == 200
+
+
+@pytest.mark.parametrize('cursor', ['lixo', '!!!', server.encode_cursor(3, 'ffffffff')])
+def test_cursor_invalido_e_recusado(client, cursor):
+    resposta = client.get('/api/cursos', query_string={'cursor': cursor})
+    assert resposta.status_code == 400
+
+
+def test_cursor_e_opaco_e_assinado():
+    assinatura = server._filtros_assinatura('', 'Backlog', None)
+    cursor = server.encode_cursor(42, assinatura)
+
+    assert '=' not in cursor
+    assert server.decode_cursor(cursor, assinatura) == 42
+    assert server.decode_cursor(cursor, server._filtros_assinatura('', 'Veiculado', None)) is None
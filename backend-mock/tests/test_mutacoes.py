@@ -0,0 +1,137 @@
+"""Mutações de cursos: dashboard, Kanban e feed de mudanças consistentes (user-020)"""
+
+from conftest import criar_cursos
+
+
+def dashboard(client):
+    return client.get('/api/dashboard/stats').get_json()
+
+
+def colunas(client):
+    kanban = client.get('/api/cursos/kanban').get_json()
+    return {coluna: [curso['id'] for curso in cursos] for coluna, cursos in kanban.items()}
+
+
+def mudancas(client, desde):
+    return client.get('/api/cursos/kanban/mudancas', query_string={'since': desde, 'timeout': 0}).get_json()
+
+
+def test_criacao_movimentacao_e_exclusao_refletem_em_tudo(client, auth):
+    inicial = dashboard(client)
+    versao = mudancas(client, '')['version']
+
+    [curso_id] = criar_cursos(client, auth, [('Rust Básico', 'Programação')])
+    apos_criar = dashboard(client)
+    assert apos_criar['total_cursos'] == inicial['total_cursos'] + 1
+    assert curso_id in colunas(client)['backlog']
+
+    resposta = client.patch(f'/api/cursos/{curso_id}', json={'coluna': 'veiculado'}, headers=auth)
+    assert resposta.status_code == 200
+    assert resposta.get_json()['data']['status'] == 'Veiculado'
+    assert dashboard(client)['cursos_ativos'] == inicial['cursos_ativos'] + 1
+    kanban = colunas(client)
+    assert curso_id in kanban['veiculado'] and curso_id not in kanban['backlog']
+
+    assert client.delete(f'/api/cursos/{curso_id}', headers=auth).status_code == 200
+    final = dashboard(client)
+    assert (final['total_cursos'], final['cursos_ativos']) == (inicial['total_cursos'], inicial['cursos_ativos'])
+    assert curso_id not in sum(colunas(client).values(), [])
+    assert client.get(f'/api/cursos/{curso_id}').status_code == 404
+
+    feed = mudancas(client, versao)
+    assert feed['version'] == versao + 3
+    assert [e['dados']['curso_id'] for e in feed['eventos']] == [curso_id] * 3
+    assert [e['tipo'] for e in feed['eventos']] == ['curso.criado', 'curso.movido', 'curso.excluido']
+    assert [e['dados']['coluna'] for e in feed['eventos']] == ['backlog', 'veiculado', None]
+
+
+def test_kanban_cacheado_muda_de_etag_apos_mutacao(client, auth):
+    primeira = client.get('/api/cursos/kanban')
+    etag = primeira.headers['ETag']
+    assert client.get('/api/cursos/kanban', headers={'If-None-Match': etag}).status_code == 304
+
+    client.patch('/api/cursos/1', json={'status': 'Backlog'}, headers=auth)
+
+    depois = client.get('/api/cursos/kanban', headers={'If-None-Match': etag})
+    assert depois.status_code == 200
+    assert depois.headers['ETag'] != etag
+    assert 1 in colunas(client)['backlog']
+
+
+def test_lote_valida_tudo_antes_de_aplicar(client, auth):
+    antes = dashboard(client)['total_cursos']
+    invalido = client.post('/api/cursos/lote', headers=auth, json={'operacoes': [
+        {'acao': 'criar', 'dados': {'titulo': 'Novo', 'categoria': 'Geral'}},
+        {'acao': 'alterar', 'id': 1, 'dados': {'status': 'Inexistente'}}
+    ]})
+    assert invalido.status_code == 400
+    assert invalido.get_json()['indice'] == 1
+    assert dashboard(client)['total_cursos'] == antes
+
+    resposta = client.post('/api/cursos/lote', headers=auth, json={'operacoes': [
+        {'acao': 'criar', 'dados': {'titulo': 'Novo', 'categoria': 'Geral'}},
+        {'acao': 'alterar', 'id': 2, 'dados': {'coluna': 'veiculado'}},
+        {'acao': 'excluir', 'id': 999}
+    ]})
+    corpo = resposta.get_json()
+    assert resposta.status_code == 200
+    assert corpo['aplicadas'] == 2
+    assert corpo['data'][2] == {'id': 999, 'success': False, 'message': 'Curso não encontrado'}
+    assert dashboard(client)['total_cursos'] == antes + 1
+    assert 2 in colunas(client)['veiculado']
+
+
+def test_curso_com_arquivo_nao_e_excluido(client, auth):
+    [curso_id] = criar_cursos(client, auth, [('Com anexo', 'Geral')])
+    upload = client.post(f'/api/arquivos/curso/{curso_id}/upload?nome=a.txt&categoria=PPT',
+                         data=b'conteudo', content_type='text/plain', headers=auth)
+    assert upload.status_code == 201
+
+    resposta = client.delete(f'/api/cursos/{curso_id}', headers=auth)
+    assert resposta.status_code == 409
+    assert client.get(f'/api/cursos/{curso_id}').status_code == 200
+
+
+def test_varios_workers_sem_banco_recusam_mutacoes(criar_app):
+    client = criar_app(ACERVO_WORKERS='2').test_client()
+
+    resposta = client.post('/api/cursos', json={'titulo': 'X', 'categoria': 'Y'})
+    assert resposta.status_code == 409
+    assert resposta.get_json()['success'] is False
+    assert client.patch('/api/cursos/1', json={'status': 'Backlog'}).status_code == 409
+    # Leituras continuam
+    assert client.get('/api/cursos/kanban').status_code == 200
+    assert client.get('/api/health').get_json()['rate_limit_stats']['processes'] == 2
+
+
+def test_varios_workers_com_banco_compartilham_as_mutacoes(criar_app, tmp_path):
+    banco = str(tmp_path / 'acervo.db')
+    worker1 = criar_app(ACERVO_DB=banco, ACERVO_WORKERS='2').test_client()
+    worker2 = criar_app(ACERVO_DB=banco, ACERVO_WORKERS='2').test_client()
+    antes = dashboard(worker2)['total_cursos']
+
+    resposta = worker1.post('/api/cursos', json={'titulo': 'Compartilhado', 'categoria': 'Geral'})
+    assert resposta.status_code == 201
+    curso_id = resposta.get_json()['data']['id']
+
+    assert dashboard(worker2)['total_cursos'] == antes + 1
+    assert curso_id in colunas(worker2)['backlog']
+
+
+def test_sse_no_wsgi_tem_teto_de_conexoes(criar_app):
+    client = criar_app(ACERVO_SSE_MAX='1').test_client()
+
+    primeira = client.get('/api/cursos/kanban/eventos', buffered=False)
+    assert primeira.status_code == 200
+    lotada = client.get('/api/cursos/kanban/eventos')
+    assert lotada.status_code == 503
+    assert lotada.headers['Retry-After'] == '3'
+    # O long-poll continua disponível
+    assert client.get('/api/cursos/kanban/mudancas', query_string={'timeout': 0}).status_code == 200
+
+    primeira.close()
+    segunda = client.get('/api/cursos/kanban/eventos', buffered=False)
+    assert segunda.status_code == 200
+    segunda.close()
+    sse = client.get('/api/health').get_json()['rate_limit_stats']['sse']
+    assert (sse['limit'], sse['in_flight'], sse['shed']) == (1, 0, 1)
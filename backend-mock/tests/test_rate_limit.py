@@ -0,0 +1,117 @@
+"""Controle de admissão: token bucket, 429 com Retry-After (user-022)"""
+
+import pytest
+
+import server
+from conftest import CREDENCIAIS
+from rate_limit import Orcamento, RateLimiter, parse_orcamentos
+
+
+def de(ip):
+    """environ_base de uma requisição vinda de `ip`"""
+    return {'REMOTE_ADDR': ip}
+
+
+def login(client, ip='10.0.0.1'):
+    return client.post('/api/auth/login', json=CREDENCIAIS, environ_base=de(ip))
+
+
+@pytest.fixture
+def limitado(criar_app):
+    """Login com rajada de 2 e recarga lenta; demais rotas com rajada de 3"""
+    return criar_app(ACERVO_RATE_LIMIT='login=0.01:2,padrao=0.01:3').test_client()
+
+
+def test_login_acima_da_rajada_recebe_429_com_retry_after(limitado):
+    assert [login(limitado).status_code for _ in range(2)] == [200, 200]
+
+    resposta = login(limitado)
+    assert resposta.status_code == 429
+    assert resposta.get_json() == server.LIMITE_EXCEDIDO
+    # 1 ficha a 0.01/s: ~100 s
+    assert 1 <= int(resposta.headers['Retry-After']) <= 100
+
+    # Outro IP tem o seu bucket; health e métricas ficam fora do limite
+    assert login(limitado, '10.0.0.2').status_code == 200
+    for _ in range(5):
+        assert limitado.get('/api/health', environ_base=de('10.0.0.1')).status_code == 200
+
+    stats = limitado.get('/api/health').get_json()['rate_limit_stats']['rate_limiter']
+    assert stats['limited_by_rule'] == {'login': 1}
+
+
+def test_rotas_tem_orcamentos_separados(limitado):
+    for _ in range(2):
+        login(limitado)
+    assert login(limitado).status_code == 429
+
+    # O bucket 'padrao' do mesmo IP ainda está cheio
+    assert [limitado.get('/api/cursos', environ_base=de('10.0.0.1')).status_code
+            for _ in range(4)] == [200, 200, 200, 429]
+
+
+def test_token_verificado_usa_o_bucket_do_usuario(limitado):
+    token = login(limitado).get_json()['token']
+    autorizado = {'Authorization': f'Bearer {token}'}
+    assert limitado.get('/api/auth/verify', headers=autorizado, environ_base=de('10.0.0.9')).status_code == 200
+
+    # Token já verificado: o orçamento acompanha o usuário entre IPs
+    status = [limitado.get('/api/cursos', headers=autorizado, environ_base=de(f'10.0.1.{i}')).status_code
+              for i in range(4)]
+    assert status == [200, 200, 200, 429]
+
+
+def test_tokens_invalidos_dividem_o_bucket_do_ip(limitado):
+    status = [limitado.get('/api/cursos', headers={'Authorization': f'Bearer lixo{i}'},
+                           environ_base=de('10.0.2.1')).status_code
+              for i in range(4)]
+    assert status == [200, 200, 200, 429]
+
+
+def test_limite_desativado(client):
+    assert all(login(client).status_code == 200 for _ in range(15))
+
+
+def test_orcamento_dividido_entre_workers(criar_app):
+    client = criar_app(ACERVO_RATE_LIMIT='login=1:4', ACERVO_WORKERS='2').test_client()
+
+    assert [login(client).status_code for _ in range(3)] == [200, 200, 429]
+    regras = client.get('/api/health').get_json()['rate_limit_stats']['rate_limiter']['rules']
+    assert regras['login'] == {'rate': 0.5, 'burst': 2.0}
+
+
+def test_bucket_recarrega_na_taxa_do_orcamento():
+    limitador = RateLimiter({'login': Orcamento(rate=2, burst=3)})
+
+    assert [limitador.check('login', 'a', agora=0.0) for _ in range(3)] == [0.0] * 3
+    assert limitador.check('login', 'a', agora=0.0) == pytest.approx(0.5)
+    # 0.25 s depois: meia ficha, falta meia (0.25 s)
+    assert limitador.check('login', 'a', agora=0.25) == pytest.approx(0.25)
+    assert limitador.check('login', 'a', agora=0.5) == 0.0
+    # Ocioso por muito tempo: volta só até a rajada
+    assert [limitador.check('login', 'a', agora=100.0) for _ in range(4)][-1] > 0
+    assert limitador.check('login', 'b', agora=100.0) == 0.0
+
+
+def test_buckets_ociosos_e_excedentes_sao_descartados():
+    limitador = RateLimiter({'padrao': Orcamento(rate=1, burst=2)}, max_buckets=3)
+    assert limitador.idle_ttl == 2
+
+    for i in range(3):
+        limitador.check('padrao', i, agora=0.0)
+    limitador.check('padrao', 3, agora=1.0)
+    limitador.check('padrao', 4, agora=5.0)
+
+    stats = limitador.get_stats()
+    assert (stats['evicted_full'], stats['evicted_idle']) == (1, 3)
+    assert stats['buckets'] == 1
+
+
+def test_parse_orcamentos():
+    padrao = {'login': Orcamento(2, 10)}
+
+    assert parse_orcamentos('', padrao) == padrao
+    assert parse_orcamentos('off', padrao) is None
+    assert parse_orcamentos('login=1:2,busca=5', padrao) == {'login': Orcamento(1, 2), 'busca': Orcamento(5, 5)}
+    with pytest.raises(ValueError):
+        parse_orcamentos('login=0:2', padrao)
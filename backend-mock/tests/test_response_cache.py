@@ -0,0 +1,26 @@
+"""Cache de respostas por versão: validação condicional (user-009)"""
+
+import server
+
+
+def test_if_modified_since_nao_mascara_versao_nova_no_mesmo_segundo(client, auth):
+    primeira = client.get('/api/cursos/kanban')
+    data = primeira.headers['Last-Modified']
+
+    client.patch('/api/cursos/1', json={'status': 'Backlog'}, headers=auth)
+
+    depois = client.get('/api/cursos/kanban', headers={'If-Modified-Since': data})
+    assert depois.status_code == 200
+    assert depois.headers['ETag'] != primeira.headers['ETag']
+    assert 1 in [curso['id'] for curso in depois.get_json()['backlog']]
+
+
+def test_if_none_match_e_contadores(app, client):
+    etag = client.get('/api/cursos/kanban').headers['ETag']
+
+    assert client.get('/api/cursos/kanban', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/api/cursos/kanban', headers={'If-None-Match': '"outro"'}).status_code == 200
+    assert client.get('/api/cursos/kanban', headers={'Accept-Encoding': 'gzip'}).status_code == 200
+
+    stats = server.estado_do_app(app).response_cache.get_stats()
+    assert (stats['builds'], stats['not_modified'], stats['hits']) == (1, 1, 2)
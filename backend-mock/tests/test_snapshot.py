@@ -0,0 +1,115 @@
+"""Snapshot binário dos repositórios e create_app como fábrica (user-021)"""
+
+import pytest
+
+import server
+import snapshot
+from conftest import CREDENCIAIS, criar_cursos
+
+
+def todos_os_cursos(client):
+    return client.get('/api/cursos', query_string={'per_page': 100}).get_json()['data']
+
+
+@pytest.fixture
+def com_snapshot(criar_app, tmp_path):
+    """criar_app com ACERVO_SNAPSHOT e uma carga sintética pequena"""
+    caminho = tmp_path / 'dados.snap'
+
+    def criar(spec='30:2:5:3', **config):
+        return criar_app(ACERVO_SNAPSHOT=str(caminho), ACERVO_SEED_SYNTHETIC=spec, **config)
+
+    criar.caminho = caminho
+    return criar
+
+
+def proibir_carga(monkeypatch):
+    """Falha se a carga normal rodar (os dados têm de vir do snapshot)"""
+    def carregar(*args, **kwargs):
+        raise AssertionError('carga normal executada com snapshot válido')
+
+    monkeypatch.setattr(server, 'load_from_env', carregar)
+
+
+def test_snapshot_restaura_os_mesmos_dados(com_snapshot, monkeypatch):
+    primeiro = com_snapshot().test_client()
+    assert com_snapshot.caminho.exists()
+    cursos = todos_os_cursos(primeiro)
+    arquivos = primeiro.get(f"/api/arquivos/curso/{cursos[0]['id']}").get_json()['data']
+    assert len(cursos) == 30 and len(arquivos) == 2
+
+    proibir_carga(monkeypatch)
+    segundo = com_snapshot().test_client()
+
+    assert todos_os_cursos(segundo) == cursos
+    assert segundo.get(f"/api/arquivos/curso/{cursos[0]['id']}").get_json()['data'] == arquivos
+    # Índices e contadores também voltam: busca, hash das senhas e próximo id
+    busca = segundo.get('/api/cursos', query_string={'search': cursos[0]['titulo'], 'per_page': 100})
+    assert cursos[0]['id'] in [c['id'] for c in busca.get_json()['data']]
+    login = segundo.post('/api/auth/login', json=CREDENCIAIS)
+    assert login.status_code == 200
+    auth = {'Authorization': f"Bearer {login.get_json()['token']}"}
+    [novo] = criar_cursos(segundo, auth, [('Depois do snapshot', 'Geral')])
+    assert novo == max(c['id'] for c in cursos) + 1
+
+
+def test_outra_origem_invalida_o_snapshot(com_snapshot):
+    primeiro = todos_os_cursos(com_snapshot('30:0:0:3').test_client())
+    gravado = com_snapshot.caminho.read_bytes()
+
+    outro = todos_os_cursos(com_snapshot('12:0:0:9').test_client())
+
+    assert len(primeiro) == 30 and len(outro) == 12
+    # Regravado com a nova origem
+    assert com_snapshot.caminho.read_bytes() != gravado
+
+
+def test_load_recusa_outra_impressao_digital_e_arquivo_truncado(com_snapshot, tmp_path):
+    app = com_snapshot('10:0:0:1')
+    estado = server.estado_do_app(app)
+    repositorios = {'usuarios': estado.user_store, 'cursos': estado.curso_store, 'arquivos': estado.arquivo_store}
+    caminho = str(com_snapshot.caminho)
+    digital = snapshot.impressao_digital({'ACERVO_SEED_SYNTHETIC': '10:0:0:1'})
+    outra = snapshot.impressao_digital({'ACERVO_SEED_SYNTHETIC': '10:0:0:2'})
+
+    assert snapshot.load(caminho, repositorios, digital)['secoes'] == ['arquivos', 'cursos', 'usuarios']
+    assert snapshot.load(caminho, repositorios, outra) is None
+    assert snapshot.load(str(tmp_path / 'inexistente.snap'), repositorios, digital) is None
+
+    truncado = tmp_path / 'truncado.snap'
+    truncado.write_bytes(com_snapshot.caminho.read_bytes()[:-4])
+    assert snapshot.load(str(truncado), repositorios, digital) is None
+
+
+def test_apps_da_fabrica_sao_independentes(criar_app, auth, client):
+    outro = criar_app().test_client()
+
+    [curso_id] = criar_cursos(client, auth, [('Só no primeiro', 'Geral')])
+
+    assert client.get(f'/api/cursos/{curso_id}').status_code == 200
+    assert outro.get(f'/api/cursos/{curso_id}').status_code == 404
+    assert len(todos_os_cursos(outro)) == 3
+
+
+def test_carga_adiada_ate_a_primeira_requisicao(criar_app):
+    app = criar_app(ACERVO_LAZY_LOAD='1')
+    assert not server.estado_do_app(app).dados_carregados
+
+    assert len(todos_os_cursos(app.test_client())) == 3
+    assert server.estado_do_app(app).dados_carregados
+
+
+def test_app_padrao_do_modulo_montado_no_primeiro_acesso(monkeypatch, tmp_path):
+    monkeypatch.setenv('ACERVO_STORAGE_DIR', str(tmp_path / 'storage'))
+    monkeypatch.setenv('ACERVO_AUDIT_FILE', '')
+    assert 'app' not in vars(server)
+
+    padrao = server.app
+    try:
+        assert server.app is padrao
+        assert len(todos_os_cursos(padrao.test_client())) == 3
+    finally:
+        server.estado_do_app(padrao).close()
+        del server.app
+    with pytest.raises(AttributeError):
+        server.inexistente
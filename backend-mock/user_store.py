@@ -0,0 +1,218 @@
+"""
+Repositório de usuários com senhas em hash (KDF lento da stdlib)
+Lookup O(1) por email normalizado e verificação de senha em um pool
+limitado de threads, para que logins não esgotem os workers da API.
+"""
+
+import base64
+import functools
+import hashlib
+import hmac
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Parâmetros do scrypt (~16 MiB e dezenas de ms por verificação)
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+PBKDF2_ITERATIONS = 210000
+HASH_LENGTH = 32
+
+
+def normalize_email(email):
+    return (email or '').strip().lower()
+
+
+def _b64(data):
+    return base64.b64encode(data).decode('ascii')
+
+
+def hash_password(senha, salt=None):
+    """Hash no formato 'scrypt$n$r$p$salt$hash' (ou pbkdf2_sha256 sem scrypt)"""
+    salt = salt or os.urandom(16)
+    senha = senha.encode('utf-8')
+    if hasattr(hashlib, 'scrypt'):
+        derivada = hashlib.scrypt(senha, salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P,
+                                  dklen=HASH_LENGTH)
+        return f'scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(derivada)}'
+    derivada = hashlib.pbkdf2_hmac('sha256', senha, salt, PBKDF2_ITERATIONS, dklen=HASH_LENGTH)
+    return f'pbkdf2_sha256${PBKDF2_ITERATIONS}${_b64(salt)}${_b64(derivada)}'
+
+
+def verify_password(password_hash, senha):
+    """Comparação em tempo constante; hash malformado nunca autentica"""
+    try:
+        algoritmo, *partes = password_hash.split('$')
+        senha = senha.encode('utf-8')
+        if algoritmo == 'scrypt':
+            n, r, p, salt, esperado = partes
+            esperado = base64.b64decode(esperado)
+            derivada = hashlib.scrypt(senha, salt=base64.b64decode(salt), n=int(n), r=int(r),
+                                      p=int(p), dklen=len(esperado))
+        elif algoritmo == 'pbkdf2_sha256':
+            iteracoes, salt, esperado = partes
+            esperado = base64.b64decode(esperado)
+            derivada = hashlib.pbkdf2_hmac('sha256', senha, base64.b64decode(salt),
+                                           int(iteracoes), dklen=len(esperado))
+        else:
+            return False
+    except (ValueError, TypeError, AttributeError):
+        return False
+    return hmac.compare_digest(derivada, esperado)
+
+
+# Hash usado quando o email não existe: o tempo de resposta não revela
+# se a conta existe ou não. Calculado no primeiro uso (um KDF completo),
+# não na importação; DUMMY_HASH continua disponível como atributo do módulo
+@functools.lru_cache(maxsize=None)
+def dummy_hash():
+    return hash_password('acervo-dummy-password')
+
+
+def __getattr__(nome):
+    if nome == 'DUMMY_HASH':
+        return dummy_hash()
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+
+class VerifierBusy(Exception):
+    """Fila de verificação cheia: o login deve ser recusado (503)"""
+
+
+class PasswordVerifier:
+    """
+    Pool limitado para a verificação de senha. As funções de KDF do
+    hashlib liberam o GIL, então as threads do pool rodam em paralelo sem
+    bloquear as demais rotas. `max_pending` limita a fila: acima disso o
+    login é recusado em vez de acumular espera.
+    """
+
+    def __init__(self, max_workers=4, max_pending=64):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='login-kdf')
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        # Contadores atualizados por várias threads de requisição
+        self._lock = threading.Lock()
+        self.verified = 0
+        self.rejected = 0
+
+    def verify(self, password_hash, senha, timeout=10):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise VerifierBusy()
+        try:
+            future = self._executor.submit(verify_password, password_hash, senha)
+        except RuntimeError:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        resultado = future.result(timeout=timeout)
+        with self._lock:
+            self.verified += 1
+        return resultado
+
+    def reset_after_fork(self):
+        """As threads do pool não sobrevivem ao fork: recria o executor"""
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix='login-kdf')
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_pending)
+        self._lock = threading.Lock()
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'verified': self.verified,
+                'rejected': self.rejected
+            }
+
+
+class UserStore:
+    """
+    Usuários indexados por id e por email normalizado.
+
+    Aceita registros com 'senha' (texto, convertido em hash na inserção) ou
+    já com 'password_hash'. A visão pública nunca expõe o hash.
+    """
+
+    CAMPOS_PUBLICOS = ('id', 'email', 'nome', 'is_admin')
+
+    def __init__(self, usuarios=()):
+        self._lock = threading.RLock()
+        self._by_id = {}
+        self._by_email = {}
+        self._next_id = 1
+        self.version = 0
+        self.seed(usuarios)
+
+    def seed(self, usuarios):
+        """Usuários iniciais, só em um repositório vazio"""
+        if not self._by_id:
+            for usuario in usuarios:
+                self.add(usuario)
+
+    def add(self, usuario):
+        usuario = dict(usuario)
+        senha = usuario.pop('senha', None)
+        if senha is not None:
+            usuario['password_hash'] = hash_password(senha)
+        usuario.setdefault('is_admin', False)
+        usuario.setdefault('is_active', True)
+        email = normalize_email(usuario['email'])
+        with self._lock:
+            if email in self._by_email:
+                raise ValueError(f"Email {email} já cadastrado")
+            if usuario.get('id') is None:
+                usuario['id'] = self._next_id
+            self._next_id = max(self._next_id, usuario['id'] + 1)
+            self._by_id[usuario['id']] = usuario
+            self._by_email[email] = usuario
+            self.version += 1
+        return usuario
+
+    def get(self, usuario_id):
+        return self._by_id.get(usuario_id)
+
+    def get_by_email(self, email):
+        return self._by_email.get(normalize_email(email))
+
+    def __len__(self):
+        return len(self._by_id)
+
+    @classmethod
+    def public(cls, usuario):
+        return {campo: usuario.get(campo) for campo in cls.CAMPOS_PUBLICOS}
+
+    def public_list(self):
+        with self._lock:
+            return [self.public(u) for u in self._by_id.values()]
+
+    def iter_public(self, batch_size=1000):
+        """Como public_list, gerado em lotes (só os ids são copiados de uma vez)"""
+        with self._lock:
+            ids = list(self._by_id)
+        for inicio in range(0, len(ids), batch_size):
+            with self._lock:
+                lote = [self._by_id.get(i) for i in ids[inicio:inicio + batch_size]]
+            yield from (self.public(u) for u in lote if u is not None)
+
+    # Snapshot (snapshot.py): hashes prontos, sem refazer o KDF
+    def dump_state(self):
+        with self._lock:
+            return {'usuarios': list(self._by_id.values()), 'next_id': self._next_id,
+                    'version': self.version}
+
+    def load_state(self, estado):
+        with self._lock:
+            self._by_id = {usuario['id']: usuario for usuario in estado['usuarios']}
+            self._by_email = {normalize_email(usuario['email']): usuario
+                              for usuario in estado['usuarios']}
+            self._next_id = estado['next_id']
+            self.version = estado['version']
+
+    def reset_after_fork(self):
+        self._lock = threading.RLock()